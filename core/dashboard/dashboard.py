@@ -1,15 +1,655 @@
 """Dashboard export functionality for the AI Code Reviewer."""
 
+import functools
+import hashlib
 import json
-import csv
-import io
+import ntpath
 import os
+import pickle
+import re
 import subprocess
-from typing import Any, Dict, List, Optional
+import sys
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError; ijson has its own
+_REPORT_ERRORS = (json.JSONDecodeError, ET.ParseError, IOError) + ((ijson.JSONError,) if ijson else ())
+
+
+# =============================================================================
+# HTML TEMPLATES
+# =============================================================================
+# Static markup is built once at import time; only the dynamic fields are
+# interpolated per rerun with str.format.
+
+_TAB_HEADER_TEMPLATE = '''
+<div style="
+    background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
+    color: white;
+    padding: 24px 32px;
+    border-radius: 16px;
+    margin-bottom: 24px;
+">
+    <h2 style="margin: 0; color: white; font-size: 1.8rem;">{title}</h2>
+    <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
+        {subtitle}
+    </p>
+</div>
+'''
+
+_EXPORT_HEADER_HTML = _TAB_HEADER_TEMPLATE.format(
+    title="📤 Export Data",
+    subtitle="Download analysis results in JSON or CSV format",
+)
+
+_FILTERS_HEADER_HTML = _TAB_HEADER_TEMPLATE.format(
+    title="🔧 Advanced Filters",
+    subtitle="Filter dynamically by file, function, and documentation status",
+)
+
+_SEARCH_HEADER_HTML = _TAB_HEADER_TEMPLATE.format(
+    title="🔍 Search Functions",
+    subtitle="Search across all parsed functions",
+)
+
+_HELP_HEADER_HTML = _TAB_HEADER_TEMPLATE.format(
+    title="💡 Interactive Help & Tips",
+    subtitle="Contextual help and quick reference guide",
+)
+
+_TESTS_HEADER_HTML = _TAB_HEADER_TEMPLATE.format(
+    title="🧪 Tests",
+    subtitle="Run and visualize pytest results",
+)
+
+_EXPORT_SUMMARY_TEMPLATE = '''
+<div style="
+    background: rgba(14, 165, 233, 0.08);
+    border: 1px solid rgba(14, 165, 233, 0.3);
+    border-radius: 12px;
+    padding: 20px 24px;
+    margin-bottom: 24px;
+">
+    <div style="font-weight: 600; margin-bottom: 12px; display: flex; align-items: center; gap: 8px;">
+        📊 Export Summary
+    </div>
+    <div style="font-size: 14px; line-height: 1.8;">
+        • Total Functions: <strong>{total_functions}</strong><br>
+        • Documented: <strong>{documented}</strong><br>
+        • Missing Docstrings: <strong>{missing}</strong>
+    </div>
+</div>
+'''
+
+_COUNT_CARDS_TEMPLATE = '''
+<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 16px;">
+    <div style="
+        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 2rem; font-weight: 800; color: white;">{showing}</div>
+        <div style="font-size: 14px; color: rgba(255,255,255,0.9); font-weight: 600;">Showing</div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 2rem; font-weight: 800; color: white;">{total}</div>
+        <div style="font-size: 14px; color: rgba(255,255,255,0.9); font-weight: 600;">Total</div>
+    </div>
+</div>
+'''
+
+_RESULT_BAR_TEMPLATE = '''
+<div style="
+    background: linear-gradient(135deg, #38bdf8 0%, #0284c7 100%);
+    color: white;
+    padding: 12px 24px;
+    border-radius: 8px;
+    text-align: center;
+    font-weight: 600;
+    margin: 16px 0;
+">
+    {result_text}
+</div>
+'''
+
+_SEARCH_PROMPT_HTML = '''
+<div style="
+    background: rgba(14, 165, 233, 0.08);
+    border: 1px solid rgba(14, 165, 233, 0.3);
+    border-radius: 12px;
+    padding: 24px;
+    text-align: center;
+    color: #64748b;
+">
+    🔍 Enter a function name above to search
+</div>
+'''
+
+_HELP_CARDS_HTML = '''
+<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 16px; margin-bottom: 16px;">
+    <div style="
+        background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(5, 150, 105, 0.05) 100%);
+        border: 1px solid rgba(16, 185, 129, 0.3);
+        border-radius: 12px;
+        padding: 20px 24px;
+    ">
+        <div style="font-weight: 700; font-size: 1.1rem; color: #34d399; margin-bottom: 12px;">
+            🚀 Getting Started
+        </div>
+        <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
+            • Enter a file or folder path in the <strong style="color: #34d399;">Path to scan</strong> field<br>
+            • Click <strong style="color: #34d399;">🔍 Scan</strong> to analyze your Python code<br>
+            • Use <strong style="color: #34d399;">📁 Use examples folder</strong> for a quick demo<br>
+            • Select your preferred docstring style from the sidebar
+        </div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, rgba(251, 146, 60, 0.1) 0%, rgba(234, 88, 12, 0.05) 100%);
+        border: 1px solid rgba(251, 146, 60, 0.3);
+        border-radius: 12px;
+        padding: 20px 24px;
+    ">
+        <div style="font-weight: 700; font-size: 1.1rem; color: #fb923c; margin-bottom: 12px;">
+            📝 Docstring Styles
+        </div>
+        <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
+            • <strong style="color: #fb923c;">Google</strong>: Args, Returns, Raises sections<br>
+            • <strong style="color: #fb923c;">NumPy</strong>: Parameters, Returns with dashes<br>
+            • <strong style="color: #fb923c;">reST</strong>: :param, :type, :return directives<br>
+            • AI generates style-compliant docstrings automatically
+        </div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, rgba(14, 165, 233, 0.1) 0%, rgba(3, 105, 161, 0.05) 100%);
+        border: 1px solid rgba(14, 165, 233, 0.3);
+        border-radius: 12px;
+        padding: 20px 24px;
+    ">
+        <div style="font-weight: 700; font-size: 1.1rem; color: #38bdf8; margin-bottom: 12px;">
+            🔧 Validator & Auto-Fixes
+        </div>
+        <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
+            • <strong style="color: #38bdf8;">Validator Tab</strong>: Check PEP 257 compliance<br>
+            • <strong style="color: #38bdf8;">Fix All Button</strong>: Auto-fix module & function errors<br>
+            • <span style="color: #34d399;">🟢 Supports</span>: D100, D102-D107, D200-D210, D400+<br>
+            • <span style="color: #f87171;">🔴 Skips</span>: Class docstrings (D101) as per config
+        </div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, rgba(168, 85, 247, 0.1) 0%, rgba(126, 34, 206, 0.05) 100%);
+        border: 1px solid rgba(168, 85, 247, 0.3);
+        border-radius: 12px;
+        padding: 20px 24px;
+    ">
+        <div style="font-weight: 700; font-size: 1.1rem; color: #c084fc; margin-bottom: 12px;">
+            📤 Export Options
+        </div>
+        <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
+            • <strong style="color: #c084fc;">JSON</strong>: Structured data for programmatic access<br>
+            • <strong style="color: #c084fc;">CSV</strong>: Spreadsheet-friendly for Excel analysis<br>
+            • Export includes file, function, line numbers, status<br>
+            • Use for documentation audits & compliance reports
+        </div>
+    </div>
+</div>
+'''
+
+_HELP_TESTS_CARD_HTML = '''
+<div style="
+    background: linear-gradient(135deg, rgba(6, 182, 212, 0.1) 0%, rgba(8, 145, 178, 0.05) 100%);
+    border: 1px solid rgba(6, 182, 212, 0.3);
+    border-radius: 12px;
+    padding: 20px 24px;
+    margin-bottom: 16px;
+">
+    <div style="font-weight: 700; font-size: 1.1rem; color: #22d3ee; margin-bottom: 12px;">
+        🧪 Running Tests
+    </div>
+    <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
+        • <strong style="color: #22d3ee;">59 tests</strong> across 6 test modules covering all core functionality<br>
+        • Test modules: <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">parser</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">generator</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">validator</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">coverage_reporter</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">dashboard</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">llm_integration</code><br>
+        • Use the <strong style="color: #22d3ee;">Tests tab</strong> to run & visualize results<br>
+        • Or run manually: <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">pytest tests/ --junitxml=storage/reports/pytest_results.xml</code>
+    </div>
+</div>
+'''
+
+_TESTS_SETUP_HINT_HTML = '''
+<div style="
+    background: rgba(251, 191, 36, 0.1);
+    border: 1px solid rgba(251, 191, 36, 0.3);
+    border-radius: 12px;
+    padding: 20px 24px;
+    margin-top: 16px;
+">
+    <div style="font-weight: 600; margin-bottom: 12px;">💡 First time setup</div>
+    <div style="font-size: 14px; margin-bottom: 12px;">
+        Make sure <code style="background: rgba(0,0,0,0.15); padding: 2px 6px; border-radius: 4px;">pytest</code> is installed:
+    </div>
+    <div style="
+        background: #1e293b;
+        color: #22d3ee;
+        padding: 12px 16px;
+        border-radius: 8px;
+        font-family: 'Consolas', 'Monaco', monospace;
+        font-size: 14px;
+    ">
+        pip install pytest
+    </div>
+</div>
+'''
+
+_TESTS_SUMMARY_TEMPLATE = '''
+<div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px; margin-bottom: 24px;">
+    <div style="
+        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
+        color: white;
+        padding: 16px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 1.8rem; font-weight: 800; color: white;">{passed}</div>
+        <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">PASSED</div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
+        color: white;
+        padding: 16px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 1.8rem; font-weight: 800; color: white;">{failed}</div>
+        <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">FAILED</div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
+        color: white;
+        padding: 16px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 1.8rem; font-weight: 800; color: white;">{total}</div>
+        <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">TOTAL</div>
+    </div>
+    <div style="
+        background: linear-gradient(135deg, #8b5cf6 0%, #7c3aed 100%);
+        color: white;
+        padding: 16px;
+        border-radius: 12px;
+        text-align: center;
+    ">
+        <div style="font-size: 1.8rem; font-weight: 800; color: white;">{duration:.2f}s</div>
+        <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">DURATION</div>
+    </div>
+</div>
+'''
+
+# Row styling is emitted once per block so each row only carries its class
+_TEST_CATEGORY_STYLE_HTML = (
+    '<style>'
+    '.test-category-row{border-left:4px solid;border-radius:0 8px 8px 0;padding:16px 20px;'
+    'margin-bottom:12px;display:flex;justify-content:space-between;align-items:center}'
+    '.test-category-row .label{display:flex;align-items:center;gap:12px;font-weight:600}'
+    '.test-category-row .icon{font-size:1.2rem}'
+    '.test-category-row .count{font-weight:600}'
+    '.test-category-row.pass{background:rgba(16,185,129,.08);border-color:#10b981}'
+    '.test-category-row.pass .count{color:#10b981}'
+    '.test-category-row.fail{background:rgba(239,68,68,.08);border-color:#ef4444}'
+    '.test-category-row.fail .count{color:#ef4444}'
+    '</style>'
+)
+
+_TEST_CATEGORY_ROW_TEMPLATE = (
+    '<div class="test-category-row {status}">'
+    '<div class="label"><span class="icon">{icon}</span><span>{{category}}</span></div>'
+    '<div class="count">{{passed}}/{{total}} passed</div>'
+    '</div>'
+)
+
+# Status and icon are fixed per outcome, so only the counts are formatted per row
+_TEST_CATEGORY_ROW_TEMPLATES = {
+    True: _TEST_CATEGORY_ROW_TEMPLATE.format(status="pass", icon="✅"),
+    False: _TEST_CATEGORY_ROW_TEMPLATE.format(status="fail", icon="❌"),
+}
+
+_HELP_GUIDE_MD = '''
+### Dashboard Features
+
+**🔧 Fix All Violations**
+- One-click fix for PEP 257 docstring errors in the **Validator** tab
+- **Supported Error Codes**:
+  - **Missing Docstrings**: D100 (Module), D102-D105, D107 (Functions/Methods/Init)
+  - **Whitespace & Formatting**: D200-D210 (No blank lines, proper indentation)
+  - **Quotes**: D300-D301 (Triple double quotes, raw strings for backslashes)
+  - **Content & Style**: D400-D413 (First line periods, imperative mood, section formatting)
+- *Note: Class docstrings (D101, D106) are explicitly skipped by design.*
+
+**🔍 Search**
+- Search across all parsed functions
+- Press Enter or click Search to filter by function name
+- See docstring status for each result
+
+**📤 Export**
+- Download analysis results in JSON or CSV format
+- Summary shows total, documented, and missing counts
+- Perfect for documentation audits
+
+**🧪 Tests**
+- Click ▶️ **Run Tests** in the Tests tab to execute pytest
+- Previously failed tests run first; toggle **Rerun only failed** for a quick loop
+- If no source changed since the last run, cached results are shown; use 🔁 **Force Run** to run anyway
+- Use 🧹 **Clean Run** to run the full suite without pytest's cache
+- View pass/fail counts by category with visual charts
+- 59 tests covering: parser, generator, validator, coverage_reporter, dashboard, llm_integration
+
+---
+
+### Test Suite Overview
+
+| Module | Tests | Description |
+|--------|-------|-------------|
+| `test_parser.py` | 7 | File/function parsing, imports, classes, parse cache |
+| `test_generator.py` | 20 | Docstring body builders, PEP 257 fixes & module docstring insertion |
+| `test_llm_integration.py` | 13 | Prompt building, packing & regeneration variants, caching & cache stats, `generate_docstring()` / `generate_docstrings()` API |
+| `test_validator.py` | 12 | pydocstyle & radon, batching, caching, streamed summaries |
+| `test_coverage_reporter.py` | 3 | Coverage computation, report writing |
+| `test_dashboard.py` | 4 | Result loading, function filtering |
+
+---
+
+### Running Tests Manually
+
+```bash
+# Activate virtual environment first
+& "path/to/ai_powered/Scripts/Activate.ps1"
+
+# Run all tests with a JUnit XML report
+pytest tests/ --junitxml=storage/reports/pytest_results.xml -v
+
+# Run specific test file
+pytest tests/test_parser.py -v
+```
+
+---
+
+### Tips for Best Results
+
+1. **Scan entire projects**: Point to a folder to analyze all Python files recursively
+2. **Use Fix All**: Quickly resolve bulk PEP 257 violations in one go
+3. **Review before applying**: Always preview generated docstrings before applying
+4. **Check Metrics**: Monitor your project's documentation coverage over time
+5. **Validate with PEP257**: The Validator tab shows PEP257 compliance issues
+6. **Run tests regularly**: Use the Tests tab to ensure code quality
+'''
+
+
+# =============================================================================
+# SCAN RESULT HELPERS
+# =============================================================================
+
+# Resolved once at import; every path below is derived from these constants
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+REPORTS_DIR = os.path.join(PROJECT_ROOT, "storage", "reports")
+
+
+def _scan_table_path(scan_version: str) -> str:
+    """Return the parquet path holding the function table of a scan version."""
+    return os.path.join(REPORTS_DIR, f"scan_{scan_version}.parquet")
+
+
+# Tables of sessions that ended (or of earlier server runs) are never removed
+# by their own session; anything untouched for this long is deleted
+_SCAN_TABLE_MAX_AGE = 24 * 60 * 60
+
+
+def _prune_scan_tables(max_age: float = _SCAN_TABLE_MAX_AGE) -> None:
+    """Delete ``scan_*.parquet`` files older than ``max_age`` seconds.
+    
+    A live session whose table is pruned just rebuilds it from its results
+    on the next read (see ``_get_function_rows``).
+    """
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(REPORTS_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        if not (entry.name.startswith("scan_") and entry.name.endswith(".parquet")):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def mark_scan_results_changed() -> None:
+    """Assign a fresh version to the scan results held in session state.
+
+    Must be called whenever ``last_scan_results`` is replaced or mutated so
+    that cached views derived from it are rebuilt on the next rerun. The
+    flattened function table is written to ``storage/reports`` as parquet
+    and the session only keeps its path; if the file cannot be written the
+    table is kept in session state instead. Tables other sessions left
+    behind are pruned once they are a day old.
+    """
+    scan_version = uuid.uuid4().hex
+    st.session_state["scan_version"] = scan_version
+    st.session_state.pop("last_scan_df", None)
+    previous_path = st.session_state.pop("last_scan_table", None)
+    
+    df = _flatten_functions(st.session_state.get("last_scan_results", []))
+    table_path = _scan_table_path(scan_version)
+    try:
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        df.to_parquet(table_path, index=False)
+        st.session_state["last_scan_table"] = table_path
+    except (OSError, ImportError, ValueError):
+        st.session_state["last_scan_df"] = df
+    
+    # The previous version is unreachable now; drop its file
+    if previous_path:
+        try:
+            os.remove(previous_path)
+        except OSError:
+            pass
+    _prune_scan_tables()
+
+
+FUNCTION_COLUMNS = [
+    "file", "file_path", "name", "has_docstring",
+    "is_valid", "start_line", "end_line", "complexity",
+]
+
+
+def _flatten_functions(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Flatten per-file scan results into one row per function.
+    
+    The nested per-function dicts are read once here into column lists, so
+    every view afterwards works on typed columns instead of dict lookups.
+    
+    Args:
+        results: Per-file scan results from ``last_scan_results``.
+    
+    Returns:
+        DataFrame with one row per function, ``FUNCTION_COLUMNS`` plus a
+        lowercased ``name_lc`` column.
+    """
+    file_paths: List[str] = []
+    names: List[str] = []
+    has_docstring: List[bool] = []
+    is_valid: List[bool] = []
+    start_lines: List[Optional[int]] = []
+    end_lines: List[Optional[int]] = []
+    complexity: List[Any] = []
+    
+    for r in results:
+        functions = r.get("functions", [])
+        file_paths.extend([r.get("path", "")] * len(functions))
+        for fn in functions:
+            names.append(fn.get("name", ""))
+            has_docstring.append(bool(fn.get("has_docstring")))
+            is_valid.append(bool(fn.get("is_valid")))
+            start_lines.append(fn.get("start_line"))
+            end_lines.append(fn.get("end_line"))
+            complexity.append((fn.get("radon") or {}).get("complexity"))
+    
+    df = pd.DataFrame({
+        "file_path": pd.Series(file_paths, dtype="string"),
+        "name": pd.Series(names, dtype="string"),
+        "has_docstring": pd.Series(has_docstring, dtype=bool),
+        "is_valid": pd.Series(is_valid, dtype=bool),
+        "start_line": pd.Series(start_lines, dtype="Int64"),
+        "end_line": pd.Series(end_lines, dtype="Int64"),
+        "complexity": pd.to_numeric(
+            pd.Series(complexity, dtype=object), errors="coerce"
+        ).astype("Int64"),
+    })
+    # ntpath splits on both "/" and "\\", so Windows paths work on any OS
+    df["file"] = df["file_path"].map(ntpath.basename).astype("string")
+    # Lowercased once per scan so search keystrokes only run the match
+    df["name_lc"] = df["name"].str.lower()
+    return df[FUNCTION_COLUMNS + ["name_lc"]]
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _read_scan_table(table_path: str, columns: Tuple[str, ...]) -> pd.DataFrame:
+    """Read selected columns of a persisted function table.
+    
+    Args:
+        table_path: Parquet file written by ``mark_scan_results_changed``.
+        columns: Column names to load.
+    
+    Returns:
+        DataFrame with only the requested columns.
+    """
+    return pd.read_parquet(table_path, columns=list(columns))
+
+
+def _get_function_rows(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Return the flattened function rows for the current scan.
+    
+    Args:
+        columns: Columns needed by the caller; all columns when omitted.
+    
+    Returns:
+        DataFrame with one row per function and the requested columns.
+    """
+    columns = columns or FUNCTION_COLUMNS + ["name_lc"]
+    results = st.session_state.get("last_scan_results", [])
+    if not results:
+        return _flatten_functions([])[columns]
+    if "scan_version" not in st.session_state:
+        mark_scan_results_changed()
+    
+    table_path = st.session_state.get("last_scan_table")
+    if table_path and os.path.exists(table_path):
+        return _read_scan_table(table_path, tuple(columns))
+    
+    df = st.session_state.get("last_scan_df")
+    if df is None:
+        # Table file was removed from disk; rebuild it from the results
+        mark_scan_results_changed()
+        return _get_function_rows(columns)
+    return df[columns]
+
+
+EXPORT_COLUMNS = [
+    "File", "Function", "Start Line", "End Line",
+    "Has Docstring", "Is Valid", "Complexity",
+]
+
+
+def _export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map flattened function rows onto the export column layout."""
+    return pd.DataFrame({
+        "File": df["file_path"].astype(object),
+        "Function": df["name"].astype(object),
+        "Start Line": df["start_line"].astype(object).fillna(""),
+        "End Line": df["end_line"].astype(object).fillna(""),
+        "Has Docstring": np.where(df["has_docstring"], "Yes", "No"),
+        "Is Valid": np.where(df["is_valid"], "Yes", "No"),
+        "Complexity": df["complexity"].astype(object).fillna("N/A"),
+    }, columns=EXPORT_COLUMNS)
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _build_export_json(scan_version: str, _df: pd.DataFrame) -> Union[bytes, str]:
+    """Serialize function rows to the JSON export format.
+    
+    Args:
+        scan_version: Version token of the scan results, used as the cache key.
+        _df: Flattened function rows (excluded from hashing by Streamlit).
+    
+    Returns:
+        Indented JSON with one object per function, as bytes when orjson
+        is available and as a string otherwise.
+    """
+    json_rows = _export_frame(_df).to_dict(orient="records")
+    if orjson is not None:
+        return orjson.dumps(json_rows, option=orjson.OPT_INDENT_2)
+    return json.dumps(json_rows, indent=2)
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _build_export_csv(scan_version: str, _df: pd.DataFrame) -> str:
+    """Serialize function rows to the CSV export format.
+    
+    Args:
+        scan_version: Version token of the scan results, used as the cache key.
+        _df: Flattened function rows (excluded from hashing by Streamlit).
+    
+    Returns:
+        CSV text with a header row followed by one row per function.
+    """
+    return _export_frame(_df).to_csv(index=False)
+
+
+def _render_function_table(functions: pd.DataFrame) -> None:
+    """Render function rows as an interactive table.
+    
+    Args:
+        functions: Flattened function rows with file, name and has_docstring.
+    """
+    st.dataframe(
+        functions[["file", "name", "has_docstring"]],
+        column_config={
+            "file": st.column_config.TextColumn("📁 File"),
+            "name": st.column_config.TextColumn("🔧 Function"),
+            "has_docstring": st.column_config.CheckboxColumn("✅ Docstring"),
+        },
+        hide_index=True,
+        width="stretch",
+    )
+
+
 def render_export_tab():
     """Render the Export Data tab with JSON and CSV export options.
     
@@ -17,20 +657,7 @@ def render_export_tab():
     and missing docstrings count. Provides download buttons for JSON and CSV formats.
     """
     # Header with gradient background (matching app theme)
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        color: white;
-        padding: 24px 32px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-    ">
-        <h2 style="margin: 0; color: white; font-size: 1.8rem;">📤 Export Data</h2>
-        <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
-            Download analysis results in JSON or CSV format
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_EXPORT_HEADER_HTML, unsafe_allow_html=True)
     
     # Get scan results from session state
     results = st.session_state.get("last_scan_results", [])
@@ -39,59 +666,34 @@ def render_export_tab():
         st.info("Run a scan first to generate exportable data.")
         return
     
+    rows = _get_function_rows([
+        "file_path", "name", "start_line", "end_line",
+        "has_docstring", "is_valid", "complexity",
+    ])
+    
     # Calculate summary stats
-    total_functions = sum(len(r.get("functions", [])) for r in results)
-    documented = sum(
-        1 for r in results 
-        for fn in r.get("functions", []) 
-        if fn.get("has_docstring", False)
-    )
+    total_functions = len(rows)
+    documented = int(rows["has_docstring"].sum())
     missing = total_functions - documented
     
     # Export Summary Card
-    st.markdown(f'''
-    <div style="
-        background: rgba(14, 165, 233, 0.08);
-        border: 1px solid rgba(14, 165, 233, 0.3);
-        border-radius: 12px;
-        padding: 20px 24px;
-        margin-bottom: 24px;
-    ">
-        <div style="font-weight: 600; margin-bottom: 12px; display: flex; align-items: center; gap: 8px;">
-            📊 Export Summary
-        </div>
-        <div style="font-size: 14px; line-height: 1.8;">
-            • Total Functions: <strong>{total_functions}</strong><br>
-            • Documented: <strong>{documented}</strong><br>
-            • Missing Docstrings: <strong>{missing}</strong>
-        </div>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_EXPORT_SUMMARY_TEMPLATE.format(
+        total_functions=total_functions,
+        documented=documented,
+        missing=missing,
+    ), unsafe_allow_html=True)
     
     # Export buttons
     col1, col2 = st.columns(2)
     
+    # Serialization is deferred until the user actually clicks a button; the
+    # callbacks run off the script thread, so bind the version now
+    scan_version = st.session_state["scan_version"]
+    
     with col1:
-        # Prepare JSON data with same structure as CSV
-        json_rows = []
-        for r in results:
-            file_path = r.get("path", "")
-            for fn in r.get("functions", []):
-                json_rows.append({
-                    "File": file_path,
-                    "Function": fn.get("name", ""),
-                    "Start Line": fn.get("start_line", ""),
-                    "End Line": fn.get("end_line", ""),
-                    "Has Docstring": "Yes" if fn.get("has_docstring") else "No",
-                    "Is Valid": "Yes" if fn.get("is_valid") else "No",
-                    "Complexity": fn.get("radon", {}).get("complexity", "N/A"),
-                })
-        
-        json_data = json.dumps(json_rows, indent=2)
-        
         st.download_button(
             label="📋 Export as JSON",
-            data=json_data,
+            data=lambda: _build_export_json(scan_version, rows),
             file_name="code_review_report.json",
             mime="application/json",
             use_container_width=True,
@@ -99,35 +701,9 @@ def render_export_tab():
         st.caption("📁 JSON format for programmatic access")
     
     with col2:
-        # Prepare CSV data
-        csv_buffer = io.StringIO()
-        writer = csv.writer(csv_buffer)
-        
-        # Write header
-        writer.writerow([
-            "File", "Function", "Start Line", "End Line", 
-            "Has Docstring", "Is Valid", "Complexity"
-        ])
-        
-        # Write data rows
-        for r in results:
-            file_path = r.get("path", "")
-            for fn in r.get("functions", []):
-                writer.writerow([
-                    file_path,
-                    fn.get("name", ""),
-                    fn.get("start_line", ""),
-                    fn.get("end_line", ""),
-                    "Yes" if fn.get("has_docstring") else "No",
-                    "Yes" if fn.get("is_valid") else "No",
-                    fn.get("radon", {}).get("complexity", "N/A"),
-                ])
-        
-        csv_data = csv_buffer.getvalue()
-        
         st.download_button(
             label="📊 Export as CSV",
-            data=csv_data,
+            data=lambda: _build_export_csv(scan_version, rows),
             file_name="code_review_report.csv",
             mime="text/csv",
             use_container_width=True,
@@ -143,20 +719,7 @@ def render_advanced_filters_tab():
     """
     
     # Header with gradient background (matching app theme)
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        color: white;
-        padding: 24px 32px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-    ">
-        <h2 style="margin: 0; color: white; font-size: 1.8rem;">🔧 Advanced Filters</h2>
-        <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
-            Filter dynamically by file, function, and documentation status
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_FILTERS_HEADER_HTML, unsafe_allow_html=True)
     
     # Get scan results from session state
     results = st.session_state.get("last_scan_results", [])
@@ -174,136 +737,44 @@ def render_advanced_filters_tab():
         label_visibility="collapsed",
     )
     
-    # Collect all functions
-    all_functions = []
-    for r in results:
-        file_path = r.get("path", "")
-        file_name = os.path.basename(file_path)
-        for fn in r.get("functions", []):
-            all_functions.append({
-                "file": file_name,
-                "file_path": file_path,
-                "name": fn.get("name", ""),
-                "has_docstring": fn.get("has_docstring", False),
-                "is_valid": fn.get("is_valid", False),
-            })
+    # Collect all functions (cached per scan)
+    all_functions = _get_function_rows(["file", "name", "has_docstring", "is_valid"])
     
     total_count = len(all_functions)
     
     # Filter based on status
     if status_filter == "OK":
-        filtered = [f for f in all_functions if f["is_valid"]]
+        filtered = all_functions[all_functions["is_valid"]]
     elif status_filter == "Fix":
-        filtered = [f for f in all_functions if not f["is_valid"]]
+        filtered = all_functions[~all_functions["is_valid"]]
     else:
         filtered = all_functions
     
     showing_count = len(filtered)
     
     # Showing / Total count cards
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 2rem; font-weight: 800; color: white;">{showing_count}</div>
-            <div style="font-size: 14px; color: rgba(255,255,255,0.9); font-weight: 600;">Showing</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 2rem; font-weight: 800; color: white;">{total_count}</div>
-            <div style="font-size: 14px; color: rgba(255,255,255,0.9); font-weight: 600;">Total</div>
-        </div>
-        ''', unsafe_allow_html=True)
+    st.markdown(_COUNT_CARDS_TEMPLATE.format(
+        showing=showing_count, total=total_count
+    ), unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    if not filtered:
+    if filtered.empty:
         st.warning("No functions match the selected filter.")
         return
     
-    # Table header
-    st.markdown('''
-    <div class="dashboard-table-header" style="
-        display: grid;
-        grid-template-columns: 1fr 1fr 1fr;
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        font-weight: 700;
-        padding: 12px 16px;
-        border-radius: 8px 8px 0 0;
-        font-size: 13px;
-        text-transform: uppercase;
-    ">
-        <div>📁 FILE</div>
-        <div>🔧 FUNCTION</div>
-        <div style="text-align: center;">✅ DOCSTRING</div>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Table rows
-    for i, fn in enumerate(filtered):
-        bg_color = "var(--card-bg)" if i % 2 == 0 else "var(--card-hover-bg)"
-        docstring_badge = (
-            '<span style="background: #10b981; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: 600;">✅ Yes</span>'
-            if fn["has_docstring"]
-            else '<span style="background: #ef4444; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: 600;">❌ No</span>'
-        )
-        
-        st.markdown(f'''
-        <div class="dashboard-table-row" style="
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr;
-            background: {bg_color};
-            padding: 14px 16px;
-            border-left: 1px solid var(--border-color);
-            border-right: 1px solid var(--border-color);
-            border-bottom: 1px solid var(--border-color);
-            font-size: 14px;
-        ">
-            <div class="file-name">{fn["file"]}</div>
-            <div class="fn-name">{fn["name"]}</div>
-            <div style="text-align: center;">{docstring_badge}</div>
-        </div>
-        ''', unsafe_allow_html=True)
+    _render_function_table(filtered)
 
 
 def render_search_tab():
-    """Render the Search Functions tab with instant search functionality.
+    """Render the Search Functions tab with function name search.
     
-    Provides a search input to filter functions by name across all parsed files.
+    Provides a search form to filter functions by name across all parsed files.
     Displays matching results in a styled table.
     """
     
     # Header with gradient background (matching app theme)
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        color: white;
-        padding: 24px 32px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-    ">
-        <h2 style="margin: 0; color: white; font-size: 1.8rem;">🔍 Search Functions</h2>
-        <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
-            Instant search across all parsed functions
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_SEARCH_HEADER_HTML, unsafe_allow_html=True)
     
     # Get scan results from session state
     results = st.session_state.get("last_scan_results", [])
@@ -312,114 +783,53 @@ def render_search_tab():
         st.info("Run a scan first to search functions.")
         return
     
-    # Search input
+    # Search input (inside a form so typing doesn't rerun the app)
     st.markdown("**🔎 Enter function name**")
-    search_query = st.text_input(
-        label="Search functions",
-        placeholder="Enter function name...",
-        key="dashboard_search_input",
-        label_visibility="collapsed",
-    )
+    with st.form("dashboard_search_form", clear_on_submit=False, border=False):
+        query_input = st.text_input(
+            label="Search functions",
+            placeholder="Enter function name...",
+            key="dashboard_search_input",
+            label_visibility="collapsed",
+        )
+        submitted = st.form_submit_button("Search")
     
-    # Collect all functions
-    all_functions = []
-    for r in results:
-        file_path = r.get("path", "")
-        file_name = os.path.basename(file_path)
-        for fn in r.get("functions", []):
-            all_functions.append({
-                "file": file_name,
-                "file_path": file_path,
-                "name": fn.get("name", ""),
-                "has_docstring": fn.get("has_docstring", False),
-            })
+    if submitted:
+        st.session_state["dashboard_search_query"] = query_input
+    search_query = st.session_state.get("dashboard_search_query", "")
     
     # Filter functions based on search query
     if not search_query.strip():
         # Don't show anything until user searches
-        st.markdown('''
-        <div style="
-            background: rgba(14, 165, 233, 0.08);
-            border: 1px solid rgba(14, 165, 233, 0.3);
-            border-radius: 12px;
-            padding: 24px;
-            text-align: center;
-            color: #64748b;
-        ">
-            🔍 Enter a function name above to search
-        </div>
-        ''', unsafe_allow_html=True)
+        st.markdown(_SEARCH_PROMPT_HTML, unsafe_allow_html=True)
         return
     
-    filtered = [
-        f for f in all_functions 
-        if search_query.lower() in f["name"].lower()
-    ]
+    # Reuse the last results until the query or the scan changes
+    cache_key = (st.session_state.get("scan_version"), search_query)
+    cached = st.session_state.get("dashboard_search_results")
+    if cached is not None and cached[0] == cache_key:
+        filtered = cached[1]
+    else:
+        all_functions = _get_function_rows(["file", "name", "has_docstring", "name_lc"])
+        mask = all_functions["name_lc"].str.contains(
+            search_query.lower(), regex=False, na=False
+        )
+        filtered = all_functions[mask]
+        st.session_state["dashboard_search_results"] = (cache_key, filtered)
     
     # Results count bar
     result_text = f'{len(filtered)} results found for "{search_query}"'
     
-    st.markdown(f'''
-    <div style="
-        background: linear-gradient(135deg, #38bdf8 0%, #0284c7 100%);
-        color: white;
-        padding: 12px 24px;
-        border-radius: 8px;
-        text-align: center;
-        font-weight: 600;
-        margin: 16px 0;
-    ">
-        {result_text}
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(
+        _RESULT_BAR_TEMPLATE.format(result_text=result_text),
+        unsafe_allow_html=True,
+    )
     
-    if not filtered:
+    if filtered.empty:
         st.error("No functions match your search.")
-        return
-    
-    # Table header
-    st.markdown('''
-    <div class="dashboard-table-header" style="
-        display: grid;
-        grid-template-columns: 1fr 1fr 1fr;
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        font-weight: 700;
-        padding: 12px 16px;
-        border-radius: 8px 8px 0 0;
-        font-size: 13px;
-        text-transform: uppercase;
-    ">
-        <div>📁 FILE</div>
-        <div>🔧 FUNCTION</div>
-        <div style="text-align: center;">✅ DOCSTRING</div>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Table rows
-    for i, fn in enumerate(filtered):
-        bg_color = "var(--card-bg)" if i % 2 == 0 else "var(--card-hover-bg)"
-        docstring_badge = (
-            '<span style="background: #10b981; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: 600;">✅ Yes</span>'
-            if fn["has_docstring"]
-            else '<span style="background: #ef4444; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: 600;">❌ No</span>'
-        )
-        
-        st.markdown(f'''
-        <div class="dashboard-table-row" style="
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr;
-            background: {bg_color};
-            padding: 14px 16px;
-            border-left: 1px solid var(--border-color);
-            border-right: 1px solid var(--border-color);
-            border-bottom: 1px solid var(--border-color);
-            font-size: 14px;
-        ">
-            <div class="file-name">{fn["file"]}</div>
-            <div class="fn-name">{fn["name"]}</div>
-            <div style="text-align: center;">{docstring_badge}</div>
-        </div>
-        ''', unsafe_allow_html=True)
+        return
+    
+    _render_function_table(filtered)
 
 
 def render_help_tips_tab():
@@ -429,223 +839,229 @@ def render_help_tips_tab():
     coverage metrics, function status, docstring styles, and export options.
     """
     # Header with gradient background (matching app theme)
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        color: white;
-        padding: 24px 32px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-    ">
-        <h2 style="margin: 0; color: white; font-size: 1.8rem;">💡 Interactive Help & Tips</h2>
-        <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
-            Contextual help and quick reference guide
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_HELP_HEADER_HTML, unsafe_allow_html=True)
     
     # Info cards in 2x2 grid
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Getting Started card (green tinted)
-        st.markdown('''
-        <div style="
-            background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(5, 150, 105, 0.05) 100%);
-            border: 1px solid rgba(16, 185, 129, 0.3);
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin-bottom: 16px;
-        ">
-            <div style="font-weight: 700; font-size: 1.1rem; color: #34d399; margin-bottom: 12px;">
-                🚀 Getting Started
-            </div>
-            <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
-                • Enter a file or folder path in the <strong style="color: #34d399;">Path to scan</strong> field<br>
-                • Click <strong style="color: #34d399;">🔍 Scan</strong> to analyze your Python code<br>
-                • Use <strong style="color: #34d399;">📁 Use examples folder</strong> for a quick demo<br>
-                • Select your preferred docstring style from the sidebar
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        # Validator & Auto-Fixes card (blue tinted)
-        st.markdown('''
-        <div style="
-            background: linear-gradient(135deg, rgba(14, 165, 233, 0.1) 0%, rgba(3, 105, 161, 0.05) 100%);
-            border: 1px solid rgba(14, 165, 233, 0.3);
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin-bottom: 16px;
-        ">
-            <div style="font-weight: 700; font-size: 1.1rem; color: #38bdf8; margin-bottom: 12px;">
-                🔧 Validator & Auto-Fixes
-            </div>
-            <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
-                • <strong style="color: #38bdf8;">Validator Tab</strong>: Check PEP 257 compliance<br>
-                • <strong style="color: #38bdf8;">Fix All Button</strong>: Auto-fix module & function errors<br>
-                • <span style="color: #34d399;">🟢 Supports</span>: D100, D102-D107, D200-D210, D400+<br>
-                • <span style="color: #f87171;">🔴 Skips</span>: Class docstrings (D101) as per config
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with col2:
-        # Docstring Styles card (orange/peach tinted)
-        st.markdown('''
-        <div style="
-            background: linear-gradient(135deg, rgba(251, 146, 60, 0.1) 0%, rgba(234, 88, 12, 0.05) 100%);
-            border: 1px solid rgba(251, 146, 60, 0.3);
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin-bottom: 16px;
-        ">
-            <div style="font-weight: 700; font-size: 1.1rem; color: #fb923c; margin-bottom: 12px;">
-                📝 Docstring Styles
-            </div>
-            <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
-                • <strong style="color: #fb923c;">Google</strong>: Args, Returns, Raises sections<br>
-                • <strong style="color: #fb923c;">NumPy</strong>: Parameters, Returns with dashes<br>
-                • <strong style="color: #fb923c;">reST</strong>: :param, :type, :return directives<br>
-                • AI generates style-compliant docstrings automatically
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        # Export Options card (purple/pink tinted)
-        st.markdown('''
-        <div style="
-            background: linear-gradient(135deg, rgba(168, 85, 247, 0.1) 0%, rgba(126, 34, 206, 0.05) 100%);
-            border: 1px solid rgba(168, 85, 247, 0.3);
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin-bottom: 16px;
-        ">
-            <div style="font-weight: 700; font-size: 1.1rem; color: #c084fc; margin-bottom: 12px;">
-                📤 Export Options
-            </div>
-            <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
-                • <strong style="color: #c084fc;">JSON</strong>: Structured data for programmatic access<br>
-                • <strong style="color: #c084fc;">CSV</strong>: Spreadsheet-friendly for Excel analysis<br>
-                • Export includes file, function, line numbers, status<br>
-                • Use for documentation audits & compliance reports
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
+    st.markdown(_HELP_CARDS_HTML, unsafe_allow_html=True)
     
     # Running Tests card (cyan/teal tinted) - full width
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, rgba(6, 182, 212, 0.1) 0%, rgba(8, 145, 178, 0.05) 100%);
-        border: 1px solid rgba(6, 182, 212, 0.3);
-        border-radius: 12px;
-        padding: 20px 24px;
-        margin-bottom: 16px;
-    ">
-        <div style="font-weight: 700; font-size: 1.1rem; color: #22d3ee; margin-bottom: 12px;">
-            🧪 Running Tests
-        </div>
-        <div class="help-card-text" style="font-size: 14px; line-height: 1.8;">
-            • <strong style="color: #22d3ee;">43 tests</strong> across 6 test modules covering all core functionality<br>
-            • Test modules: <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">parser</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">generator</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">validator</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">coverage_reporter</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">dashboard</code>, <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">llm_integration</code><br>
-            • Use the <strong style="color: #22d3ee;">Tests tab</strong> to run & visualize results<br>
-            • Or run manually: <code style="background: rgba(0,0,0,0.2); padding: 2px 6px; border-radius: 4px;">pytest tests/ --json-report --json-report-file=storage/reports/pytest_results.json</code>
-        </div>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_HELP_TESTS_CARD_HTML, unsafe_allow_html=True)
     
     # Advanced Usage Guide expander
     with st.expander("📘 Advanced Usage Guide"):
-        st.markdown('''
-        ### Dashboard Features
-        
-        **🔧 Fix All Violations**
-        - One-click fix for PEP 257 docstring errors in the **Validator** tab
-        - **Supported Error Codes**:
-          - **Missing Docstrings**: D100 (Module), D102-D105, D107 (Functions/Methods/Init)
-          - **Whitespace & Formatting**: D200-D210 (No blank lines, proper indentation)
-          - **Quotes**: D300-D301 (Triple double quotes, raw strings for backslashes)
-          - **Content & Style**: D400-D413 (First line periods, imperative mood, section formatting)
-        - *Note: Class docstrings (D101, D106) are explicitly skipped by design.*
-        
-        **🔍 Search**
-        - Instant search across all parsed functions
-        - Filter by function name as you type
-        - See docstring status for each result
-        
-        **📤 Export**
-        - Download analysis results in JSON or CSV format
-        - Summary shows total, documented, and missing counts
-        - Perfect for documentation audits
-        
-        **🧪 Tests**
-        - Click ▶️ **Run Tests** in the Tests tab to execute pytest
-        - View pass/fail counts by category with visual charts
-        - 43 tests covering: parser, generator, validator, coverage_reporter, dashboard, llm_integration
-        
-        ---
-        
-        ### Test Suite Overview
-        
-        | Module | Tests | Description |
-        |--------|-------|-------------|
-        | `test_parser.py` | 5 | File/function parsing, imports, classes |
-        | `test_generator.py` | 16 | Docstring body builders & PEP 257 fixes |
-        | `test_llm_integration.py` | 8 | Prompt building, caching, `generate_docstring()` API |
-        | `test_validator.py` | 7 | pydocstyle, radon complexity analysis |
-        | `test_coverage_reporter.py` | 3 | Coverage computation, report writing |
-        | `test_dashboard.py` | 4 | Result loading, function filtering |
-        
-        ---
-        
-        ### Running Tests Manually
-        
-        ```bash
-        # Activate virtual environment first
-        & "path/to/ai_powered/Scripts/Activate.ps1"
-        
-        # Run all tests with JSON report
-        pytest tests/ --json-report --json-report-file=storage/reports/pytest_results.json -v
-        
-        # Run specific test file
-        pytest tests/test_parser.py -v
-        ```
-        
-        ---
-        
-        ### Tips for Best Results
-        
-        1. **Scan entire projects**: Point to a folder to analyze all Python files recursively
-        2. **Use Fix All**: Quickly resolve bulk PEP 257 violations in one go
-        3. **Review before applying**: Always preview generated docstrings before applying
-        4. **Check Metrics**: Monitor your project's documentation coverage over time
-        5. **Validate with PEP257**: The Validator tab shows PEP257 compliance issues
-        6. **Run tests regularly**: Use the Tests tab to ensure code quality
-        ''')
+        st.markdown(_HELP_GUIDE_MD)
 
 
 # =============================================================================
 # TESTS TAB FUNCTIONS
 # =============================================================================
 
-def load_pytest_results() -> Optional[Dict[str, Any]]:
-    """Load pytest JSON report from storage/reports/pytest_results.json.
+# Test runs write JUnit XML with pytest's builtin junitxml reporter
+PYTEST_REPORT_PATH = os.path.join(REPORTS_DIR, "pytest_results.xml")
+
+# Reports from manual pytest-json-report / pytest-reportlog runs are still read
+_EXTRA_REPORT_PATHS = (
+    os.path.join(REPORTS_DIR, "pytest_results.json"),
+    os.path.join(REPORTS_DIR, "pytest_results.ndjson"),
+)
+
+
+def _current_report() -> Tuple[str, float]:
+    """Return the most recently written pytest report and its mtime.
+    
+    Returns:
+        Tuple of (report path, mtime); the mtime is 0.0 if no report exists.
+    """
+    newest, newest_mtime = PYTEST_REPORT_PATH, None
+    for path in (PYTEST_REPORT_PATH, *_EXTRA_REPORT_PATHS):
+        # One stat per candidate instead of exists() followed by getmtime()
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if newest_mtime is None or mtime > newest_mtime:
+            newest, newest_mtime = path, mtime
+    return newest, newest_mtime or 0.0
+
+
+def _current_report_path() -> str:
+    """Return the most recently written pytest report in storage/reports."""
+    return _current_report()[0]
+
+
+def _nodeid_from_testcase(classname: str, name: str) -> str:
+    """Rebuild a pytest nodeid from a JUnit ``classname`` and ``name``.
+    
+    ``tests.test_parser.TestFoo`` becomes ``tests/test_parser.py::TestFoo::name``;
+    trailing ``Test*`` segments are test classes, the rest is the module path.
+    """
+    parts = classname.split(".") if classname else []
+    split = len(parts)
+    while split > 1 and parts[split - 1].startswith("Test"):
+        split -= 1
+    if not parts:
+        return name
+    module = "/".join(parts[:split]) + ".py"
+    return "::".join([module, *parts[split:], name])
+
+
+def _read_junit_xml(f) -> Dict[str, Any]:
+    """Stream a JUnit XML report into the report shape the Tests tab uses.
+    
+    Each ``<testcase>`` is cleared once read, so memory stays flat however
+    large the suite is.
+    
+    Args:
+        f: JUnit XML report opened in binary mode.
+    
+    Returns:
+        Dictionary with ``duration``, ``summary`` and a slim ``tests`` list,
+        like ``_stream_pytest_results``.
+    """
+    tests: List[Dict[str, str]] = []
+    duration = 0.0
+    
+    for _, elem in ET.iterparse(f, events=("end",)):
+        if elem.tag == "testcase":
+            child_tags = {child.tag for child in elem}
+            if "error" in child_tags:
+                outcome = "error"
+            elif "failure" in child_tags:
+                outcome = "failed"
+            elif "skipped" in child_tags:
+                outcome = "skipped"
+            else:
+                outcome = "passed"
+            nodeid = _nodeid_from_testcase(elem.get("classname", ""), elem.get("name", ""))
+            tests.append({"nodeid": nodeid, "outcome": outcome})
+            elem.clear()
+        elif elem.tag == "testsuite":
+            duration += float(elem.get("time") or 0)
+            elem.clear()
+    
+    summary: Dict[str, int] = dict(Counter(test["outcome"] for test in tests))
+    summary["total"] = summary["collected"] = len(tests)
+    return {"duration": duration, "summary": summary, "tests": tests}
+
+
+def _read_report_log(f) -> Dict[str, Any]:
+    """Fold a pytest ``--report-log`` event stream into the report shape.
+    
+    Each line is parsed on its own, so a run that is still writing (or was
+    killed mid-line) yields the tests finished so far.
+    
+    Args:
+        f: NDJSON report log opened in binary mode.
+    
+    Returns:
+        Dictionary with ``duration``, ``summary`` and a slim ``tests`` list,
+        like ``_stream_pytest_results``.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    outcomes: Dict[str, str] = {}
+    first_start: Optional[float] = None
+    last_stop: Optional[float] = None
+    
+    for line in f:
+        try:
+            rec = loads(line)
+        except ValueError:
+            continue
+        if rec.get("$report_type") != "TestReport":
+            continue
+        
+        nodeid, when, outcome = rec.get("nodeid", ""), rec.get("when"), rec.get("outcome")
+        if first_start is None:
+            first_start = rec.get("start")
+        last_stop = rec.get("stop", last_stop)
+        
+        # Mirror pytest-json-report: setup/teardown failures count as errors
+        if when == "setup":
+            outcomes[nodeid] = "error" if outcome == "failed" else outcome
+        elif when == "call":
+            if outcomes.get(nodeid) != "error":
+                outcomes[nodeid] = outcome
+        elif outcome == "failed":
+            outcomes[nodeid] = "error"
+    
+    summary: Dict[str, int] = dict(Counter(outcomes.values()))
+    summary["total"] = summary["collected"] = len(outcomes)
+    duration = last_stop - first_start if first_start and last_stop else 0
+    return {
+        "duration": duration,
+        "summary": summary,
+        "tests": [{"nodeid": n, "outcome": o} for n, o in outcomes.items()],
+    }
+
+
+def _stream_pytest_results(f) -> Dict[str, Any]:
+    """Stream the fields the Tests tab needs out of a pytest JSON report.
+    
+    Only ``duration``, ``summary`` and each test's ``nodeid``/``outcome`` are
+    kept, so per-test setup/call/teardown payloads are never materialized.
+    
+    Args:
+        f: Report file opened in binary mode.
+    
+    Returns:
+        Dictionary with ``duration``, ``summary`` and a slim ``tests`` list.
+    """
+    data: Dict[str, Any] = {"tests": []}
+    summary_builder = None
+    test: Dict[str, Any] = {}
+    
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == "duration":
+            data["duration"] = value
+        elif prefix == "summary" or prefix.startswith("summary."):
+            if summary_builder is None:
+                summary_builder = ijson.ObjectBuilder()
+            summary_builder.event(event, value)
+        elif prefix == "tests.item":
+            if event == "start_map":
+                test = {}
+            elif event == "end_map":
+                data["tests"].append(test)
+        elif prefix in ("tests.item.nodeid", "tests.item.outcome"):
+            test[prefix.rsplit(".", 1)[1]] = value
+    
+    if summary_builder is not None:
+        data["summary"] = summary_builder.value
+    return data
+
+
+def load_pytest_results(report_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Load the latest pytest report from storage/reports.
+    
+    JUnit ``.xml`` reports are stream-parsed with iterparse and ``.ndjson``
+    report logs are folded line by line. For a JSON report, when ijson is
+    installed the file is stream-parsed and only the fields used by the
+    Tests tab are kept; otherwise the whole file is parsed.
+    
+    Args:
+        report_path: Report to load; defaults to the most recent report.
     
     Returns:
         Dictionary containing pytest results, or None if file doesn't exist.
     """
-    report_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "storage", "reports", "pytest_results.json"
-    )
-    report_path = os.path.abspath(report_path)
+    report_path = report_path or _current_report_path()
     
     if not os.path.exists(report_path):
         return None
     
     try:
-        with open(report_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(report_path, "rb") as f:
+            if report_path.endswith(".xml"):
+                return _read_junit_xml(f)
+            if report_path.endswith(".ndjson"):
+                return _read_report_log(f)
+            if ijson is not None:
+                return _stream_pytest_results(f)
+            data = f.read()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except _REPORT_ERRORS:
         return None
 
 
@@ -664,94 +1080,492 @@ def filter_functions(
     Returns:
         Filtered list of functions.
     """
-    result = functions
+    search_lower = search.lower() if search else ""
+    check_status = status in ("OK", "Fix")
+    if not search_lower and not check_status:
+        return functions
+    
+    want_valid = status == "OK"
+    
+    # Single pass applying both predicates; the dashboard itself searches the
+    # per-session scan table's precomputed ``name_lc`` column instead
+    return [
+        f for f in functions
+        if (not search_lower or search_lower in f.get("name", "").lower())
+        and (not check_status or bool(f.get("is_valid", False)) == want_valid)
+    ]
+
+
+class _PytestProgress:
+    """Percentage of the test run pytest has reported, for the progress bar.
+    
+    Filled in from the ``[ NN%]`` markers pytest prints at the end of its
+    progress lines; stays at zero until the first one arrives.
+    """
     
-    if search:
-        search_lower = search.lower()
-        result = [f for f in result if search_lower in f.get("name", "").lower()]
+    def __init__(self) -> None:
+        self.percent = 0
+
+
+# One worker, so runs from several sessions never overlap on the same report
+_PYTEST_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pytest-run")
+
+
+def _pytest_args(
+    project_root: str, report_path: str, only_failed: bool = False, use_cache: bool = True
+) -> List[str]:
+    """Build the pytest command-line arguments for a dashboard test run.
     
-    if status == "OK":
-        result = [f for f in result if f.get("is_valid", False)]
-    elif status == "Fix":
-        result = [f for f in result if not f.get("is_valid", False)]
+    Args:
+        project_root: Repository root containing ``tests/`` and ``pytest.ini``.
+        report_path: JUnit XML report file to write.
+        only_failed: Rerun only the tests that failed last time.
+        use_cache: Use pytest's cache under ``storage/``; False for a clean run.
     
-    return result
+    Returns:
+        Arguments for ``python -m pytest``.
+    """
+    args = [
+        os.path.join(project_root, "tests"),
+        "--rootdir", project_root,
+        f"--junitxml={report_path}",
+        "-q",
+    ]
+    if not use_cache:
+        return args + ["-p", "no:cacheprovider"]
+    
+    cache_dir = os.path.join(project_root, "storage", ".pytest_cache")
+    args += ["-o", f"cache_dir={cache_dir}", "--failed-first"]
+    if only_failed:
+        args.append("--last-failed")
+    return args
+
 
+# Directories that never hold project sources the test suite depends on
+_FINGERPRINT_SKIP_DIRS = frozenset({"__pycache__", "storage", "venv", "node_modules"})
 
-def _run_pytest_with_json() -> bool:
-    """Run pytest and generate JSON report.
+# Non-Python files that change how or what pytest runs
+_FINGERPRINT_CONFIG_FILES = frozenset({"pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini"})
+
+
+def _source_fingerprint(project_root: str) -> str:
+    """Hash the paths and mtimes of the files the test suite depends on.
+    
+    Covers every ``.py`` file, pytest configuration files and every file
+    under ``tests/`` (fixtures and data files included). Environment
+    variables and other outside inputs are not covered; a forced run
+    ignores the fingerprint for those cases.
+    
+    Args:
+        project_root: Directory to walk; hidden and generated dirs are skipped.
     
     Returns:
-        True if pytest ran successfully, False otherwise.
+        Hex BLAKE2b digest that changes whenever a source file is touched.
     """
-    import sys
+    tests_dir = os.path.join(project_root, "tests")
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [
+            d for d in dirnames if not d.startswith(".") and d not in _FINGERPRINT_SKIP_DIRS
+        ]
+        in_tests = dirpath == tests_dir or dirpath.startswith(tests_dir + os.sep)
+        for name in filenames:
+            if in_tests or name.endswith(".py") or name in _FINGERPRINT_CONFIG_FILES:
+                path = os.path.join(dirpath, name)
+                entries.append(f"{path}:{os.path.getmtime(path)}")
+    entries.sort()
+    return hashlib.blake2b("\n".join(entries).encode(), digest_size=16).hexdigest()
+
+
+def _fingerprint_path(report_path: str) -> str:
+    """Return the file storing the source fingerprint a report was made from."""
+    return os.path.splitext(report_path)[0] + ".fingerprint"
+
+
+def _run_pytest_report(
+    only_failed: bool = False,
+    use_cache: bool = True,
+    progress: Optional[_PytestProgress] = None,
+    force: bool = False,
+) -> str:
+    """Run pytest and write its JUnit XML report.
+    
+    Runs the suite in a ``python -m pytest`` subprocess. Failed tests
+    from the previous run are executed first. A full cached run is skipped
+    when no source changed since the last full run's report (see
+    ``_source_fingerprint``), unless ``force`` is set.
+    
+    Args:
+        only_failed: Rerun only the tests that failed last time.
+        use_cache: Use pytest's cache under ``storage/``; False for a clean run.
+        progress: Optional progress tracker updated during the run.
+        force: Run even if the sources match the last full run.
     
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    reports_dir = os.path.join(project_root, "storage", "reports")
+    Returns:
+        ``"success"`` if pytest ran, ``"cached"`` if the run was skipped and
+        the previous report still applies, ``"error"`` otherwise.
+    """
+    project_root = PROJECT_ROOT
     
     # Ensure reports directory exists
-    os.makedirs(reports_dir, exist_ok=True)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    
+    report_path = PYTEST_REPORT_PATH
+    fingerprint_path = _fingerprint_path(report_path)
+    
+    # Reuse the previous full run when none of the sources changed since
+    fingerprint = _source_fingerprint(project_root) if use_cache and not only_failed else None
+    if fingerprint is not None and not force and os.path.exists(report_path):
+        try:
+            with open(fingerprint_path, encoding="utf-8") as f:
+                if f.read() == fingerprint:
+                    return "cached"
+        except OSError:
+            pass
+    
+    # Start from a clean report so a stale one never passes for this run
+    for path in (report_path, fingerprint_path):
+        if os.path.exists(path):
+            os.remove(path)
+    args = _pytest_args(project_root, report_path, only_failed, use_cache)
+    
+    # A missing report means pytest itself could not start (e.g. not installed)
+    ran = _run_pytest(project_root, args, progress) and os.path.exists(report_path)
+    if ran and fingerprint is not None:
+        with open(fingerprint_path, "w", encoding="utf-8") as f:
+            f.write(fingerprint)
+    return "success" if ran else "error"
+
+
+# Exit codes after which junitxml has written a complete report: OK,
+# TESTS_FAILED, INTERRUPTED (e.g. collection errors) and NO_TESTS_COLLECTED
+_REPORTED_EXIT_CODES = frozenset({0, 1, 2, 5})
+
+
+# Kill a run that hangs instead of blocking the pytest worker forever
+_PYTEST_TIMEOUT = 120
+
+# Progress marker at the end of pytest's "-q" output lines, e.g. "..F. [ 40%]"
+_PYTEST_PERCENT_PATTERN = re.compile(r"\[\s*(\d+)%\]\s*$")
+
+
+def _run_pytest(
+    project_root: str, args: List[str], progress: Optional[_PytestProgress]
+) -> bool:
+    """Execute pytest in a ``python -m pytest`` subprocess.
     
-    report_path = os.path.join(reports_dir, "pytest_results.json")
+    A separate interpreter keeps the run isolated from the app: the tests
+    import fresh ``core`` modules instead of sharing the app's caches and
+    clients, their output stays off the server console, and the results
+    match a plain command-line run.
     
+    Args:
+        project_root: Repository root, used as the subprocess working directory.
+        args: Arguments from ``_pytest_args``.
+        progress: Optional progress tracker updated as pytest reports progress.
+    
+    Returns:
+        True if pytest ran and produced a report, False otherwise.
+    """
     try:
         # Use sys.executable to ensure we use the same Python that's running Streamlit
-        result = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "pytest",
-                "--json-report",
-                f"--json-report-file={report_path}",
-                "-q",
-            ],
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "pytest", *args],
             cwd=project_root,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=120,
+            # Unbuffered, so progress lines arrive while the tests run
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
         )
-        return result.returncode == 0 or os.path.exists(report_path)
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    except OSError:
         return False
+    
+    timer = threading.Timer(_PYTEST_TIMEOUT, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            match = _PYTEST_PERCENT_PATTERN.search(line)
+            if match and progress is not None:
+                progress.percent = int(match.group(1))
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    return returncode in _REPORTED_EXIT_CODES
+
+
+_TEST_FILE_AFFIXES = re.compile(r"^test_|\.py$")
 
 
-def _parse_test_categories(data: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
-    """Parse pytest results into test categories with pass/fail counts.
+@functools.lru_cache(maxsize=512)
+def _category_for(file_part: str) -> str:
+    """Map a test file path to its display category, once per distinct file.
     
     Args:
-        data: Pytest JSON report data.
+        file_part: File portion of a pytest nodeid, e.g. ``tests/test_parser.py``.
+    
+    Returns:
+        Category label such as ``"Parser Tests"``.
+    """
+    # Extract test file name without path, prefix and extension
+    file_name = _TEST_FILE_AFFIXES.sub("", os.path.basename(file_part))
+    # Convert to title case for display; interned so files sharing a label
+    # (e.g. tests/test_x.py and tests/unit/test_x.py) share one key object
+    return sys.intern(file_name.replace("_", " ").title() + " Tests")
+
+
+_VECTORIZE_MIN_TESTS = 500
+
+
+def _parse_test_categories_vectorized(tests: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Column-wise variant of ``_parse_test_categories`` for large reports.
+    
+    Args:
+        tests: Test records with ``nodeid`` and ``outcome``.
+    
+    Returns:
+        Dictionary mapping category names to pass/fail/total counts.
+    """
+    df = pd.DataFrame(tests, columns=["nodeid", "outcome"])
+    parts = df["nodeid"].fillna("").astype(str).str.partition("::")
+    
+    # Only K distinct files, so label the uniques and map the column by hash
+    labels = {file_part: _category_for(file_part) for file_part in parts[0].unique()}
+    df["category"] = parts[0].map(labels).where(parts[1] != "", "Other Tests")
+    df["passed"] = df["outcome"] == "passed"
+    
+    grouped = df.groupby("category", sort=False)["passed"].agg(["sum", "size"])
+    return {
+        category: {
+            "passed": int(row["sum"]),
+            "failed": int(row["size"] - row["sum"]),
+            "total": int(row["size"]),
+        }
+        for category, row in grouped.iterrows()
+    }
+
+
+def _parse_test_categories(tests: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Parse pytest test records into categories with pass/fail counts.
+    
+    Args:
+        tests: Test records with ``nodeid`` and ``outcome``; any iterable
+            works, so records can be consumed as they are parsed.
     
     Returns:
         Dictionary mapping category names to pass/fail/total counts.
     """
-    categories: Dict[str, Dict[str, int]] = {}
+    if not isinstance(tests, list):
+        tests = list(tests)
+    if len(tests) > _VECTORIZE_MIN_TESTS:
+        return _parse_test_categories_vectorized(tests)
     
-    tests = data.get("tests", [])
+    passed: Counter = Counter()
+    total: Counter = Counter()
     
     for test in tests:
         nodeid = test.get("nodeid", "")
-        outcome = test.get("outcome", "")
         
         # Parse category from nodeid (e.g., "tests/test_parser.py::test_name")
-        if "::" in nodeid:
-            file_part = nodeid.split("::")[0]
-            # Extract test file name without path and extension
-            file_name = os.path.basename(file_part).replace("test_", "").replace(".py", "")
-            # Convert to title case for display
-            category = file_name.replace("_", " ").title() + " Tests"
-        else:
-            category = "Other Tests"
-        
-        if category not in categories:
-            categories[category] = {"passed": 0, "failed": 0, "total": 0}
+        file_part, sep, _ = nodeid.partition("::")
+        category = _category_for(file_part) if sep else "Other Tests"
         
-        categories[category]["total"] += 1
-        if outcome == "passed":
-            categories[category]["passed"] += 1
-        else:
-            categories[category]["failed"] += 1
+        total[category] += 1
+        passed[category] += test.get("outcome") == "passed"
+    
+    # Anything that did not pass (failed, error, skipped...) counts as failed
+    return {
+        category: {
+            "passed": passed[category],
+            "failed": count - passed[category],
+            "total": count,
+        }
+        for category, count in total.items()
+    }
+
+
+def _parsed_cache_path(report_path: str) -> str:
+    """Return the sidecar pickle path holding a report's parsed results."""
+    return os.path.splitext(report_path)[0] + ".parsed.pkl"
+
+
+def _read_parsed_cache(report_path: str, mtime: float) -> Optional[Tuple]:
+    """Return the pickled parse of ``report_path`` if it matches ``mtime``.
+    
+    Args:
+        report_path: Path of the pytest report (JUnit XML, JSON or NDJSON).
+        mtime: Modification time the cached parse must have been taken from.
+    
+    Returns:
+        The cached ``_load_and_parse`` tuple, or None if missing or stale.
+    """
+    try:
+        with open(_parsed_cache_path(report_path), "rb") as f:
+            cached_path, cached_mtime, parsed = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+        return None
+    if cached_path != report_path or cached_mtime != mtime:
+        return None
+    return parsed
+
+
+def _write_parsed_cache(report_path: str, mtime: float, parsed: Tuple) -> None:
+    """Atomically store the parse of ``report_path`` next to the report."""
+    cache_path = _parsed_cache_path(report_path)
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((report_path, mtime, parsed), f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Only a speedup; the report is simply parsed again next time
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@st.cache_data(show_spinner=False)
+def _load_and_parse(
+    report_path: str, mtime: float
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, int]], pd.DataFrame]]:
+    """Load the pytest report and derive everything the Tests tab displays.
+    
+    The result is also pickled next to the report, so a restarted app skips
+    re-parsing a report that has not changed since.
+    
+    Args:
+        report_path: Path of the pytest report (JUnit XML, JSON or NDJSON).
+        mtime: Modification time of the report, so a new run invalidates the cache.
+    
+    Returns:
+        Tuple of summary stats, per-category counts and a chart DataFrame, or None
+        if there is no usable report.
+    """
+    parsed = _read_parsed_cache(report_path, mtime)
+    if parsed is not None:
+        return parsed
+    
+    data = load_pytest_results(report_path)
+    if not data:
+        return None
+    
+    categories = _parse_test_categories(data.get("tests", []))
+    
+    summary = data.get("summary", {})
+    stats = {
+        "total": summary.get("total", 0),
+        "passed": summary.get("passed", 0),
+        "failed": summary.get("failed", 0),
+        # Every report reader returns the run duration at the top level
+        "duration": data.get("duration", 0),
+    }
+    
+    # Build chart data with both passed and failed, one row per bar segment
+    ordered = sorted(categories.items())
+    chart_data = pd.DataFrame({
+        "Category": [cat for cat, _ in ordered] * 2,
+        "Status": ["Passed"] * len(ordered) + ["Failed"] * len(ordered),
+        "Count": [c["passed"] for _, c in ordered] + [c["failed"] for _, c in ordered],
+    })
+    # Drop empty segments here rather than shipping them to the browser
+    chart_data = chart_data[chart_data["Count"] > 0].reset_index(drop=True)
+    
+    parsed = (stats, categories, chart_data)
+    _write_parsed_cache(report_path, mtime, parsed)
+    return parsed
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_tests_chart(report_path: str, mtime: float, _chart_data: pd.DataFrame):
+    """Build the stacked passed/failed Altair chart for a report version.
+    
+    Args:
+        report_path: Path of the pytest report (JUnit XML, JSON or NDJSON).
+        mtime: Modification time of the report, used with the path as cache key.
+        _chart_data: Chart rows from ``_load_and_parse`` (excluded from hashing).
+    
+    Returns:
+        Altair chart object.
+    """
+    # Imported here so the dashboard module loads without pulling in vega schemas
+    import altair as alt
+    
+    return alt.Chart(_chart_data).mark_bar(
+        cornerRadiusTopLeft=4,
+        cornerRadiusTopRight=4,
+    ).encode(
+        x=alt.X("Category:N", sort=None, axis=alt.Axis(labelAngle=-45, title=None)),
+        y=alt.Y("Count:Q", axis=alt.Axis(tickMinStep=1, title="Tests")),
+        color=alt.Color(
+            "Status:N",
+            scale=alt.Scale(domain=["Passed", "Failed"], range=["#10b981", "#ef4444"]),
+            legend=alt.Legend(title="Status", orient="top"),
+        ),
+        order=alt.Order("Status:N", sort="descending"),  # Failed on top
+        tooltip=[alt.Tooltip("Category:N"), alt.Tooltip("Status:N"), alt.Tooltip("Count:Q")],
+    ).properties(
+        height=300,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_tests_html(
+    report_path: str, mtime: float, _stats: Dict[str, Any], _categories: Dict[str, Dict[str, int]]
+) -> Tuple[str, str]:
+    """Format the summary cards and per-category rows for a report version.
+    
+    Args:
+        report_path: Path of the pytest report (JUnit XML, JSON or NDJSON).
+        mtime: Modification time of the report, used with the path as cache key.
+        _stats: Summary stats from ``_load_and_parse`` (excluded from hashing).
+        _categories: Per-category counts from ``_load_and_parse`` (excluded from hashing).
+    
+    Returns:
+        Tuple of (summary cards HTML, category rows HTML).
+    """
+    summary_html = _TESTS_SUMMARY_TEMPLATE.format(
+        passed=_stats["passed"],
+        failed=_stats["failed"],
+        total=_stats["total"],
+        duration=_stats["duration"],
+    )
+    
+    html_parts = [_TEST_CATEGORY_STYLE_HTML]
+    for category, counts in sorted(_categories.items()):
+        passed, total = counts["passed"], counts["total"]
+        template = _TEST_CATEGORY_ROW_TEMPLATES[passed == total]
+        html_parts.append(template.format(category=category, passed=passed, total=total))
+    
+    return summary_html, "".join(html_parts)
+
+
+@st.fragment(run_every=0.5)
+def _render_pytest_progress() -> None:
+    """Poll the background pytest run and show its progress.
+    
+    Reruns on its own every half second while a run is pending, then
+    triggers a full app rerun so the Tests tab loads the new report.
+    """
+    job = st.session_state.get("_pytest_job")
+    if job is None:
+        return
+    
+    future, progress, subset = job
+    if not future.done():
+        percent = progress.percent
+        label = f"Running pytest... {percent}%" if percent else "Running pytest..."
+        st.progress(min(percent, 100) / 100, text=label)
+        return
     
-    return categories
+    del st.session_state["_pytest_job"]
+    try:
+        status = future.result()
+    except Exception:
+        status = "error"
+    if status == "success":
+        st.session_state["tests_last_run_subset"] = subset
+    st.session_state["tests_run_message"] = status
+    st.rerun()
 
 
 def render_tests_tab():
@@ -761,209 +1575,76 @@ def render_tests_tab():
     styled test result cards with pass/total counts.
     """
     # Header with gradient background (matching app theme)
-    st.markdown('''
-    <div style="
-        background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-        color: white;
-        padding: 24px 32px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-    ">
-        <h2 style="margin: 0; color: white; font-size: 1.8rem;">🧪 Tests</h2>
-        <p style="margin: 8px 0 0 0; color: rgba(255,255,255,0.9); font-size: 14px;">
-            Run and visualize pytest results
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_TESTS_HEADER_HTML, unsafe_allow_html=True)
     
-    # Run Tests button
-    col1, col2 = st.columns([1, 4])
+    # Run Tests / Clean Run buttons (disabled while a run is in progress)
+    running = "_pytest_job" in st.session_state
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
     with col1:
-        run_clicked = st.button("▶️ Run Tests", key="run_tests_btn")
-    
-    if run_clicked:
-        with st.spinner("Running pytest..."):
-            success = _run_pytest_with_json()
-            if success:
-                st.success("Tests completed! Results updated.")
-                st.rerun()
-            else:
-                st.error("Failed to run pytest. Make sure pytest and pytest-json-report are installed.")
+        run_clicked = st.button("▶️ Run Tests", key="run_tests_btn", disabled=running)
+    with col2:
+        force_clicked = st.button("🔁 Force Run", key="force_run_tests_btn", disabled=running,
+                                  help="Run even if no source changed since the last run")
+    with col3:
+        clean_clicked = st.button("🧹 Clean Run", key="clean_run_tests_btn", disabled=running,
+                                  help="Run the full suite without pytest's cache")
+    with col4:
+        only_failed = st.toggle("Rerun only failed", key="tests_only_failed")
+    
+    if run_clicked or force_clicked or clean_clicked:
+        use_cache = not clean_clicked
+        subset = only_failed and use_cache
+        progress = _PytestProgress()
+        future = _PYTEST_EXECUTOR.submit(
+            _run_pytest_report, subset, use_cache, progress, force_clicked
+        )
+        st.session_state["_pytest_job"] = (future, progress, subset)
     
-    # Load and display results
-    data = load_pytest_results()
+    if "_pytest_job" in st.session_state:
+        _render_pytest_progress()
     
-    if not data:
+    message = st.session_state.pop("tests_run_message", None)
+    if message == "success":
+        st.success("Tests completed! Results updated.")
+    elif message == "cached":
+        st.info("No source changes since last run — showing cached results. "
+                "Use 🔁 Force Run to run the tests anyway.")
+    elif message == "error":
+        st.error("Failed to run pytest. Make sure pytest is installed.")
+    
+    # Load and display results (cached until the report file changes)
+    report_path, mtime = _current_report()
+    parsed = _load_and_parse(report_path, mtime)
+    
+    if not parsed:
         st.info("No test results found. Click 'Run Tests' to execute pytest and generate results.")
         
         # Installation hint
-        st.markdown('''
-        <div style="
-            background: rgba(251, 191, 36, 0.1);
-            border: 1px solid rgba(251, 191, 36, 0.3);
-            border-radius: 12px;
-            padding: 20px 24px;
-            margin-top: 16px;
-        ">
-            <div style="font-weight: 600; margin-bottom: 12px;">💡 First time setup</div>
-            <div style="font-size: 14px; margin-bottom: 12px;">
-                Make sure <code style="background: rgba(0,0,0,0.15); padding: 2px 6px; border-radius: 4px;">pytest-json-report</code> is installed:
-            </div>
-            <div style="
-                background: #1e293b;
-                color: #22d3ee;
-                padding: 12px 16px;
-                border-radius: 8px;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 14px;
-            ">
-                pip install pytest-json-report
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
+        st.markdown(_TESTS_SETUP_HINT_HTML, unsafe_allow_html=True)
         return
     
-    # Parse categories
-    categories = _parse_test_categories(data)
+    stats, categories, chart_data = parsed
     
     if not categories:
         st.warning("No test results to display.")
         return
     
-    # Summary stats
-    summary = data.get("summary", {})
-    total_tests = summary.get("total", 0)
-    passed_tests = summary.get("passed", 0)
-    failed_tests = summary.get("failed", 0)
-    # Duration is at top level in pytest-json-report output
-    duration = data.get("duration", 0)
+    if st.session_state.get("tests_last_run_subset"):
+        st.caption("♻️ Showing results of the last-failed subset, not the full suite.")
     
-    # Summary cards
-    c1, c2, c3, c4 = st.columns(4)
-    
-    with c1:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-            color: white;
-            padding: 16px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 1.8rem; font-weight: 800; color: white;">{passed_tests}</div>
-            <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">PASSED</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with c2:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-            color: white;
-            padding: 16px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 1.8rem; font-weight: 800; color: white;">{failed_tests}</div>
-            <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">FAILED</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with c3:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #0ea5e9 0%, #0369a1 100%);
-            color: white;
-            padding: 16px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 1.8rem; font-weight: 800; color: white;">{total_tests}</div>
-            <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">TOTAL</div>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    with c4:
-        st.markdown(f'''
-        <div style="
-            background: linear-gradient(135deg, #8b5cf6 0%, #7c3aed 100%);
-            color: white;
-            padding: 16px;
-            border-radius: 12px;
-            text-align: center;
-        ">
-            <div style="font-size: 1.8rem; font-weight: 800; color: white;">{duration:.2f}s</div>
-            <div style="font-size: 12px; font-weight: 600; opacity: 0.9; color: white;">DURATION</div>
-        </div>
-        ''', unsafe_allow_html=True)
+    summary_html, category_html = _build_tests_html(report_path, mtime, stats, categories)
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    # Summary cards
+    st.markdown(summary_html, unsafe_allow_html=True)
     
     # Altair bar chart - stacked with passed (green) and failed (red)
     st.markdown("#### 📊 Tests by Category")
     
-    # Build chart data with both passed and failed
-    chart_data = []
-    for cat, counts in sorted(categories.items()):
-        chart_data.append({"Category": cat, "Status": "Passed", "Count": counts["passed"]})
-        if counts["failed"] > 0:
-            chart_data.append({"Category": cat, "Status": "Failed", "Count": counts["failed"]})
-    
-    chart = alt.Chart(alt.Data(values=chart_data)).mark_bar(
-        cornerRadiusTopLeft=4,
-        cornerRadiusTopRight=4,
-    ).encode(
-        x=alt.X("Category:N", sort=None, axis=alt.Axis(labelAngle=-45, title=None)),
-        y=alt.Y("Count:Q", axis=alt.Axis(tickMinStep=1, title="Tests")),
-        color=alt.Color(
-            "Status:N",
-            scale=alt.Scale(domain=["Passed", "Failed"], range=["#10b981", "#ef4444"]),
-            legend=alt.Legend(title="Status", orient="top"),
-        ),
-        order=alt.Order("Status:N", sort="descending"),  # Failed on top
-        tooltip=[alt.Tooltip("Category:N"), alt.Tooltip("Status:N"), alt.Tooltip("Count:Q")],
-    ).properties(
-        height=300,
-    )
+    chart = _build_tests_chart(report_path, mtime, chart_data)
     
     st.altair_chart(chart, width="stretch")
     
     # Test result cards
     st.markdown("#### 📋 Test Results by Category")
     
-    for category, counts in sorted(categories.items()):
-        passed = counts["passed"]
-        total = counts["total"]
-        all_passed = passed == total
-        
-        # Card styling based on pass/fail status
-        if all_passed:
-            border_color = "#10b981"
-            bg_color = "rgba(16, 185, 129, 0.08)"
-            icon = "✅"
-        else:
-            border_color = "#ef4444"
-            bg_color = "rgba(239, 68, 68, 0.08)"
-            icon = "❌"
-        
-        st.markdown(f'''
-        <div style="
-            background: {bg_color};
-            border-left: 4px solid {border_color};
-            border-radius: 0 8px 8px 0;
-            padding: 16px 20px;
-            margin-bottom: 12px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        ">
-            <div style="display: flex; align-items: center; gap: 12px;">
-                <span style="font-size: 1.2rem;">{icon}</span>
-                <span style="font-weight: 600;">{category}</span>
-            </div>
-            <div style="font-weight: 600; color: {'#10b981' if all_passed else '#ef4444'};">
-                {passed}/{total} passed
-            </div>
-        </div>
-        ''', unsafe_allow_html=True)
-
+    st.markdown(category_html, unsafe_allow_html=True)
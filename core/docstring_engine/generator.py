@@ -1,24 +1,64 @@
+import ast
+import functools
 import hashlib
 import json
+import logging
 import os
-import random
 import re
-from typing import Dict, List, Optional
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage
+
+if TYPE_CHECKING:
+    from langchain_groq import ChatGroq
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Initialize Groq client
-_groq_client: Optional[ChatGroq] = None
+_groq_client: Optional["ChatGroq"] = None
+_groq_client_lock = threading.Lock()
 
-# Cache for generated docstrings to reduce API calls
-# Key: hash of (func_name, args, returns, style)
+# Cache for generated docstrings to reduce API calls (LRU, bounded)
+# Key: digest from _create_cache_key (metadata, style and source)
 # Value: generated docstring
-_docstring_cache: Dict[str, str] = {}
+_docstring_cache: "OrderedDict[str, str]" = OrderedDict()
+_DOCSTRING_CACHE_MAX = 10_000
+_cache_lock = threading.Lock()
+
+# Lookup outcomes, reported by get_cache_stats()
+_cache_stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+# Requests currently being generated, so concurrent callers share one API call
+_inflight: Dict[str, Future] = {}
+
+# Second cache level on disk (SQLite), so restarts do not replay Groq calls.
+# Location can be overridden with the DOCSTRING_CACHE_DIR environment variable.
+DOCSTRING_CACHE_DIR = os.getenv("DOCSTRING_CACHE_DIR") or os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "storage", "cache")
+)
+_DISK_CACHE_PATH = os.path.join(DOCSTRING_CACHE_DIR, "docstrings.sqlite3")
+_DISK_CACHE_MAX_ENTRIES = 100_000
+_DISK_CACHE_PRUNE_EVERY = 100  # writes between size-limit checks
+_disk_cache: Optional[sqlite3.Connection] = None
+_disk_cache_writes = 0
+_disk_cache_lock = threading.Lock()
+
+# Upper bound on concurrent Groq requests in a batch; kept low because more
+# parallel requests mostly trade latency for rate-limit throttling
+_GROQ_BATCH_CONCURRENCY = 5
+
+# Distinct prompts packed into one batched request; each reply is one JSON
+# array, so a handful of functions costs a single round trip
+_GROQ_PROMPTS_PER_REQUEST = 8
 
 # Pre-compiled regex patterns for performance (compiled once at module load)
 _GOOGLE_SECTION_PATTERN = re.compile(
@@ -33,185 +73,74 @@ _REST_SECTION_PATTERN = re.compile(
     r'^:(param|returns?|rtype|raises?|yields?|type|note|example)',
     re.IGNORECASE
 )
+# Section header pattern per style; any other style is treated as Google
+_SECTION_PATTERNS = {
+    "numpy": _NUMPY_SECTION_PATTERN,
+    "rest": _REST_SECTION_PATTERN,
+    "restructuredtext": _REST_SECTION_PATTERN,
+}
 _EXCEPTION_PATTERN = re.compile(r'^[A-Z][a-zA-Z]*(Error|Exception)$')
-_MULTIPLE_NEWLINES_PATTERN = re.compile(r'\n{3,}')
+_EXCEPTION_SUFFIXES = ("Error", "Exception")
 
-# Common non-imperative to imperative verb mappings for D401 fix
+# Third-person verbs the suffix rules below get wrong, mapped to the
+# imperative for the D401 fix; regular verbs are handled by the rules
 _IMPERATIVE_FIXES = {
-    # Third person singular -> Imperative
-    "Raises": "Raise",
-    "Returns": "Return",
-    "Yields": "Yield",
-    "Calculates": "Calculate",
-    "Computes": "Compute",
-    "Creates": "Create",
-    "Generates": "Generate",
-    "Gets": "Get",
-    "Sets": "Set",
-    "Checks": "Check",
-    "Validates": "Validate",
-    "Parses": "Parse",
-    "Processes": "Process",
-    "Handles": "Handle",
-    "Executes": "Execute",
-    "Performs": "Perform",
-    "Builds": "Build",
-    "Initializes": "Initialize",
-    "Converts": "Convert",
-    "Extracts": "Extract",
-    "Loads": "Load",
-    "Saves": "Save",
-    "Writes": "Write",
-    "Reads": "Read",
-    "Sends": "Send",
-    "Receives": "Receive",
-    "Updates": "Update",
-    "Deletes": "Delete",
-    "Removes": "Remove",
-    "Adds": "Add",
-    "Inserts": "Insert",
-    "Finds": "Find",
-    "Searches": "Search",
-    "Sorts": "Sort",
-    "Filters": "Filter",
-    "Maps": "Map",
-    "Reduces": "Reduce",
-    "Transforms": "Transform",
-    "Applies": "Apply",
-    "Runs": "Run",
-    "Starts": "Start",
-    "Stops": "Stop",
-    "Opens": "Open",
-    "Closes": "Close",
-    "Connects": "Connect",
-    "Disconnects": "Disconnect",
-    "Formats": "Format",
-    "Prints": "Print",
-    "Logs": "Log",
-    "Tests": "Test",
-    "Verifies": "Verify",
-    "Determines": "Determine",
-    "Evaluates": "Evaluate",
-    "Fetches": "Fetch",
-    "Retrieves": "Retrieve",
-    "Stores": "Store",
-    "Caches": "Cache",
-    "Clears": "Clear",
-    "Resets": "Reset",
-    "Copies": "Copy",
-    "Moves": "Move",
-    "Merges": "Merge",
-    "Splits": "Split",
-    "Joins": "Join",
-    "Concatenates": "Concatenate",
-    "Appends": "Append",
-    "Prepends": "Prepend",
-    "Wraps": "Wrap",
-    "Unwraps": "Unwrap",
-    "Encodes": "Encode",
-    "Decodes": "Decode",
-    "Encrypts": "Encrypt",
-    "Decrypts": "Decrypt",
-    "Compresses": "Compress",
-    "Decompresses": "Decompress",
-    "Serializes": "Serialize",
-    "Deserializes": "Deserialize",
-    "Normalizes": "Normalize",
-    "Sanitizes": "Sanitize",
-    "Escapes": "Escape",
-    "Unescapes": "Unescape",
-    "Trims": "Trim",
-    "Strips": "Strip",
-    "Pads": "Pad",
-    "Aligns": "Align",
-    "Centers": "Center",
-    "Justifies": "Justify",
-    "Truncates": "Truncate",
-    "Expands": "Expand",
-    "Collapses": "Collapse",
-    "Flattens": "Flatten",
-    "Groups": "Group",
-    "Partitions": "Partition",
-    "Chunks": "Chunk",
-    "Batches": "Batch",
-    "Queues": "Queue",
-    "Dequeues": "Dequeue",
-    "Pushes": "Push",
-    "Pops": "Pop",
-    "Peeks": "Peek",
-    "Polls": "Poll",
-    "Waits": "Wait",
-    "Sleeps": "Sleep",
-    "Delays": "Delay",
-    "Schedules": "Schedule",
-    "Dispatches": "Dispatch",
-    "Invokes": "Invoke",
-    "Calls": "Call",
-    "Triggers": "Trigger",
-    "Emits": "Emit",
-    "Publishes": "Publish",
-    "Subscribes": "Subscribe",
-    "Unsubscribes": "Unsubscribe",
-    "Listens": "Listen",
-    "Broadcasts": "Broadcast",
-    "Notifies": "Notify",
-    "Alerts": "Alert",
-    "Warns": "Warn",
-    "Configures": "Configure",
-    "Registers": "Register",
-    "Unregisters": "Unregister",
-    "Binds": "Bind",
-    "Unbinds": "Unbind",
-    "Attaches": "Attach",
-    "Detaches": "Detach",
-    "Mounts": "Mount",
-    "Unmounts": "Unmount",
-    "Enables": "Enable",
-    "Disables": "Disable",
-    "Activates": "Activate",
-    "Deactivates": "Deactivate",
-    "Locks": "Lock",
-    "Unlocks": "Unlock",
-    "Acquires": "Acquire",
-    "Releases": "Release",
-    "Allocates": "Allocate",
-    "Deallocates": "Deallocate",
-    "Frees": "Free",
-    "Disposes": "Dispose",
-    "Destroys": "Destroy",
-    "Terminates": "Terminate",
-    "Aborts": "Abort",
-    "Cancels": "Cancel",
-    "Interrupts": "Interrupt",
-    "Resumes": "Resume",
-    "Pauses": "Pause",
-    "Suspends": "Suspend",
-    "Restarts": "Restart",
-    "Reboots": "Reboot",
-    "Refreshes": "Refresh",
-    "Reloads": "Reload",
-    "Syncs": "Sync",
-    "Synchronizes": "Synchronize",
-    "Imports": "Import",
-    "Exports": "Export",
-    "Downloads": "Download",
-    "Uploads": "Upload",
-    "Installs": "Install",
-    "Uninstalls": "Uninstall",
-    "Deploys": "Deploy",
-    "Undeploys": "Undeploy",
-    "Migrates": "Migrate",
-    "Upgrades": "Upgrade",
-    "Downgrades": "Downgrade",
-    "Patches": "Patch",
-    "Fixes": "Fix",
-    "Repairs": "Repair",
-    "Recovers": "Recover",
-    "Restores": "Restore",
-    "Backs": "Back",  # "Backs up" -> "Back up"
-    "Doubles": "Double",
+    "Caches": "Cache",  # not "Cach", as the -es rule for "Catches" would give
+    "Does": "Do",
+    "Goes": "Go",
 }
 
+# Case-insensitive view of the map, so "caches" and "CACHES" are fixed too
+_IMPERATIVE_FIXES_LOWER = {k.lower(): v for k, v in _IMPERATIVE_FIXES.items()}
+
+# Suffix rules for third-person verbs, tried in order:
+# 1. "-ies" after a consonant becomes "-y" ("Applies" -> "Apply")
+# 2. "-es" is dropped after a sibilant ("Fetches" -> "Fetch", "Fixes" -> "Fix")
+# 3. "-s" is dropped after a consonant other than s/y ("Reads" -> "Read"), after
+#    consonant + e ("Uses" -> "Use"), after vowel + y ("Displays" -> "Display")
+#    or after ue/ee (no verb in the D401 list ends that way today)
+# A rule's result is only used if it is one of the imperative verbs D401
+# checks for (see _is_d401_imperative), so nouns like "Settings" are kept
+_THIRD_PERSON_PATTERN = re.compile(
+    r'^(?:([a-z]+?[b-df-hj-np-tv-z])ies'
+    r'|([a-z]+?(?:[sc]h|x|zz|ss))es'
+    r'|([a-z]+?(?:[b-df-hj-np-rtv-xz]|[b-df-hj-np-tv-z]e|[aeiou]y|[ue]e))s)$',
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _d401_wordlist():
+    """Return pydocstyle's ``(IMPERATIVE_VERBS, stem)``, or None if it is missing.
+    
+    Loaded on first use, since importing pydocstyle takes longer than the
+    rest of this module.
+    """
+    try:
+        from pydocstyle.wordlists import IMPERATIVE_VERBS, stem
+    except Exception:  # pragma: no cover - pydocstyle is optional here
+        return None
+    return IMPERATIVE_VERBS, stem
+
+
+def _is_d401_imperative(word: str, imperative: str) -> bool:
+    """Tell whether pydocstyle's D401 would want ``imperative`` in place of ``word``.
+    
+    D401 stems the first word and looks it up in its list of imperative
+    verbs; only words it finds there, in another form, are violations.
+    """
+    wordlist = _d401_wordlist()
+    if wordlist is None:
+        return False
+    imperative_verbs, stem = wordlist
+    correct_forms = imperative_verbs.get(stem(word.lower()))
+    return bool(correct_forms) and imperative.lower() in correct_forms
+
+
+# Filler words dropped after a leading "This" (D404), e.g. "This function ..."
+_THIS_FILLER_PREFIXES = ("function ", "method ", "class ", "module ", "is a ", "is an ", "will ")
+_THIS_FILLER_MAX_LEN = max(map(len, _THIS_FILLER_PREFIXES))
+
 
 def _fix_imperative_mood(content: str) -> str:
     """Fix D401 imperative mood violations in the first line of docstring.
@@ -222,25 +151,50 @@ def _fix_imperative_mood(content: str) -> str:
     if not content:
         return content
     
-    lines = content.split('\n')
-    if not lines:
-        return content
-    
-    first_line = lines[0]
-    
-    # Check if the first word needs to be converted to imperative
-    words = first_line.split(' ', 1)
-    if words:
-        first_word = words[0]
-        if first_word in _IMPERATIVE_FIXES:
-            # Replace with imperative form
-            imperative = _IMPERATIVE_FIXES[first_word]
-            if len(words) > 1:
-                lines[0] = imperative + ' ' + words[1]
-            else:
-                lines[0] = imperative
+    first_line, sep, rest = content.partition('\n')
+    return _imperative_line(first_line) + sep + rest
+
+
+def _imperative_line(first_line: str) -> str:
+    """Apply the D401 imperative-mood fix to a single first line."""
+    # Check if the first word needs to be converted to imperative (no split list)
+    space = first_line.find(' ')
+    if space < 0:
+        # A lone word ("Notes.", "Returns:") is a heading, not a sentence
+        return first_line
+    first_word = first_line[:space]
+    imperative = _imperative_word(first_word)
+    if imperative is None:
+        return first_line
+    # Replace with imperative form, keeping the rest of the line as is
+    return imperative + first_line[len(first_word):]
+
+
+def _imperative_word(word: str) -> Optional[str]:
+    """Return the imperative form of a third-person verb, or None to keep it.
     
-    return '\n'.join(lines)
+    Irregular verbs come from the map, matched case-insensitively; the rest
+    go through the suffix rules, limited to verbs D401 checks for. Either
+    way the word's own capitalization (lower, UPPER or Title) is kept in
+    the replacement.
+    """
+    lower = word.lower()
+    imperative = _IMPERATIVE_FIXES_LOWER.get(lower)
+    if imperative is None:
+        match = _THIRD_PERSON_PATTERN.match(word)
+        if match is None:
+            return None
+        if match.group(1):
+            # Keep the case of the replaced "ies" for the new "y"
+            imperative = match.group(1) + ("Y" if word[-1].isupper() else "y")
+        else:
+            imperative = match.group(2) or match.group(3)
+        return imperative if _is_d401_imperative(word, imperative) else None
+    if word.isupper() and len(word) > 1:
+        return imperative.upper()
+    if word[0].islower():
+        return imperative.lower()
+    return imperative
 
 
 def _fix_pep257_first_line(content: str) -> str:
@@ -253,90 +207,104 @@ def _fix_pep257_first_line(content: str) -> str:
     if not content:
         return content
     
-    lines = content.split('\n')
-    if not lines:
-        return content
+    first_line, sep, rest = content.partition('\n')
+    return _pep257_line(first_line) + sep + rest
+
+
+def _pep257_line(first_line: str) -> str:
+    """Apply the D400/D403/D404 fixes to a single first line.
     
-    first_line = lines[0].strip()
+    The fixes only decide where the line starts, whether its first letter is
+    upper-cased and whether a period follows, so the result is sliced out and
+    concatenated once instead of being rebuilt after every fix.
+    """
+    line = first_line.strip()
+    if not line:
+        return first_line
     
-    if not first_line:
-        return content
+    # D404: Skip "This" at the start and rephrase (lowercase only the prefix)
+    # e.g., "This function calculates..." -> "Calculate..."
+    start = 0
+    if line[:5].lower().startswith("this "):
+        # The line is stripped, so a non-space character follows "This "
+        start = 5
+        while line[start].isspace():
+            start += 1
+        # Common patterns: "This function/method/class X" -> remove and capitalize
+        rest_head = line[start:start + _THIS_FILLER_MAX_LEN].lower()
+        for pattern in _THIS_FILLER_PREFIXES:
+            if rest_head.startswith(pattern):
+                start += len(pattern)
+                break
     
-    # D404: Remove "This" from the start and rephrase
-    if first_line.lower().startswith("this "):
-        # Try to extract the meaningful part after "This"
-        # e.g., "This function calculates..." -> "Calculate..."
-        rest = first_line[5:].strip()
-        if rest:
-            # Common patterns: "This function/method/class X" -> remove and capitalize
-            for pattern in ["function ", "method ", "class ", "module ", "is a ", "is an ", "will "]:
-                if rest.lower().startswith(pattern):
-                    rest = rest[len(pattern):]
-                    break
-            first_line = rest
+    # D400: Ensure first line ends with a period, unless it ends with other punctuation
+    period = "" if line[-1] in ".!?:" else "."
     
     # D403: Capitalize first word
-    if first_line and first_line[0].islower():
-        first_line = first_line[0].upper() + first_line[1:]
-    
-    # D400: Ensure first line ends with a period
-    if first_line and not first_line.endswith('.'):
-        # Don't add period if it ends with other punctuation
-        if not first_line[-1] in '!?:':
-            first_line = first_line + '.'
-    
-    lines[0] = first_line
-    return '\n'.join(lines)
+    first_char = line[start]
+    if first_char.islower():
+        return first_char.upper() + line[start + 1:] + period
+    if start or period:
+        return line[start:] + period
+    return line
 
 
-def _get_groq_client() -> ChatGroq:
-    """Get or create the Groq client singleton."""
+def _get_groq_client() -> "ChatGroq":
+    """Get or create the Groq client singleton.
+    
+    One client is shared by every thread: its httpx connection pool is
+    thread-safe, and keeping enough idle connections alive for a full batch
+    means concurrent requests reuse them instead of reconnecting.
+    """
     global _groq_client
     if _groq_client is None:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found in environment variables")
-        _groq_client = ChatGroq(
-            api_key=api_key,
-            model_name="llama-3.1-8b-instant",
-            temperature=0.3,
-        )
+        with _groq_client_lock:
+            if _groq_client is None:
+                api_key = os.getenv("GROQ_API_KEY")
+                if not api_key:
+                    raise ValueError("GROQ_API_KEY not found in environment variables")
+                # Imported on first use: langchain takes longer to import than
+                # the rest of the app, and template generation never needs it
+                import httpx
+                from langchain_groq import ChatGroq
+                
+                _groq_client = ChatGroq(
+                    api_key=api_key,
+                    model_name="llama-3.1-8b-instant",
+                    temperature=0.3,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=2 * _GROQ_BATCH_CONCURRENCY,
+                            max_keepalive_connections=_GROQ_BATCH_CONCURRENCY,
+                        ),
+                    ),
+                )
     return _groq_client
 
 
-def _build_groq_prompt(func_meta: Dict, style: str, variation_seed: int = 0) -> str:
-    """Build the prompt for Groq to generate a docstring.
+def _human_message(content: str):
+    """Wrap ``content`` in a langchain ``HumanMessage`` (imported with the client)."""
+    from langchain_core.messages import HumanMessage
     
-    Args:
-        func_meta: Function metadata.
-        style: Docstring style.
-        variation_seed: Random seed to add variation to prompts for regeneration.
-    """
-    name = func_meta.get("name", "<function>")
-    args_meta = func_meta.get("args_meta", [])
-    has_return = func_meta.get("has_return", False)
-    returns = func_meta.get("returns")
-    raises = func_meta.get("raises", [])
-    yields = func_meta.get("yields")
-    attributes = func_meta.get("attributes", [])
-    
-    # Add variation hint for regeneration requests
-    variation_hints = [
-        "",
-        "Use clear and professional language.",
-        "Focus on clarity and brevity.",
-        "Emphasize the function's purpose.",
-        "Use descriptive parameter explanations.",
-        "Be precise about types and returns.",
-        "Write in an informative tone.",
-        "Prioritize readability.",
-    ]
-    variation_hint = variation_hints[variation_seed % len(variation_hints)]
+    return HumanMessage(content=content)
+
+
+# Prompt pieces are built once at import instead of on every _build_groq_prompt call
+# Variation hints used for regeneration requests
+_VARIATION_HINTS = (
+    "",
+    "Use clear and professional language.",
+    "Focus on clarity and brevity.",
+    "Emphasize the function's purpose.",
+    "Use descriptive parameter explanations.",
+    "Be precise about types and returns.",
+    "Write in an informative tone.",
+    "Prioritize readability.",
+)
 
-    
-    # Style-specific instructions
-    style_instructions = {
-        "google": """Generate a Google-style docstring with these sections (if applicable):
+# Style-specific instructions
+_STYLE_INSTRUCTIONS = {
+    "google": """Generate a Google-style docstring with these sections (if applicable):
 - One-line summary (imperative mood, e.g., "Calculate the sum...")
 - Blank line after summary
 - Args: section with each parameter on its own line, indented with 4 spaces
@@ -358,7 +326,7 @@ Returns:
 Raises:
     ExceptionType: When this exception is raised.""",
 
-        "numpy": """Generate a NumPy-style docstring with these sections (if applicable):
+    "numpy": """Generate a NumPy-style docstring with these sections (if applicable):
 - One-line summary
 - Blank line after summary
 - Parameters section with dashed underline
@@ -387,7 +355,7 @@ Raises
 ExceptionType
     When this exception is raised.""",
 
-        "rest": """Generate a reStructuredText-style docstring with these sections (if applicable):
+    "rest": """Generate a reStructuredText-style docstring with these sections (if applicable):
 - One-line summary
 - Blank line after summary
 - :param directives for each parameter
@@ -404,19 +372,11 @@ Short description of the function.
 :returns: Description of return value.
 :rtype: type
 :raises ExceptionType: When this exception is raised."""
-    }
-    
-    style_instruction = style_instructions.get(style, style_instructions["google"])
-    
-    # Get the actual function source code
-    source_code = func_meta.get("source_code", "")
-    
-    # Build variation instruction if present
-    variation_instruction = f"\n{variation_hint}" if variation_hint else ""
-    
-    # If source code is available, use it directly for the most accurate docstring
-    if source_code:
-        prompt = f"""Analyze this Python function and generate a docstring for it.
+}
+
+# Source-code prompt, specialised per style at import so a call only fills in
+# the source and variation; ``{style_instruction}`` is substituted up front
+_SOURCE_PROMPT_TEMPLATE = """Analyze this Python function and generate a docstring for it.
 
 ```python
 {source_code}
@@ -459,6 +419,45 @@ PEP 257 COMPLIANCE (CRITICAL - follow these exactly):
   * Blank line before each section
   * No blank lines between section header and its content{variation_instruction}
 """
+_SOURCE_PROMPT_TEMPLATES = {
+    style: _SOURCE_PROMPT_TEMPLATE.replace(
+        "{style_instruction}", instruction.replace("{", "{{").replace("}", "}}")
+    )
+    for style, instruction in _STYLE_INSTRUCTIONS.items()
+}
+
+
+def _build_groq_prompt(func_meta: Dict, style: str, variation_seed: int = 0) -> str:
+    """Build the prompt for Groq to generate a docstring.
+    
+    Args:
+        func_meta: Function metadata.
+        style: Docstring style.
+        variation_seed: Index of the variation hint added to prompts for regeneration.
+    """
+    name = func_meta.get("name", "<function>")
+    args_meta = func_meta.get("args_meta", [])
+    has_return = func_meta.get("has_return", False)
+    returns = func_meta.get("returns")
+    raises = func_meta.get("raises", [])
+    yields = func_meta.get("yields")
+    attributes = func_meta.get("attributes", [])
+    
+    # Add variation hint for regeneration requests
+    variation_hint = _VARIATION_HINTS[variation_seed % len(_VARIATION_HINTS)]
+    
+    style_instruction = _STYLE_INSTRUCTIONS.get(style, _STYLE_INSTRUCTIONS["google"])
+    
+    # Get the actual function source code
+    source_code = func_meta.get("source_code", "")
+    
+    # Build variation instruction if present
+    variation_instruction = f"\n{variation_hint}" if variation_hint else ""
+    
+    # If source code is available, use it directly for the most accurate docstring
+    if source_code:
+        template = _SOURCE_PROMPT_TEMPLATES.get(style, _SOURCE_PROMPT_TEMPLATES["google"])
+        prompt = template.format(source_code=source_code, variation_instruction=variation_instruction)
     else:
         # Fallback to metadata-based prompt if no source code
         args_info = []
@@ -483,156 +482,176 @@ Return ONLY the docstring content, no triple quotes."""
     return prompt
 
 
-def _create_cache_key(func_meta: Dict, style: str) -> str:
-    """Create a unique cache key based on function metadata and style."""
-    # Extract relevant fields for caching
-    cache_data = {
-        "name": func_meta.get("name", ""),
-        "args_meta": func_meta.get("args_meta", []),
-        "has_return": func_meta.get("has_return", False),
-        "returns": func_meta.get("returns"),
-        "raises": func_meta.get("raises", []),
-        "has_yields": func_meta.get("has_yields", False),
-        "yields": func_meta.get("yields"),
-        "style": style,
-        "source_code": func_meta.get("source_code", ""),
-    }
-    # Create a hash of the cache data
-    cache_str = json.dumps(cache_data, sort_keys=True)
-    return hashlib.md5(cache_str.encode()).hexdigest()
+_BATCH_PROMPT_HEADER = """Each numbered section below is a separate request for one Python docstring.
+Follow the instructions of a section for that docstring only.
 
+Return ONLY a JSON array of {count} strings in section order: element i is the
+docstring content for section i, without triple quotes. Add no other text."""
 
-def _post_process_docstring(content: str, func_meta: Dict, style: str) -> str:
-    """Remove hallucinated sections from AI-generated docstrings.
+
+def _build_groq_batch_prompt(prompts: List[str]) -> str:
+    """Pack several single-docstring prompts into one request.
     
-    If the function metadata shows no raises/returns/yields, strip those sections
-    from the generated docstring to prevent hallucinations.
+    The reply is read back with ``_parse_groq_batch_response``.
     """
+    sections = [_BATCH_PROMPT_HEADER.format(count=len(prompts))]
+    for number, prompt in enumerate(prompts, 1):
+        sections.append(f"### Section {number}\n\n{prompt}")
+    return "\n\n".join(sections)
+
+
+def _parse_groq_batch_response(content: str, count: int) -> Optional[List[str]]:
+    """Return the ``count`` docstrings of a batched reply, or None if it is malformed."""
+    # Slicing from the first '[' to the last ']' drops code fences and preambles
+    start = content.find("[")
+    end = content.rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        items = json.loads(content[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != count:
+        return None
+    if not all(isinstance(item, str) for item in items):
+        return None
+    return items
+
+
+def _create_cache_key(func_meta: Dict, style: str) -> str:
+    """Create a unique cache key based on function metadata and style.
     
-    # Determine what sections are actually valid based on metadata
-    has_raises = bool(func_meta.get("raises", []))
-    has_return = func_meta.get("has_return", False)
-    has_yields = func_meta.get("has_yields", False)
-    
-    # Define invalid sections based on metadata
-    invalid_sections = set()
-    if not has_raises:
-        invalid_sections.add("raises")
-    if not has_return:
-        invalid_sections.add("returns")
-    if not has_yields:
-        invalid_sections.add("yields")
-    # Always remove Note/Example/Attributes sections (not applicable to functions)
-    invalid_sections.add("note")
-    invalid_sections.add("example")
-    invalid_sections.add("see also")
-    invalid_sections.add("attributes")  # D414: Functions don't have attributes
-    
-    # Use pre-compiled section patterns for different styles
-    if style == "numpy":
-        section_pattern = _NUMPY_SECTION_PATTERN
-    elif style in ("rest", "restructuredtext"):
-        section_pattern = _REST_SECTION_PATTERN
-    else:
-        section_pattern = _GOOGLE_SECTION_PATTERN
+    The key is a digest that is stable across processes, computed once per
+    lookup and shared by the in-memory and the on-disk cache levels.
+    """
+    fields = (
+        func_meta.get("name", ""),
+        [(a.get("name"), a.get("annotation")) for a in func_meta.get("args_meta", [])],
+        func_meta.get("has_return", False),
+        func_meta.get("returns"),
+        list(func_meta.get("raises", [])),
+        func_meta.get("has_yields", False),
+        func_meta.get("yields"),
+        style,
+    )
+    # The prompt embeds the source, so it is part of the key; it is fed to
+    # the hash directly rather than JSON-escaped along with the other fields
+    digest = hashlib.blake2b(json.dumps(fields).encode(), digest_size=16)
+    digest.update(b"\0")
+    digest.update(func_meta.get("source_code", "").encode())
+    return digest.hexdigest()
+
+
+def _collapse_blank_lines(lines: List[str]) -> List[str]:
+    r"""Collapse runs of empty lines like ``\n{3,}`` -> ``\n\n`` on the joined text.
     
-    lines = content.split('\n')
+    Works on the line list so the passes of ``_post_process_docstring`` never
+    have to join and re-split the docstring in between.
+    """
+    result: List[str] = []
+    n = len(lines)
+    i = 0
+    while i < n:
+        if lines[i]:
+            result.append(lines[i])
+            i += 1
+            continue
+        start = i
+        while i < n and not lines[i]:
+            i += 1
+        run = i - start
+        # Newlines the run spans in the joined text, given what surrounds it
+        newlines = run + (start > 0) + (i < n) - 1
+        if newlines >= 3:
+            # Two newlines: one empty line between text, two at an edge, three alone
+            run = 3 - (start > 0) - (i < n)
+        result.extend([""] * run)
+    return result
+
+
+# Words a header of each removable section must contain (lowercased)
+_SECTION_TOKENS = {
+    "raises": ("raise",),
+    "returns": ("return", "rtype"),
+    "yields": ("yield",),
+    "note": ("note",),
+    "example": ("example",),
+    "see also": ("see also",),
+    "attributes": ("attributes",),
+}
+
+# Header spellings that share a removable section's name
+_SECTION_ALIASES = {
+    "raise": "raises",
+    "raised": "raises",
+    "return": "returns",
+    "rtype": "returns",
+    "yield": "yields",
+    "examples": "example",
+    "notes": "note",
+}
+
+# Canonical name of every header the section patterns match, keyed by its
+# usual spellings (lower, Title, UPPER) so most headers need no .lower() copy;
+# the names are interned, making set lookups identity hits
+_SECTION_KEYS = {
+    variant: sys.intern(_SECTION_ALIASES.get(spelling, spelling))
+    for spelling in (
+        *_SECTION_ALIASES, *_SECTION_TOKENS, "args", "parameters", "param", "type", "warning", "warnings",
+    )
+    for variant in (spelling, spelling.title(), spelling.upper())
+}
+
+# Every line _strip_hallucinations drops or truncates at contains one of these
+_HALLUCINATION_TRIGGERS = ("None", "Attributes", "Error", "Exception", "Note")
+
+
+def _is_underline(stripped: str) -> bool:
+    """Return True for a non-empty line made only of dashes (a NumPy underline)."""
+    # str.strip runs in C, unlike a generator over the characters
+    return bool(stripped) and not stripped.strip("-")
+
+
+def _strip_invalid_sections(
+    lines: List[str], invalid_sections: set, section_pattern: re.Pattern, style: str
+) -> List[str]:
+    """Drop the sections in ``invalid_sections`` and their content lines."""
     result_lines = []
-    current_section = None  # Track which section we're in
     skip_current_section = False
+    is_numpy = style == "numpy"
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for line in lines:
         stripped = line.strip()
         
-        # Check if this line starts a new section
+        # Every header decides whether the lines up to the next one are dropped
         section_match = section_pattern.match(stripped)
-        
         if section_match:
-            section_name = section_match.group(1).lower() if section_match.lastindex else section_match.group(0).lower()
-            # Normalize section names
-            section_name = section_name.replace(":", "").strip()
-            if section_name in ("raise", "raised"):
-                section_name = "raises"
-            elif section_name in ("return", "rtype"):
-                section_name = "returns"
-            elif section_name in ("yield",):
-                section_name = "yields"
-            elif section_name in ("examples",):
-                section_name = "example"
-            elif section_name in ("notes",):
-                section_name = "note"
-            
-            current_section = section_name
+            header = section_match.group(1)
+            section_name = _SECTION_KEYS.get(header)
+            if section_name is None:
+                section_name = header.lower()
+                section_name = _SECTION_ALIASES.get(section_name, section_name)
             skip_current_section = section_name in invalid_sections
-            
             if skip_current_section:
-                i += 1
-                # For NumPy style, also skip the underline
-                if style == "numpy" and i < len(lines) and lines[i].strip() and all(c == '-' for c in lines[i].strip()):
-                    i += 1
                 continue
-        
-        # For NumPy style, check if this is an underline following a section we're skipping
-        if style == "numpy" and stripped and all(c == '-' for c in stripped) and skip_current_section:
-            i += 1
-            continue
-        
-        # If we're in a section that should be skipped, check if content belongs to it
-        if skip_current_section:
-            # Content lines are usually indented or empty
-            # A new section starts when we see a non-indented, non-empty line that matches section pattern
-            # Or for reST, a line starting with :
-            is_content = stripped == "" or line.startswith("    ") or line.startswith("\t")
-            
-            if style in ("rest", "restructuredtext"):
-                # reST: each :directive: is its own "section"
-                if stripped.startswith(":"):
-                    section_match = section_pattern.match(stripped)
-                    if section_match:
-                        section_name = section_match.group(1).lower()
-                        if section_name in ("raise", "raises"):
-                            section_name = "raises"
-                        elif section_name in ("return", "returns", "rtype"):
-                            section_name = "returns"
-                        elif section_name in ("yield", "yields"):
-                            section_name = "yields"
-                        
-                        current_section = section_name
-                        skip_current_section = section_name in invalid_sections
-                        if skip_current_section:
-                            i += 1
-                            continue
-                        else:
-                            result_lines.append(line)
-                            i += 1
-                            continue
-            
-            if is_content:
-                i += 1
+        elif skip_current_section:
+            # NumPy underlines and blank or indented lines belong to the skipped
+            # section; any other line ends it
+            if (is_numpy and _is_underline(stripped)) or not stripped or line.startswith(("    ", "\t")):
                 continue
-            else:
-                # New non-indented content means new section or end of section
-                skip_current_section = False
-                current_section = None
+            skip_current_section = False
         
         result_lines.append(line)
-        i += 1
     
-    # Clean up extra blank lines
-    result = '\n'.join(result_lines)
-    result = _MULTIPLE_NEWLINES_PATTERN.sub('\n\n', result)  # Max 2 newlines in a row
-    
-    # Additional cleanup for hallucinated content
-    lines = result.split('\n')
+    return result_lines
+
+
+def _strip_hallucinations(lines: List[str], func_meta: Dict) -> List[str]:
+    """Drop stray exception names, empty Attributes, "None" lines and trailing Notes."""
     cleaned_lines = []
     
     # Get actual raises from metadata
-    actual_raises = set(func_meta.get("raises", []))
-    
-    # Use pre-compiled pattern to detect exception names
-    
+    actual_raises = frozenset(func_meta.get("raises", []))
     
     i = 0
     while i < len(lines):
@@ -646,7 +665,15 @@ def _post_process_docstring(content: str, func_meta: Dict, style: str) -> str:
         
         # Skip hallucinated exception lines (exception name without proper Raises header)
         # Dynamically detect if a line looks like an exception name but isn't in actual raises
-        if _EXCEPTION_PATTERN.match(stripped) and stripped not in actual_raises:
+        # The first-character and suffix tests are cheap and reject almost every
+        # line, so the pre-compiled pattern only runs on likely candidates
+        if (
+            stripped
+            and stripped[0].isupper()
+            and stripped.endswith(_EXCEPTION_SUFFIXES)
+            and stripped not in actual_raises
+            and _EXCEPTION_PATTERN.match(stripped)
+        ):
             # Check if this looks like a hallucinated raises entry
             # (appears after an Attributes section or at odd places)
             # Skip this line and any following indented description
@@ -660,7 +687,7 @@ def _post_process_docstring(content: str, func_meta: Dict, style: str) -> str:
         # Skip empty Attributes section (header followed by dashes then "None" or empty)
         if stripped == "Attributes":
             # Look ahead for NumPy style
-            if i + 1 < len(lines) and lines[i + 1].strip() and all(c == '-' for c in lines[i + 1].strip()):
+            if i + 1 < len(lines) and _is_underline(lines[i + 1].strip()):
                 # Check if next content is just "None" or empty
                 j = i + 2
                 while j < len(lines) and lines[j].strip() == "":
@@ -670,36 +697,260 @@ def _post_process_docstring(content: str, func_meta: Dict, style: str) -> str:
                     i = j + 1 if j < len(lines) and lines[j].strip() == "None" else j
                     continue
         
+        # Remove trailing Note sections (often disclaimers): Note: or Note followed
+        # by explanation ends the docstring, as it's usually at the end
+        if stripped.startswith("Note:") or stripped.startswith("Note "):
+            break
+        
         cleaned_lines.append(line)
         i += 1
     
-    result = '\n'.join(cleaned_lines)
-    result = _MULTIPLE_NEWLINES_PATTERN.sub('\n\n', result)  # Clean up again
+    return cleaned_lines
+
+
+def _post_process_docstring(content: str, func_meta: Dict, style: str) -> str:
+    """Remove hallucinated sections from AI-generated docstrings.
     
-    # Final cleanup: Remove trailing Note sections (often disclaimers)
-    lines = result.split('\n')
-    final_lines = []
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        # Check for Note: or Note followed by explanation (common pattern for AI disclaimers)
-        if stripped.startswith("Note:") or stripped.startswith("Note "):
-            # Skip this and all remaining lines (it's usually at the end)
-            break
-        final_lines.append(line)
+    If the function metadata shows no raises/returns/yields, strip those sections
+    from the generated docstring to prevent hallucinations.
+    """
+    
+    # Determine what sections are actually valid based on metadata
+    has_raises = bool(func_meta.get("raises", []))
+    has_return = func_meta.get("has_return", False)
+    has_yields = func_meta.get("has_yields", False)
+    
+    # Define invalid sections based on metadata
+    invalid_sections = set()
+    if not has_raises:
+        invalid_sections.add("raises")
+    if not has_return:
+        invalid_sections.add("returns")
+    if not has_yields:
+        invalid_sections.add("yields")
+    # Always remove Note/Example/Attributes sections (not applicable to functions)
+    invalid_sections.add("note")
+    invalid_sections.add("example")
+    invalid_sections.add("see also")
+    invalid_sections.add("attributes")  # D414: Functions don't have attributes
+    
+    # Use pre-compiled section patterns for different styles
+    section_pattern = _SECTION_PATTERNS.get(style, _GOOGLE_SECTION_PATTERN)
+    
+    # Most replies for small functions are a single summary line. Unless it is
+    # itself a section header or holds a trigger word, neither pass can drop
+    # it and there are no blank lines to collapse, so only the first-line
+    # fixes apply
+    if (
+        '\n' not in content
+        and not any(trigger in content for trigger in _HALLUCINATION_TRIGGERS)
+        and not section_pattern.match(content.strip())
+    ):
+        return _pep257_line(_imperative_line(content)).strip()
+    
+    lines = content.split('\n')
+    
+    # A section header always contains one of these words, so without them the
+    # scan is a no-op. Non-ASCII text is always scanned: IGNORECASE folds more
+    # characters than lower() does.
+    content_lower = content.lower()
+    if not content.isascii() or any(
+        token in content_lower for name in invalid_sections for token in _SECTION_TOKENS[name]
+    ):
+        lines = _strip_invalid_sections(lines, invalid_sections, section_pattern, style)
+    
+    # Clean up extra blank lines
+    lines = _collapse_blank_lines(lines)  # Max 2 newlines in a row
+    
+    # Additional cleanup for hallucinated content, which only ever touches
+    # lines containing one of the trigger words (pass 1 only removes lines)
+    if any(trigger in content for trigger in _HALLUCINATION_TRIGGERS):
+        lines = _collapse_blank_lines(_strip_hallucinations(lines, func_meta))  # Clean up again
+    
+    if lines:
+        # Fix D401 imperative mood, then D400 (period), D403 (capitalize), D404 (no "This")
+        lines[0] = _pep257_line(_imperative_line(lines[0]))
+    
+    # The only join of the whole docstring, once every pass is done
+    return '\n'.join(lines).strip()
+
+
+# Common AI preambles, tried in order as one anchored alternation
+_PREAMBLE_PATTERNS = (
+    "Here's the generated docstring for the given function:",
+    "Here's the generated docstring:",
+    "Here's the docstring:",
+    "Here is the generated docstring for the given function:",
+    "Here is the generated docstring:",
+    "Here is the docstring:",
+    "Here's a docstring for the function:",
+    "Here is a docstring for the function:",
+    "Generated docstring:",
+    "Short description of the function.",
+)
+_PREAMBLE_PATTERN = re.compile(
+    "|".join(re.escape(preamble) for preamble in _PREAMBLE_PATTERNS), re.IGNORECASE
+)
+
+
+def _strip_triple_quotes(content: str) -> str:
+    """Remove one pair of triple quotes wrapping the whole reply."""
+    for quotes in ('"""', "'''"):
+        if content.startswith(quotes) and content.endswith(quotes):
+            # Shorter than two sets of quotes means the quotes overlap: it is
+            # nothing but quote characters
+            if len(content) < 6:
+                return ""
+            return content.removeprefix(quotes).removesuffix(quotes).strip()
+    return content
+
+
+def _clean_groq_response(content: str) -> str:
+    """Strip quotes, preambles and code blocks from a raw Groq reply."""
+    content = content.strip()
+    
+    # Remove any accidental triple quotes if present
+    content = _strip_triple_quotes(content)
+    
+    # Remove common AI preambles (case-insensitive, one anchored regex match)
+    match = _PREAMBLE_PATTERN.match(content)
+    if match:
+        content = content[match.end():].strip()
     
-    result = '\n'.join(final_lines)
-    result = _MULTIPLE_NEWLINES_PATTERN.sub('\n\n', result)
+    # Remove code blocks (```python ... ```) - AI sometimes includes these
+    # Remove everything from ``` onwards (code blocks are garbage)
+    if '```' in content:
+        content = content.split('```')[0].strip()
     
-    # Fix D401 imperative mood violations
-    result = _fix_imperative_mood(result)
+    # Remove any trailing triple quotes that slipped through
+    if '"""' in content:
+        content = content.split('"""')[0].strip()
+    if "'''" in content:
+        content = content.split("'''")[0].strip()
+    
+    return content
+
+
+def _get_disk_cache(create: bool = False) -> Optional[sqlite3.Connection]:
+    """Open the on-disk docstring cache, or None if it is missing or unusable.
+    
+    Args:
+        create: Create the database if it does not exist yet; lookups pass
+            False so a cold cache never touches the filesystem.
+    """
+    global _disk_cache
+    if _disk_cache is None and (create or os.path.exists(_DISK_CACHE_PATH)):
+        try:
+            os.makedirs(DOCSTRING_CACHE_DIR, exist_ok=True)
+            conn = sqlite3.connect(_DISK_CACHE_PATH, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docstrings "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS docstrings_accessed ON docstrings (accessed)")
+            conn.commit()
+            _disk_cache = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Docstring disk cache unavailable: %s", e)
+            return None
+    return _disk_cache
+
+
+def _cache_get(cache_key: str) -> Optional[str]:
+    """Return a cached docstring from memory or disk and mark it recently used."""
+    with _cache_lock:
+        value = _docstring_cache.get(cache_key)
+        if value is not None:
+            _docstring_cache.move_to_end(cache_key)
+            _cache_stats["memory_hits"] += 1
+            return value
+    
+    with _disk_cache_lock:
+        conn = _get_disk_cache()
+        if conn is not None:
+            try:
+                row = conn.execute("SELECT value FROM docstrings WHERE key = ?", (cache_key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE docstrings SET accessed = ? WHERE key = ?", (time.time(), cache_key))
+                    conn.commit()
+                    value = row[0]
+            except sqlite3.Error:
+                value = None
+    
+    with _cache_lock:
+        _cache_stats["disk_hits" if value is not None else "misses"] += 1
+    if value is not None:
+        # Promote to the in-memory level
+        _cache_put(cache_key, value, persist=False)
+    return value
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Return docstring cache lookup counts since start-up.
+    
+    Returns:
+        ``memory_hits``, ``disk_hits`` and ``misses`` counters, plus the
+        number of ``entries`` currently held in memory.
+    """
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_docstring_cache)}
+
+
+def _cache_put(cache_key: str, value: str, persist: bool = True) -> None:
+    """Store a docstring, evicting the least recently used entry when full.
+    
+    Args:
+        cache_key: Key from ``_create_cache_key``.
+        value: Generated docstring body.
+        persist: Also write the entry to the on-disk cache.
+    """
+    with _cache_lock:
+        _docstring_cache[cache_key] = value
+        _docstring_cache.move_to_end(cache_key)
+        if len(_docstring_cache) > _DOCSTRING_CACHE_MAX:
+            _docstring_cache.popitem(last=False)
     
-    # Fix D400 (period), D403 (capitalize), D404 (no "This")
-    result = _fix_pep257_first_line(result)
+    global _disk_cache_writes
+    if not persist:
+        return
+    with _disk_cache_lock:
+        conn = _get_disk_cache(create=True)
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO docstrings (key, value, accessed) VALUES (?, ?, ?)",
+                (cache_key, value, time.time()),
+            )
+            # Drop the least recently used rows beyond the size limit now and then
+            if _disk_cache_writes % _DISK_CACHE_PRUNE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM docstrings WHERE key IN (SELECT key FROM docstrings "
+                    "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (_DISK_CACHE_MAX_ENTRIES,),
+                )
+            _disk_cache_writes += 1
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not write docstring disk cache: %s", e)
+
+
+def _variation_seed(cache_key: str, attempt: int) -> int:
+    """Pick the prompt variation for a regeneration or retry deterministically.
     
-    return result.strip()
+    Args:
+        cache_key: Key from ``_create_cache_key``.
+        attempt: Regeneration count plus retry count; each step moves to the
+            next variation hint, so successive regenerations differ.
+    """
+    # Derived from the stable key digest so the same function and attempt
+    # always get the same prompt
+    return (int(cache_key[:8], 16) + attempt) % len(_VARIATION_HINTS)
 
 
-def _generate_with_groq(func_meta: Dict, style: str, skip_cache: bool = False, retry_count: int = 0) -> str:
+def _generate_with_groq(
+    func_meta: Dict, style: str, skip_cache: bool = False, retry_count: int = 0, regen_count: int = 0
+) -> str:
     """Generate a docstring using Groq API with caching.
     
     Args:
@@ -707,62 +958,55 @@ def _generate_with_groq(func_meta: Dict, style: str, skip_cache: bool = False, r
         style: Docstring style.
         skip_cache: If True, skip cache and generate fresh.
         retry_count: Internal counter for retry attempts on empty responses.
+        regen_count: How many times the caller has asked for a new suggestion
+            for this function (e.g. Reject); selects the variation hint.
     """
-    global _docstring_cache
-    
-    MAX_RETRIES = 2  # Maximum number of retry attempts for empty responses
+    cache_key = _create_cache_key(func_meta, style)
+    if skip_cache:
+        return _request_docstring(func_meta, style, cache_key, skip_cache, retry_count, regen_count)
     
     # Check cache first (unless skip_cache is True for regeneration)
-    cache_key = _create_cache_key(func_meta, style)
-    if not skip_cache and cache_key in _docstring_cache:
-        return _docstring_cache[cache_key]
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Wait on an identical request already in flight instead of repeating it
+    with _cache_lock:
+        future = _inflight.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[cache_key] = Future()
+    if not is_owner:
+        return future.result()
+    
+    try:
+        result = _request_docstring(func_meta, style, cache_key, skip_cache, retry_count, regen_count)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _cache_lock:
+            _inflight.pop(cache_key, None)
+
+
+def _request_docstring(
+    func_meta: Dict, style: str, cache_key: str, skip_cache: bool, retry_count: int, regen_count: int = 0
+) -> str:
+    """Call Groq for one docstring, retrying empty replies, and cache the result."""
+    MAX_RETRIES = 2  # Maximum number of retry attempts for empty responses
     
     try:
         client = _get_groq_client()
-        # Use a random variation seed when regenerating or retrying to get different output
-        variation_seed = random.randint(1, 100) if (skip_cache or retry_count > 0) else 0
+        # Vary the prompt when regenerating or retrying to get different output
+        attempt = regen_count + retry_count
+        variation_seed = _variation_seed(cache_key, attempt) if (skip_cache or retry_count > 0) else 0
         prompt = _build_groq_prompt(func_meta, style, variation_seed=variation_seed)
-        message = HumanMessage(content=prompt)
+        message = _human_message(prompt)
         response = client.invoke([message])
         
-        # Extract the content from the response
-        content = response.content.strip()
-        
-        # Remove any accidental triple quotes if present
-        if content.startswith('"""') and content.endswith('"""'):
-            content = content[3:-3].strip()
-        elif content.startswith("'''") and content.endswith("'''"):
-            content = content[3:-3].strip()
-        
-        # Remove common AI preambles (case-insensitive comparison)
-        preamble_patterns = [
-            "Here's the generated docstring for the given function:",
-            "Here's the generated docstring:",
-            "Here's the docstring:",
-            "Here is the generated docstring for the given function:",
-            "Here is the generated docstring:",
-            "Here is the docstring:",
-            "Here's a docstring for the function:",
-            "Here is a docstring for the function:",
-            "Generated docstring:",
-            "Short description of the function.",
-        ]
-        content_lower = content.lower()
-        for preamble in preamble_patterns:
-            if content_lower.startswith(preamble.lower()):
-                content = content[len(preamble):].strip()
-                break
-        
-        # Remove code blocks (```python ... ```) - AI sometimes includes these
-        # Remove everything from ``` onwards (code blocks are garbage)
-        if '```' in content:
-            content = content.split('```')[0].strip()
-        
-        # Remove any trailing triple quotes that slipped through
-        if '"""' in content:
-            content = content.split('"""')[0].strip()
-        if "'''" in content:
-            content = content.split("'''")[0].strip()
+        content = _clean_groq_response(response.content)
         
         # Post-process to remove hallucinated sections
         content = _post_process_docstring(content, func_meta, style)
@@ -770,22 +1014,136 @@ def _generate_with_groq(func_meta: Dict, style: str, skip_cache: bool = False, r
         # Check if the result is empty - retry with different variation or fall back to template
         if not content or not content.strip():
             if retry_count < MAX_RETRIES:
-                print(f"Groq returned empty docstring. Retrying ({retry_count + 1}/{MAX_RETRIES})...")
-                return _generate_with_groq(func_meta, style, skip_cache=True, retry_count=retry_count + 1)
+                logger.warning("Groq returned empty docstring. Retrying (%d/%d)...", retry_count + 1, MAX_RETRIES)
+                return _generate_with_groq(
+                    func_meta, style, skip_cache=True, retry_count=retry_count + 1, regen_count=regen_count
+                )
             else:
-                print("Groq returned empty docstring after all retries. Falling back to template generation.")
+                logger.warning("Groq returned empty docstring after all retries. Falling back to template generation.")
                 return _fallback_generate(func_meta, style)
         
         # Store in cache
-        _docstring_cache[cache_key] = content
+        _cache_put(cache_key, content)
         
         return content
     except Exception as e:
         # Log error and fall back to template-based generation
-        print(f"Groq API error: {e}. Falling back to template generation.")
+        logger.warning("Groq API error: %s. Falling back to template generation.", e)
         return _fallback_generate(func_meta, style)
 
 
+def _generate_with_groq_batch(jobs: List[Tuple[Dict, str]], skip_cache: bool = False) -> List[str]:
+    """Generate docstrings for many functions with one batched Groq call.
+    
+    Cache hits are resolved locally; the remaining distinct prompts are packed
+    several to a request by ``_request_packed`` and sent together through
+    ``ChatGroq.batch`` so their round trips overlap. Any job whose request
+    fails or comes back empty or malformed goes through ``_generate_with_groq``,
+    which handles retries and the template fallback.
+    
+    Args:
+        jobs: ``(func_meta, style)`` pairs.
+        skip_cache: If True, skip cache and generate fresh.
+    
+    Returns:
+        Docstring bodies in the same order as ``jobs``.
+    """
+    results: List[Optional[str]] = [None] * len(jobs)
+    pending = []  # (index, cache_key) of jobs that need the API
+    
+    for i, (func_meta, style) in enumerate(jobs):
+        cache_key = _create_cache_key(func_meta, style)
+        cached = None if skip_cache else _cache_get(cache_key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, cache_key))
+    
+    if pending:
+        try:
+            client = _get_groq_client()
+            # Functions of the same shape often produce the same prompt; send
+            # each distinct prompt once and fan its reply out to every job
+            prompt_slots: Dict[str, int] = {}
+            slots = []
+            for i, cache_key in pending:
+                prompt = _build_groq_prompt(
+                    *jobs[i], variation_seed=_variation_seed(cache_key, 0) if skip_cache else 0
+                )
+                slots.append(prompt_slots.setdefault(prompt, len(prompt_slots)))
+            unique_replies = _request_packed(client, list(prompt_slots))
+            replies = [unique_replies[slot] for slot in slots]
+        except Exception as e:
+            logger.warning("Groq batch error: %s. Generating one at a time.", e)
+            replies = [None] * len(pending)
+        
+        retries = []  # indexes of jobs whose batched request failed or came back empty
+        for (i, cache_key), reply in zip(pending, replies):
+            func_meta, style = jobs[i]
+            content = ""
+            if reply:
+                content = _clean_groq_response(reply)
+                content = _post_process_docstring(content, func_meta, style)
+            
+            if content and content.strip():
+                _cache_put(cache_key, content)
+                results[i] = content
+            else:
+                retries.append(i)
+        
+        # Retry the failures concurrently too, within the same concurrency cap
+        retried = _map_concurrently(
+            lambda i: _generate_with_groq(*jobs[i], skip_cache=True, retry_count=1), retries
+        )
+        for i, content in zip(retries, retried):
+            results[i] = content
+    
+    return results
+
+
+def _request_packed(client: "ChatGroq", prompts: List[str]) -> List[Optional[str]]:
+    """Send ``prompts`` through ``ChatGroq.batch``, several to a request.
+    
+    Prompts go out in groups of ``_GROQ_PROMPTS_PER_REQUEST`` packed by
+    ``_build_groq_batch_prompt``; a group of one is sent as is.
+    
+    Returns:
+        The raw reply text of each prompt, in order; None where the request
+        failed or its reply could not be split into one docstring per prompt.
+    """
+    groups = [
+        prompts[i:i + _GROQ_PROMPTS_PER_REQUEST]
+        for i in range(0, len(prompts), _GROQ_PROMPTS_PER_REQUEST)
+    ]
+    responses = client.batch(
+        [
+            [_human_message(group[0] if len(group) == 1 else _build_groq_batch_prompt(group))]
+            for group in groups
+        ],
+        config={"max_concurrency": _GROQ_BATCH_CONCURRENCY},
+        return_exceptions=True,
+    )
+    
+    replies: List[Optional[str]] = []
+    for group, response in zip(groups, responses):
+        if isinstance(response, Exception):
+            replies.extend([None] * len(group))
+        elif len(group) == 1:
+            replies.append(response.content)
+        else:
+            items = _parse_groq_batch_response(response.content, len(group))
+            replies.extend(items if items is not None else [None] * len(group))
+    return replies
+
+
+def _map_concurrently(fn, items: List) -> List:
+    """Apply ``fn`` to ``items`` on up to ``_GROQ_BATCH_CONCURRENCY`` threads, keeping order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_GROQ_BATCH_CONCURRENCY, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
 # ============================================================================
 # FALLBACK TEMPLATE-BASED GENERATION (used when Groq API fails)
 # ============================================================================
@@ -794,18 +1152,22 @@ def _infer_type(annotation: Optional[str]) -> str:
     return annotation if annotation else "Any"
 
 
+@functools.lru_cache(maxsize=2048)
 def _infer_param_desc(name: str) -> str:
     return f"{name} value."
 
 
+@functools.lru_cache(maxsize=2048)
 def _infer_return_desc(func_name: str) -> str:
     return f"Result of {func_name}."
 
 
+@functools.lru_cache(maxsize=2048)
 def _infer_attr_desc(name: str) -> str:
     return f"{name} attribute."
 
 
+@functools.lru_cache(maxsize=2048)
 def _humanize_name(name: str) -> str:
     """Return a human-friendly, capitalized version of a function or attribute name."""
     if not name:
@@ -824,42 +1186,35 @@ def _build_google_body(func_meta: Dict) -> str:
     yields = func_meta.get("yields")
     attributes = func_meta.get("attributes", [])
 
-    parts: List[str] = [f"Short description of `{name}`."]
-
-    if args_meta:
-        arg_lines = ["Args:"]
-        for arg in args_meta:
-            arg_lines.append(
-                f"    {arg['name']} ({_infer_type(arg.get('annotation'))}): "
-                f"{_infer_param_desc(arg['name'])}"
-            )
-        parts.append("\n".join(arg_lines))
-
-    if has_return:
-        parts.append(
-            f"Returns:\n    {_infer_type(returns)}: {_infer_return_desc(name)}"
-        )
-
-    if has_yields:
-        parts.append(
-            f"Yields:\n    {_infer_type(yields)}: Yielded values."
-        )
-
-    if attributes:
-        attr_lines = ["Attributes:"]
-        for attr in attributes:
-            attr_lines.append(
-                f"    {attr} ({_infer_type(None)}): {_infer_attr_desc(attr)}"
-            )
-        parts.append("\n".join(attr_lines))
-
-    if raises:
-        raise_lines = ["Raises:"]
-        for r in raises:
-            raise_lines.append(f"    {r}: If an error occurs.")
-        parts.append("\n".join(raise_lines))
-
-    return "\n\n".join(parts)
+    # Each block carries its own leading blank line, so an absent section is
+    # just "" and the whole body is assembled by one f-string
+    args_block = (
+        "\n\nArgs:" + "".join(
+            f"\n    {arg['name']} ({_infer_type(arg.get('annotation'))}): {_infer_param_desc(arg['name'])}"
+            for arg in args_meta
+        ) if args_meta else ""
+    )
+    returns_block = (
+        f"\n\nReturns:\n    {_infer_type(returns)}: {_infer_return_desc(name)}" if has_return else ""
+    )
+    yields_block = f"\n\nYields:\n    {_infer_type(yields)}: Yielded values." if has_yields else ""
+    # Attributes carry no annotation, so their type is the same for every entry
+    attr_type = _infer_type(None)
+    attrs_block = (
+        "\n\nAttributes:" + "".join(
+            f"\n    {attr} ({attr_type}): {_infer_attr_desc(attr)}" for attr in attributes
+        ) if attributes else ""
+    )
+    raises_block = (
+        "\n\nRaises:" + "".join(
+            f"\n    {r}: If an error occurs." for r in raises
+        ) if raises else ""
+    )
+
+    return (
+        f"Short description of `{name}`."
+        f"{args_block}{returns_block}{yields_block}{attrs_block}{raises_block}"
+    )
 
 
 def _build_numpy_body(func_meta: Dict) -> str:
@@ -872,37 +1227,32 @@ def _build_numpy_body(func_meta: Dict) -> str:
     yields = func_meta.get("yields")
     attributes = func_meta.get("attributes", [])
 
-    parts: List[str] = [f"{_humanize_name(name)} summary."]
-
-    if args_meta:
-        parts.append("\nParameters\n----------")
-        for arg in args_meta:
-            parts.append(f"{arg['name']} : {_infer_type(arg.get('annotation'))}")
-            parts.append(f"    {_infer_param_desc(arg['name'])}")
-
-    if has_return:
-        parts.append("\nReturns\n-------")
-        parts.append(f"{_infer_type(returns)}")
-        parts.append(f"    {_infer_return_desc(name)}")
-
-    if has_yields:
-        parts.append("\nYields\n------")
-        parts.append(f"{_infer_type(yields)}")
-        parts.append("    Yielded values.")
-
-    if attributes:
-        parts.append("\nAttributes\n----------")
-        for attr in attributes:
-            parts.append(f"{attr} : {_infer_type(None)}")
-            parts.append(f"    {_infer_attr_desc(attr)}")
-
-    if raises:
-        parts.append("\nRaises\n------")
-        for r in raises:
-            parts.append(f"{r}")
-            parts.append("    If an error occurs.")
-
-    return "\n".join(parts)
+    args_block = (
+        "\n\nParameters\n----------" + "".join(
+            f"\n{arg['name']} : {_infer_type(arg.get('annotation'))}\n    {_infer_param_desc(arg['name'])}"
+            for arg in args_meta
+        ) if args_meta else ""
+    )
+    returns_block = (
+        f"\n\nReturns\n-------\n{_infer_type(returns)}\n    {_infer_return_desc(name)}" if has_return else ""
+    )
+    yields_block = f"\n\nYields\n------\n{_infer_type(yields)}\n    Yielded values." if has_yields else ""
+    attr_type = _infer_type(None)
+    attrs_block = (
+        "\n\nAttributes\n----------" + "".join(
+            f"\n{attr} : {attr_type}\n    {_infer_attr_desc(attr)}" for attr in attributes
+        ) if attributes else ""
+    )
+    raises_block = (
+        "\n\nRaises\n------" + "".join(
+            f"\n{r}\n    If an error occurs." for r in raises
+        ) if raises else ""
+    )
+
+    return (
+        f"{_humanize_name(name)} summary."
+        f"{args_block}{returns_block}{yields_block}{attrs_block}{raises_block}"
+    )
 
 
 def _build_rest_body(func_meta: Dict) -> str:
@@ -915,33 +1265,46 @@ def _build_rest_body(func_meta: Dict) -> str:
     yields = func_meta.get("yields")
     attributes = func_meta.get("attributes", [])
 
-    parts: List[str] = [f"{_humanize_name(name)} description.", ""]
-
-    for arg in args_meta:
-        parts.append(
-            f":param {arg['name']}: {_infer_param_desc(arg['name'])}"
-        )
-        parts.append(
-            f":type {arg['name']}: {_infer_type(arg.get('annotation'))}"
-        )
+    args_block = "".join(
+        f"\n:param {arg['name']}: {_infer_param_desc(arg['name'])}"
+        f"\n:type {arg['name']}: {_infer_type(arg.get('annotation'))}"
+        for arg in args_meta
+    )
+    returns_block = (
+        f"\n:returns: {_infer_return_desc(name)}\n:rtype: {_infer_type(returns)}" if has_return else ""
+    )
+    yields_block = f"\n:yields: Yielded values.\n:ytype: {_infer_type(yields)}" if has_yields else ""
+    attrs_block = "".join(f"\n:attribute {attr}: {_infer_attr_desc(attr)}" for attr in attributes)
+    raises_block = "".join(f"\n:raises {r}: If an error occurs." for r in raises)
+
+    return (
+        f"{_humanize_name(name)} description.\n"
+        f"{args_block}{returns_block}{yields_block}{attrs_block}{raises_block}"
+    )
+
+
+# Template body builder per style; any other style falls back to Google
+_TEMPLATE_BUILDERS = {
+    "google": _build_google_body,
+    "numpy": _build_numpy_body,
+    "rest": _build_rest_body,
+    "restructuredtext": _build_rest_body,
+}
 
-    if has_return:
-        parts.append(f":returns: {_infer_return_desc(name)}")
-        parts.append(f":rtype: {_infer_type(returns)}")
 
-    if has_yields:
-        parts.append(":yields: Yielded values.")
-        parts.append(f":ytype: {_infer_type(yields)}")
+# Prompts for the simpler fallback request, filled in with str.format
+_FALLBACK_SOURCE_PROMPT = """Write a brief docstring for this Python function. Return ONLY the docstring text, no quotes.
 
-    for attr in attributes:
-        parts.append(
-            f":attribute {attr}: {_infer_attr_desc(attr)}"
-        )
+```python
+{source_code}
+```
 
-    for r in raises:
-        parts.append(f":raises {r}: If an error occurs.")
+Style: {style}
+Just write a one-line summary describing what this function does."""
+_FALLBACK_NAME_PROMPT = """Write a brief docstring for a function called '{name}' with parameters: {args_list}
 
-    return "\n".join(parts)
+Style: {style}
+Just write a one-line summary describing what this function likely does based on its name."""
 
 
 def _fallback_generate(func_meta: Dict, style: str) -> str:
@@ -954,31 +1317,18 @@ def _fallback_generate(func_meta: Dict, style: str) -> str:
         
         # Build a very simple prompt
         if source_code:
-            simple_prompt = f"""Write a brief docstring for this Python function. Return ONLY the docstring text, no quotes.
-
-```python
-{source_code}
-```
-
-Style: {style}
-Just write a one-line summary describing what this function does."""
+            simple_prompt = _FALLBACK_SOURCE_PROMPT.format(source_code=source_code, style=style)
         else:
             args_meta = func_meta.get("args_meta", [])
             args_list = ", ".join(arg.get("name", "") for arg in args_meta)
-            simple_prompt = f"""Write a brief docstring for a function called '{name}' with parameters: {args_list or 'none'}
-
-Style: {style}
-Just write a one-line summary describing what this function likely does based on its name."""
+            simple_prompt = _FALLBACK_NAME_PROMPT.format(name=name, args_list=args_list or 'none', style=style)
         
-        message = HumanMessage(content=simple_prompt)
+        message = _human_message(simple_prompt)
         response = client.invoke([message])
         content = response.content.strip()
         
         # Clean up the response
-        if content.startswith('"""') and content.endswith('"""'):
-            content = content[3:-3].strip()
-        elif content.startswith("'''") and content.endswith("'''"):
-            content = content[3:-3].strip()
+        content = _strip_triple_quotes(content)
         if '```' in content:
             content = content.split('```')[0].strip()
         if '"""' in content:
@@ -987,23 +1337,19 @@ Just write a one-line summary describing what this function likely does based on
         if content and content.strip():
             return content
     except Exception as e:
-        print(f"Fallback Groq call failed: {e}")
+        logger.warning("Fallback Groq call failed: %s", e)
     
     # Last resort: template-based generation
-    if style == "google":
-        return _build_google_body(func_meta)
-    if style == "numpy":
-        return _build_numpy_body(func_meta)
-    if style in ("rest", "restructuredtext"):
-        return _build_rest_body(func_meta)
-    return _build_google_body(func_meta)
+    return _TEMPLATE_BUILDERS.get(style, _build_google_body)(func_meta)
 
 
 # ============================================================================
 # PUBLIC API
 # ============================================================================
 
-def generate_docstring(func_meta: Dict, style: str = "google", skip_cache: bool = False) -> str:
+def generate_docstring(
+    func_meta: Dict, style: str = "google", skip_cache: bool = False, regen_count: int = 0
+) -> str:
     """
     Generate a docstring using Groq AI.
     
@@ -1011,6 +1357,8 @@ def generate_docstring(func_meta: Dict, style: str = "google", skip_cache: bool
         func_meta: Function metadata dictionary.
         style: Docstring style ('google', 'numpy', 'rest', or 'none').
         skip_cache: If True, skip cache and generate a fresh docstring.
+        regen_count: Number of fresh suggestions already requested for this
+            function; each value sends a different prompt variation.
     
     Returns the docstring BODY only (no triple quotes).
     Falls back to template-based generation if Groq API fails.
@@ -1019,7 +1367,54 @@ def generate_docstring(func_meta: Dict, style: str = "google", skip_cache: bool
         return ""
     
     # Use Groq for generation
-    return _generate_with_groq(func_meta, style, skip_cache=skip_cache)
+    return _generate_with_groq(func_meta, style, skip_cache=skip_cache, regen_count=regen_count)
+
+
+def generate_docstrings(jobs: List[Tuple[Dict, str]], skip_cache: bool = False) -> List[str]:
+    """
+    Generate docstrings for several functions in one batched Groq request.
+    
+    Args:
+        jobs: ``(func_meta, style)`` pairs; style as for ``generate_docstring``.
+        skip_cache: If True, skip cache and generate fresh docstrings.
+    
+    Returns the docstring BODIES in the same order as ``jobs``.
+    Jobs with style 'none' get an empty string.
+    """
+    results = [""] * len(jobs)
+    styled = [i for i, (_, style) in enumerate(jobs) if style != "none"]
+    generated = _generate_with_groq_batch([jobs[i] for i in styled], skip_cache=skip_cache)
+    for i, docstring in zip(styled, generated):
+        results[i] = docstring
+    return results
+
+
+# Prompt for module-level docstrings, filled in with str.format
+_MODULE_PROMPT = """Generate a brief module-level docstring for this Python file.
+
+File name: {file_name}
+Module name: {module_name}
+
+File content preview:
+```python
+{preview}
+```
+
+RULES:
+- Write a concise one-line description of what this module does
+- Use imperative mood (e.g., "Provide utilities for..." not "Provides utilities for...")
+- First word must be capitalized
+- First line MUST end with a period
+- Do NOT start with "This module" or "This file"
+- Do NOT include author info, dates, or copyright
+- Return ONLY the docstring text, no triple quotes
+- Keep it to 1-2 sentences maximum
+
+Example good docstrings:
+- "Provide core validation utilities for Python docstrings."
+- "Define the main application entry point and UI components."
+- "Implement database connection and query utilities."
+"""
 
 
 def generate_module_docstring(file_path: str, file_content: str = "") -> str:
@@ -1052,41 +1447,14 @@ def generate_module_docstring(file_path: str, file_content: str = "") -> str:
     try:
         client = _get_groq_client()
         
-        prompt = f"""Generate a brief module-level docstring for this Python file.
-
-File name: {file_name}
-Module name: {module_name}
-
-File content preview:
-```python
-{preview}
-```
-
-RULES:
-- Write a concise one-line description of what this module does
-- Use imperative mood (e.g., "Provide utilities for..." not "Provides utilities for...")
-- First word must be capitalized
-- First line MUST end with a period
-- Do NOT start with "This module" or "This file"
-- Do NOT include author info, dates, or copyright
-- Return ONLY the docstring text, no triple quotes
-- Keep it to 1-2 sentences maximum
-
-Example good docstrings:
-- "Provide core validation utilities for Python docstrings."
-- "Define the main application entry point and UI components."
-- "Implement database connection and query utilities."
-"""
+        prompt = _MODULE_PROMPT.format(file_name=file_name, module_name=module_name, preview=preview)
         
-        message = HumanMessage(content=prompt)
+        message = _human_message(prompt)
         response = client.invoke([message])
         content = response.content.strip()
         
         # Clean up response
-        if content.startswith('"""') and content.endswith('"""'):
-            content = content[3:-3].strip()
-        elif content.startswith("'''") and content.endswith("'''"):
-            content = content[3:-3].strip()
+        content = _strip_triple_quotes(content)
         
         # Remove preambles
         if content.lower().startswith("here"):
@@ -1101,12 +1469,36 @@ Example good docstrings:
         return content.strip()
         
     except Exception as e:
-        print(f"Module docstring generation error: {e}")
+        logger.warning("Module docstring generation error: %s", e)
         # Fallback to simple template
         humanized = module_name.replace("_", " ").title()
         return f"{humanized} module."
 
 
+def generate_module_docstrings(file_paths: List[str]) -> List[str]:
+    """Generate module-level docstrings for many files concurrently.
+    
+    Args:
+        file_paths: Paths of the Python files.
+    
+    Returns:
+        Module docstring bodies in the same order as ``file_paths``.
+    """
+    return _map_concurrently(generate_module_docstring, file_paths)
+
+
+# Openings that mark an existing module docstring, checked with one startswith call
+_QUOTE_PREFIXES = ('"""', "'''", 'r"""', "r'''")
+
+
+def _line_offset(content: str, lineno: int) -> int:
+    """Return the offset in ``content`` at which 1-based line ``lineno`` starts."""
+    offset = 0
+    for _ in range(lineno - 1):
+        offset = content.find('\n', offset) + 1
+    return offset
+
+
 def insert_module_docstring(file_path: str, docstring_body: str) -> bool:
     """Insert a module-level docstring at the beginning of a Python file.
     
@@ -1123,53 +1515,72 @@ def insert_module_docstring(file_path: str, docstring_body: str) -> bool:
     except Exception:
         return False
     
-    lines = content.split('\n')
-    
     # D301: Use raw string if docstring contains backslashes
     quote_prefix = 'r' if '\\' in docstring_body else ''
+    new_docstring = f'{quote_prefix}"""{docstring_body}"""'
     
-    # Check if module already has a docstring
-    for i, line in enumerate(lines):
-        stripped = line.strip()
+    # An existing docstring is located exactly from the AST; the textual
+    # heuristic below only decides this when the file does not parse
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        tree = None
+    if tree is not None and tree.body:
+        first = tree.body[0]
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            # Replace the docstring's whole lines, keeping everything around them
+            start = _line_offset(content, first.lineno)
+            end = content.find('\n', _line_offset(content, first.end_lineno))
+            new_content = content[:start] + new_docstring + (content[end:] if end != -1 else '')
+            try:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(new_content)
+                return True
+            except Exception:
+                return False
+    
+    # Walk the lines by offset so the file is edited with slices of the
+    # original string instead of being split and re-joined
+    new_content = None
+    line_start = 0
+    while line_start <= len(content):
+        line_end = content.find('\n', line_start)
+        next_start = line_end + 1 if line_end != -1 else len(content) + 1
+        if line_end == -1:
+            line_end = len(content)
+        stripped = content[line_start:line_end].strip()
         if not stripped or stripped.startswith('#'):
-            continue  # Skip empty lines and comments
-        if stripped.startswith('"""') or stripped.startswith("'''") or stripped.startswith('r"""') or stripped.startswith("r'''"):
+            line_start = next_start  # Skip empty lines and comments
+            continue
+        if tree is None and stripped.startswith(_QUOTE_PREFIXES):
             # Already has a module docstring, replace it
-            # Find the end of the docstring
             quote_type = '"""' if '"""' in stripped else "'''"
             if stripped.count(quote_type) >= 2 and len(stripped) > 6:
                 # Single-line docstring
-                lines[i] = f'{quote_prefix}"""{docstring_body}"""'
+                new_content = content[:line_start] + new_docstring + content[line_end:]
             else:
-                # Multi-line docstring - find end
-                end_idx = i + 1
-                while end_idx < len(lines):
-                    if quote_type in lines[end_idx]:
-                        break
-                    end_idx += 1
-                # Replace the entire docstring
-                lines = lines[:i] + [f'{quote_prefix}"""{docstring_body}"""'] + lines[end_idx + 1:]
-            
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write('\n'.join(lines))
-                return True
-            except Exception:
-                return False
+                # Multi-line docstring - the first later line holding the
+                # closing quotes ends it; without one, everything is replaced
+                close_idx = content.find(quote_type, next_start)
+                close_end = content.find('\n', close_idx) if close_idx != -1 else -1
+                tail = content[close_end:] if close_end != -1 else ''
+                new_content = content[:line_start] + new_docstring + tail
         else:
             # No docstring exists, insert at this position
-            new_docstring = f'{quote_prefix}"""{docstring_body}"""'
-            lines.insert(i, new_docstring)
-            
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write('\n'.join(lines))
-                return True
-            except Exception:
-                return False
+            new_content = content[:line_start] + new_docstring + '\n' + content[line_start:]
+        break
+    
+    if new_content is not None:
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(new_content)
+            return True
+        except Exception:
+            return False
     
     # File is empty or only comments - add at the beginning
-    new_content = f'{quote_prefix}"""{docstring_body}"""\n' + content
+    new_content = new_docstring + '\n' + content
     try:
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(new_content)
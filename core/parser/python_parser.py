@@ -1,39 +1,141 @@
 import ast
+import atexit
+import hashlib
 import os
-from typing import Any, Dict, List, Optional
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-# Cache for parsed files: {path: {"mtime": float, "result": Dict}}
+# Cache for parsed files: {abs_path: {"mtime_ns": int, "size": int, "result": Dict}}
 # This avoids re-parsing files that haven't changed
 _parse_cache: Dict[str, Dict[str, Any]] = {}
 
+# The cache is also persisted between runs, one pickle per source directory so
+# a change in one folder only rewrites that folder's shard. Location can be
+# overridden with the PARSE_CACHE_DIR environment variable.
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR") or os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "storage", "cache")
+)
+_loaded_shards: Set[str] = set()
+_dirty_shards: Set[str] = set()
+
+# Bump when the shape of parse results changes; shards written by another
+# format version, or by a different revision of this module, are discarded
+_CACHE_FORMAT_VERSION = 1
+
+
+def _cache_signature() -> str:
+    """Return the format version and parser source digest stored in each shard."""
+    try:
+        with open(__file__, "rb") as fh:
+            digest = hashlib.blake2b(fh.read(), digest_size=8).hexdigest()
+    except OSError:
+        digest = "unknown"
+    return f"{_CACHE_FORMAT_VERSION}:{digest}"
+
+
+_CACHE_SIGNATURE = _cache_signature()
+
+# parse_path fans out to worker processes once this many files need parsing;
+# below that, process start-up costs more than it saves
+_PARALLEL_MIN_FILES = 32
+_PARALLEL_MAX_WORKERS = 8
+
 
 def clear_parse_cache() -> None:
-    """Clear the file parse cache."""
+    """Clear the in-memory file parse cache.
+    
+    Persisted entries stay valid, as they are keyed by modification time and
+    size; they are simply read back from disk on the next lookup.
+    """
     global _parse_cache
     _parse_cache.clear()
+    _loaded_shards.clear()
+    _dirty_shards.clear()
+
+
+def _shard_path(directory: str) -> str:
+    """Return the on-disk cache shard for the files in ``directory``."""
+    digest = hashlib.blake2b(directory.encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+    return os.path.join(PARSE_CACHE_DIR, f"parse-{digest}.pkl")
+
+
+def _load_shard(directory: str) -> None:
+    """Merge the persisted entries for ``directory`` into the memory cache, once."""
+    if directory in _loaded_shards:
+        return
+    _loaded_shards.add(directory)
+    try:
+        with open(_shard_path(directory), "rb") as fh:
+            shard = pickle.load(fh)
+    except Exception:
+        # A missing, truncated or incompatible shard just means a cold cache
+        return
+    # Results from another parser revision may differ from what it returns now
+    if not isinstance(shard, dict) or shard.get("signature") != _CACHE_SIGNATURE:
+        return
+    entries = shard.get("entries")
+    if isinstance(entries, dict):
+        for abs_path, entry in entries.items():
+            _parse_cache.setdefault(abs_path, entry)
+
+
+def _save_cache() -> None:
+    """Write every shard that gained entries since it was last saved."""
+    if not _dirty_shards:
+        return
+    shards: Dict[str, Dict[str, Dict[str, Any]]] = {directory: {} for directory in _dirty_shards}
+    for abs_path, entry in _parse_cache.items():
+        entries = shards.get(os.path.dirname(abs_path))
+        if entries is not None:
+            entries[abs_path] = entry
+    for directory, entries in shards.items():
+        path = _shard_path(directory)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(
+                    {"signature": _CACHE_SIGNATURE, "entries": entries},
+                    fh,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            # Atomic swap, so a concurrent reader never sees a partial shard
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            continue
+        _dirty_shards.discard(directory)
+
+
+atexit.register(_save_cache)
 
 
 def _get_annotation_str(node: Optional[ast.AST]) -> Optional[str]:
     if node is None:
         return None
+    # Plain and dotted names, the bulk of annotations and raised exceptions,
+    # come out of ast.unparse unchanged, so build them directly
+    t = type(node)
+    if t is ast.Name:
+        return node.id
+    if t is ast.Attribute:
+        parts = [node.attr]
+        cur = node.value
+        while type(cur) is ast.Attribute:
+            parts.append(cur.attr)
+            cur = cur.value
+        if type(cur) is ast.Name:
+            parts.append(cur.id)
+            return ".".join(reversed(parts))
     try:
         return ast.unparse(node)
     except Exception:
-        try:
-            if isinstance(node, ast.Name):
-                return node.id
-            if isinstance(node, ast.Attribute):
-                parts: List[str] = []
-                cur = node
-                while isinstance(cur, ast.Attribute):
-                    parts.append(cur.attr)
-                    cur = cur.value
-                if isinstance(cur, ast.Name):
-                    parts.append(cur.id)
-                return ".".join(reversed(parts))
-        except Exception:
-            return None
-    return None
+        return None
 
 
 def _get_default_str(node: Optional[ast.AST]) -> Optional[str]:
@@ -48,43 +150,116 @@ def _get_default_str(node: Optional[ast.AST]) -> Optional[str]:
             return None
 
 
-def _simple_complexity(node: ast.FunctionDef) -> int:
-    count = 1
-    for n in ast.walk(node):
-        if isinstance(n, (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.AsyncFor)):
-            count += 1
-        elif isinstance(n, ast.BoolOp):
-            count += max(0, len(n.values) - 1)
-    return count
-
-
-def _max_nesting_depth(node: ast.FunctionDef) -> int:
-    max_depth = 0
-
-    def _visit(n: ast.AST, depth: int) -> None:
-        nonlocal max_depth
-        if isinstance(
-            n,
-            (
-                ast.If,
-                ast.For,
-                ast.While,
-                ast.Try,
-                ast.With,
-                ast.AsyncFor,
-                ast.FunctionDef,
-                ast.AsyncFunctionDef,
-            ),
-        ):
-            max_depth = max(max_depth, depth)
-            for c in ast.iter_child_nodes(n):
-                _visit(c, depth + 1)
+# Statements that each add one branch to the complexity count
+_BRANCH_TYPES = frozenset({ast.If, ast.For, ast.While, ast.Try, ast.With, ast.AsyncFor})
+# Nodes whose bodies are one level deeper for the nesting depth
+_NESTING_TYPES = _BRANCH_TYPES | {ast.FunctionDef, ast.AsyncFunctionDef}
+
+
+def _summarize_function(fn: ast.AST) -> Dict[str, Any]:
+    """Collect body metadata of a function in a single traversal.
+    
+    Returns, yields, raises, ``self.x`` attributes, complexity and nesting
+    depth are all gathered while visiting each node once. Node types are
+    compared by identity, with the names resolved once as locals. There is
+    no early exit once a return or yield is seen: complexity, nesting,
+    raises and attributes need every node regardless.
+    """
+    branch_types, nesting_types = _BRANCH_TYPES, _NESTING_TYPES
+    BoolOp, Return, Yield, Raise, Assign = ast.BoolOp, ast.Return, ast.Yield, ast.Raise, ast.Assign
+    Call, Attribute, Name = ast.Call, ast.Attribute, ast.Name
+    iter_child_nodes = ast.iter_child_nodes
+
+    has_return = False
+    has_yields = False
+    raises: List[str] = []
+    attributes: List[str] = []
+    complexity = 1
+    nesting = 0
+    # Explicit stack of (node, depth) instead of recursion; visit order does
+    # not matter for anything collected here
+    stack = [(fn, 0)]
+    while stack:
+        n, depth = stack.pop()
+        t = type(n)
+        if t in nesting_types:
+            if depth > nesting:
+                nesting = depth
+            if t in branch_types:
+                complexity += 1
+            child_depth = depth + 1
         else:
-            for c in ast.iter_child_nodes(n):
-                _visit(c, depth)
+            child_depth = depth
+            if t is BoolOp:
+                complexity += max(0, len(n.values) - 1)
+            elif t is Return:
+                if n.value is not None:
+                    has_return = True
+            elif t is Yield:
+                has_yields = True
+            elif t is Raise:
+                if n.exc:
+                    if type(n.exc) is Call:
+                        exc_name = _get_annotation_str(n.exc.func)
+                    else:
+                        exc_name = _get_annotation_str(n.exc)
+                    if exc_name:
+                        raises.append(exc_name)
+            elif t is Assign:
+                # Attributes (e.g., self.x = ...)
+                for target in n.targets:
+                    if type(target) is Attribute and type(target.value) is Name:
+                        attributes.append(target.attr)
+        for child in iter_child_nodes(n):
+            stack.append((child, child_depth))
+
+    return {
+        "has_return": has_return,
+        "has_yields": has_yields,
+        "yields": _get_annotation_str(getattr(fn, "returns", None)) if has_yields else None,
+        # Sorted so the output does not depend on visit order; most functions
+        # collect zero or one entry, which need neither dedup nor sorting
+        "raises": sorted(set(raises)) if len(raises) > 1 else raises,
+        "attributes": sorted(set(attributes)) if len(attributes) > 1 else attributes,
+        "complexity": complexity,
+        "nesting": nesting,
+    }
 
-    _visit(node, 0)
-    return max_depth
+
+# Lines with their endings, split only on \r\n, \r and \n like the Python
+# tokenizer (str.splitlines also splits on form feeds and other separators)
+_SOURCE_LINE_PATTERN = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+
+def _source_segment(lines: List[str], node: ast.AST) -> Optional[str]:
+    """Return the source of ``node``, like ``ast.get_source_segment``, from pre-split lines."""
+    lineno = node.lineno - 1
+    end_lineno = node.end_lineno - 1 if node.end_lineno is not None else None
+    end_col_offset = node.end_col_offset
+    if end_lineno is None or end_col_offset is None:
+        return None
+    # Column offsets are UTF-8 byte offsets
+    if end_lineno == lineno:
+        return lines[lineno].encode()[node.col_offset:end_col_offset].decode()
+    first = lines[lineno].encode()[node.col_offset:].decode()
+    last = lines[end_lineno].encode()[:end_col_offset].decode()
+    return first + "".join(lines[lineno + 1:end_lineno]) + last
+
+
+def _collect_nodes(tree: ast.AST) -> Tuple[List[ast.AST], List[ast.AST], List[ast.ClassDef]]:
+    """Sort the nodes of ``tree`` into functions, imports and classes in a single walk."""
+    functions: List[ast.AST] = []
+    imports: List[ast.AST] = []
+    classes: List[ast.ClassDef] = []
+    for n in ast.walk(tree):
+        t = type(n)
+        if t is ast.FunctionDef or t is ast.AsyncFunctionDef:
+            functions.append(n)
+        elif t is ast.Import or t is ast.ImportFrom:
+            imports.append(n)
+        elif t is ast.ClassDef:
+            classes.append(n)
+    return functions, imports, classes
 
 
 def parse_functions(node: ast.AST, source: str = "") -> List[Dict[str, Any]]:
@@ -94,9 +269,16 @@ def parse_functions(node: ast.AST, source: str = "") -> List[Dict[str, Any]]:
         node: The AST node to parse.
         source: The original source code (needed to extract function source).
     """
+    return _function_records(_collect_nodes(node)[0], source)
+
+
+def _function_records(function_nodes: List[ast.AST], source: str) -> List[Dict[str, Any]]:
+    """Build the function entries of a parse result from already collected nodes."""
     results: List[Dict[str, Any]] = []
+    # Split once per file; ast.get_source_segment re-splits for every function
+    source_lines = _SOURCE_LINE_PATTERN.findall(source) if source else []
 
-    for fn in [n for n in ast.walk(node) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]:
+    for fn in function_nodes:
         args_meta: List[Dict[str, Optional[str]]] = []
         for a in fn.args.args:
             args_meta.append(
@@ -113,45 +295,13 @@ def parse_functions(node: ast.AST, source: str = "") -> List[Dict[str, Any]]:
 
         doc = ast.get_docstring(fn)
 
-        # Returns
-        has_return = any(
-            isinstance(n, ast.Return) and n.value is not None
-            for n in ast.walk(fn)
-        )
-
-        # Yields
-        has_yields = False
-        yields_type: Optional[str] = None
-        for n in ast.walk(fn):
-            if isinstance(n, ast.Yield):
-                has_yields = True
-                yields_type = _get_annotation_str(getattr(fn, "returns", None))
-                break
-
-        # Raises
-        raises: List[str] = []
-        for n in ast.walk(fn):
-            if isinstance(n, ast.Raise) and n.exc:
-                if isinstance(n.exc, ast.Call):
-                    exc_name = _get_annotation_str(n.exc.func)
-                else:
-                    exc_name = _get_annotation_str(n.exc)
-                if exc_name:
-                    raises.append(exc_name)
-
-        # Attributes (e.g., self.x = ...)
-        attributes: List[str] = []
-        for n in ast.walk(fn):
-            if isinstance(n, ast.Assign):
-                for target in n.targets:
-                    if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name):
-                        attributes.append(target.attr)
+        summary = _summarize_function(fn)
 
         # Extract function source code (without docstring for cleaner prompt)
         source_code = ""
         if source:
             try:
-                source_code = ast.get_source_segment(source, fn) or ""
+                source_code = _source_segment(source_lines, fn) or ""
             except Exception:
                 # Fallback: extract from line numbers
                 try:
@@ -171,15 +321,15 @@ def parse_functions(node: ast.AST, source: str = "") -> List[Dict[str, Any]]:
                 "args_meta": args_meta,
                 "defaults": defaults,
                 "returns": _get_annotation_str(getattr(fn, "returns", None)),
-                "has_return": has_return,
-                "has_yields": has_yields,
-                "yields": yields_type,
-                "raises": sorted(set(raises)),
-                "attributes": sorted(set(attributes)),
+                "has_return": summary["has_return"],
+                "has_yields": summary["has_yields"],
+                "yields": summary["yields"],
+                "raises": summary["raises"],
+                "attributes": summary["attributes"],
                 "has_docstring": bool(doc),
                 "docstring": doc,
-                "complexity": _simple_complexity(fn),
-                "nesting": _max_nesting_depth(fn),
+                "complexity": summary["complexity"],
+                "nesting": summary["nesting"],
                 "source_code": source_code,
             }
         )
@@ -188,39 +338,50 @@ def parse_functions(node: ast.AST, source: str = "") -> List[Dict[str, Any]]:
 
 
 def parse_classes(node: ast.AST) -> List[Dict[str, Any]]:
+    return _class_records(_collect_nodes(node)[2])
+
+
+def _class_records(class_nodes: List[ast.ClassDef]) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
-    for cls in [n for n in ast.walk(node) if isinstance(n, ast.ClassDef)]:
+    for cls in class_nodes:
         methods: List[Dict[str, Any]] = []
         for body_item in cls.body:
             if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                summary = _summarize_function(body_item)
+                method_doc = ast.get_docstring(body_item)
                 methods.append(
                     {
                         "name": body_item.name,
                         "start_line": getattr(body_item, "lineno", None),
                         "end_line": getattr(body_item, "end_lineno", getattr(body_item, "lineno", None)),
-                        "has_docstring": bool(ast.get_docstring(body_item)),
-                        "docstring": ast.get_docstring(body_item),
+                        "has_docstring": bool(method_doc),
+                        "docstring": method_doc,
                         "args": [arg.arg for arg in body_item.args.args],
-                        "complexity": _simple_complexity(body_item),
-                        "nesting": _max_nesting_depth(body_item),
+                        "complexity": summary["complexity"],
+                        "nesting": summary["nesting"],
                     }
                 )
+        cls_doc = ast.get_docstring(cls)
         results.append(
             {
                 "name": cls.name,
                 "start_line": getattr(cls, "lineno", None),
                 "end_line": getattr(cls, "end_lineno", getattr(cls, "lineno", None)),
                 "methods": sorted(methods, key=lambda m: (m["start_line"] or 0)),
-                "has_docstring": bool(ast.get_docstring(cls)),
-                "docstring": ast.get_docstring(cls),
+                "has_docstring": bool(cls_doc),
+                "docstring": cls_doc,
             }
         )
     return sorted(results, key=lambda x: (x["start_line"] or 0))
 
 
 def parse_imports(node: ast.AST) -> List[str]:
+    return _import_names(_collect_nodes(node)[1])
+
+
+def _import_names(import_nodes: List[ast.AST]) -> List[str]:
     found: List[str] = []
-    for n in ast.walk(node):
+    for n in import_nodes:
         if isinstance(n, ast.Import):
             for alias in n.names:
                 found.append(alias.name)
@@ -231,30 +392,35 @@ def parse_imports(node: ast.AST) -> List[str]:
     return sorted(set(found))
 
 
-def parse_file(path: str, use_cache: bool = True) -> Dict[str, Any]:
-    """Parse a Python file and extract its structure.
-    
-    Args:
-        path: Path to the Python file.
-        use_cache: If True, skip parsing if file hasn't changed since last parse.
-    """
-    global _parse_cache
-    
-    # Check if file exists
-    abs_path = os.path.abspath(path)
-    
-    # Get file modification time
+def _stat_key(abs_path: str) -> Tuple[int, int]:
+    """Return the ``(mtime_ns, size)`` pair a cached parse is validated against."""
+    # Get file modification time and size with a single stat
     try:
-        mtime = os.path.getmtime(abs_path)
+        st = os.stat(abs_path)
+        return st.st_mtime_ns, st.st_size
     except OSError:
-        mtime = 0
-    
-    # Check cache - return cached result if file hasn't changed
-    if use_cache and abs_path in _parse_cache:
-        cached = _parse_cache[abs_path]
-        if cached.get("mtime") == mtime:
-            return cached["result"]
-    
+        return 0, 0
+
+
+def _cached_result(abs_path: str, key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    """Return the cached parse of ``abs_path`` if the file hasn't changed."""
+    _load_shard(os.path.dirname(abs_path))
+    cached = _parse_cache.get(abs_path)
+    if cached is not None and cached.get("mtime_ns") == key[0] and cached.get("size") == key[1]:
+        return cached["result"]
+    return None
+
+
+def _store_result(abs_path: str, key: Tuple[int, int], result: Dict[str, Any]) -> None:
+    """Cache a successful parse; files with errors are parsed again next time."""
+    if result["parsing_errors"]:
+        return
+    _parse_cache[abs_path] = {"mtime_ns": key[0], "size": key[1], "result": result}
+    _dirty_shards.add(os.path.dirname(abs_path))
+
+
+def _parse_source_file(path: str) -> Dict[str, Any]:
+    """Read and parse one file without touching the cache (safe in worker processes)."""
     parsing_errors: List[str] = []
 
     try:
@@ -291,34 +457,90 @@ def parse_file(path: str, use_cache: bool = True) -> Dict[str, Any]:
             "parsing_errors": parsing_errors,
         }
 
+    # One walk feeds all three extractors
+    function_nodes, import_nodes, class_nodes = _collect_nodes(tree)
     result = {
         "path": path,
-        "imports": parse_imports(tree),
-        "functions": parse_functions(tree, src),
-        "classes": parse_classes(tree),
+        "imports": _import_names(import_nodes),
+        "functions": _function_records(function_nodes, src),
+        "classes": _class_records(class_nodes),
         "has_module_docstring": bool(ast.get_docstring(tree)),
         "parsing_errors": parsing_errors,
     }
+    return result
+
+
+def parse_file(path: str, use_cache: bool = True) -> Dict[str, Any]:
+    """Parse a Python file and extract its structure.
     
-    # Store in cache
-    _parse_cache[abs_path] = {"mtime": mtime, "result": result}
+    Args:
+        path: Path to the Python file.
+        use_cache: If True, skip parsing if file hasn't changed since last parse.
+    """
+    abs_path = os.path.abspath(path)
+    key = _stat_key(abs_path)
+    
+    # Check cache - return cached result if file hasn't changed
+    if use_cache:
+        cached = _cached_result(abs_path, key)
+        if cached is not None:
+            return cached
     
+    result = _parse_source_file(path)
+    _store_result(abs_path, key, result)
     return result
 
 
+def _parse_files(paths: List[str]) -> List[Dict[str, Any]]:
+    """Parse uncached files, across processes when there are enough of them."""
+    workers = os.cpu_count() or 1
+    if len(paths) >= _PARALLEL_MIN_FILES and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, _PARALLEL_MAX_WORKERS)) as executor:
+                return list(executor.map(_parse_source_file, paths, chunksize=8))
+        except Exception:
+            # No usable worker processes (sandbox, broken pool, ...): parse here
+            pass
+    return [_parse_source_file(p) for p in paths]
+
+
 def parse_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     skip_dirs = skip_dirs or []
-    results: List[Dict[str, Any]] = []
 
+    # Absolute paths (the cache keys) are resolved once per directory rather
+    # than once per file; joining a bare file name needs no normalisation
     if os.path.isfile(path) and path.endswith(".py"):
-        results.append(parse_file(path))
-        return results
-
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for f in files:
-            if f.endswith(".py"):
-                results.append(parse_file(os.path.join(root, f)))
-        if not recursive:
-            break
+        paths = [path]
+        abs_paths = [os.path.abspath(path)]
+    else:
+        paths = []
+        abs_paths = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            abs_root = None
+            for f in files:
+                if f.endswith(".py"):
+                    if abs_root is None:
+                        abs_root = os.path.abspath(root)
+                    paths.append(os.path.join(root, f))
+                    abs_paths.append(os.path.join(abs_root, f))
+            if not recursive:
+                break
+
+    # Cache hits are answered here; only changed files are handed to workers
+    results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+    misses: List[Tuple[int, str, Tuple[int, int]]] = []
+    for i, abs_path in enumerate(abs_paths):
+        key = _stat_key(abs_path)
+        results[i] = _cached_result(abs_path, key)
+        if results[i] is None:
+            misses.append((i, abs_path, key))
+
+    parsed = _parse_files([paths[i] for i, _, _ in misses])
+    for (i, abs_path, key), result in zip(misses, parsed):
+        _store_result(abs_path, key, result)
+        results[i] = result
+
+    # Persist now too: a long-running app (e.g. Streamlit) may never exit cleanly
+    _save_cache()
     return results
@@ -1,6 +1,44 @@
+import ast
+import os
 import re
+import shutil
 import subprocess
-from typing import Any, Dict, List, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from radon.complexity import cc_rank, cc_visit_ast
+except Exception:  # pragma: no cover - radon is optional
+    cc_rank = cc_visit_ast = None
+
+# Pre-compiled patterns for pydocstyle output (compiled once at module load)
+_MODULE_CONTEXT_PATTERN = re.compile(r"\.py:\d+.*at module level")
+_FUNCTION_CONTEXT_PATTERN = re.compile(
+    r"in (?:public|private|nested) function [\"'`]?(?P<name>[^\"'`]+)[\"'`]?"
+)
+_DCODE_LINE_PATTERN = re.compile(r"(D\d{3})\b[:]?\s*(.*)")
+_CLASS_CONTEXT_PATTERN = re.compile(
+    r"in (?:public|private|nested) class [\"'`]?(?P<name>[^\"'`]+)[\"'`]?"
+)
+_METHOD_CONTEXT_PATTERN = re.compile(
+    r"in (?:public|private|nested) method [\"'`]?(?P<name>[^\"'`]+)[\"'`]?"
+)
+_DEF_NAME_PATTERN = re.compile(r"def\s+[\"'`]?(?P<name>[A-Za-z_][A-Za-z0-9_]*)")
+_DCODE_PATTERN = re.compile(r"D\d{3}")
+# Context line of a batched run, e.g. "pkg/mod.py:12 in public function `f`:"
+_FILE_CONTEXT_PATTERN = re.compile(r"^(?P<path>.+\.py):\d+ (?:at module level|in )")
+
+# Parsed pydocstyle mappings and radon entries per absolute path, validated
+# against the file's (mtime_ns, size) and kept in LRU order
+_PYDOCSTYLE_CACHE_SIZE = 512
+_pydocstyle_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, List[str]]]]" = OrderedDict()
+_RADON_CACHE_SIZE = 1024
+_radon_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]" = OrderedDict()
+# Files per pydocstyle process, keeping the command line well within OS limits
+_PYDOCSTYLE_BATCH_SIZE = 200
+# Concurrent pydocstyle processes; each run is CPU-bound in its own process
+_PYDOCSTYLE_MAX_WORKERS = 8
 
 
 def _parse_pydocstyle_output(output: str) -> Dict[str, List[str]]:
@@ -14,31 +52,36 @@ def _parse_pydocstyle_output(output: str) -> Dict[str, List[str]]:
         Dictionary mapping entity names to their error messages.
         Entity names can be function names, '<class>', or '<module>'.
     """
-    errors: Dict[str, List[str]] = {}
+    errors: Dict[str, List[str]] = defaultdict(list)
     current_fn: str = ""
 
-    for raw in output.splitlines():
-        line = raw.strip()
-        if not line:
+    # Each pattern below is tried in priority order, so they cannot be fused
+    # into one leftmost-match alternation. Instead every search is guarded by
+    # a literal substring the pattern requires, which rules most lines out
+    # without running the regex at all.
+    # Stripping and dropping blank lines happens in C via map/filter; a fused
+    # finditer over the whole output would lose the priority order above
+    for line in filter(None, map(str.strip, output.splitlines())):
+        # A line with no D-code, "def", "in " (every context pattern) or module
+        # marker cannot match any branch below, so skip it outright
+        has_code = "D" in line
+        if not has_code and "in " not in line and "def" not in line and "at module level" not in line:
             continue
 
         # Context line: "file.py:N at module level:" - sets context but doesn't add as error
-        m_ctx = re.search(r"\.py:\d+.*at module level", line)
+        m_ctx = _MODULE_CONTEXT_PATTERN.search(line) if "at module level" in line else None
         if m_ctx:
             current_fn = ""  # Reset to module level context
             continue
 
         # Context: function
-        m = re.search(
-            r"in (?:public|private|nested) function [\"'`]?(?P<name>[^\"'`]+)[\"'`]?",
-            line,
-        )
+        m = _FUNCTION_CONTEXT_PATTERN.search(line) if "function " in line else None
         if m:
             current_fn = m.group("name")
             continue
 
         # Generic D-code line - use current_fn context if available
-        m3 = re.search(r"(D\d{3})\b[:]?\s*(.*)", line)
+        m3 = _DCODE_LINE_PATTERN.search(line) if has_code else None
         if m3:
             code = m3.group(1)
             desc = (m3.group(2) or "").lower()
@@ -48,118 +91,228 @@ def _parse_pydocstyle_output(output: str) -> Dict[str, List[str]]:
                 continue
 
             if "class" in desc:
-                errors.setdefault("<class>", []).append(line)
+                errors["<class>"].append(line)
                 continue
 
             if "module" in desc and not current_fn:
-                errors.setdefault("<module>", []).append(line)
+                errors["<module>"].append(line)
                 continue
 
             if current_fn:
-                errors.setdefault(current_fn, []).append(line)
+                errors[current_fn].append(line)
             else:
-                errors.setdefault("<module>", []).append(line)
+                errors["<module>"].append(line)
             continue
 
         # Context: class
-        m_class = re.search(
-            r"in (?:public|private|nested) class [\"'`]?(?P<name>[^\"'`]+)[\"'`]?",
-            line,
-        )
+        m_class = _CLASS_CONTEXT_PATTERN.search(line) if "class " in line else None
         if m_class:
             current_fn = m_class.group("name")
             continue
 
         # Context: method
-        m_method = re.search(
-            r"in (?:public|private|nested) method [\"'`]?(?P<name>[^\"'`]+)[\"'`]?",
-            line,
-        )
+        m_method = _METHOD_CONTEXT_PATTERN.search(line) if "method " in line else None
         if m_method:
             current_fn = m_method.group("name")
             continue
 
         # Fallback: def mentioned
-        m4 = re.search(r"def\s+[\"'`]?(?P<name>[A-Za-z_][A-Za-z0-9_]*)", line)
+        m4 = _DEF_NAME_PATTERN.search(line) if "def" in line else None
         if m4:
             fn = m4.group("name")
-            errors.setdefault(fn, []).append(line)
+            errors[fn].append(line)
             current_fn = fn
             continue
 
         # Last-resort fallback - ONLY add if line contains a D-code
-        if re.search(r"D\d{3}", line):
+        if has_code and _DCODE_PATTERN.search(line):
             if current_fn:
-                errors.setdefault(current_fn, []).append(line)
+                errors[current_fn].append(line)
             else:
-                errors.setdefault("<module>", []).append(line)
+                errors["<module>"].append(line)
 
-    return errors
+    return dict(errors)
 
 
 def run_pydocstyle(file_path: str) -> Tuple[Dict[str, List[str]], bool]:
     """
     Run pydocstyle on a file using the CLI.
 
+    Results are cached per file and reused until its modification time or
+    size changes, so re-validating an unchanged file spawns no subprocess.
+
     Args:
         file_path: Path to the Python file to analyze
 
     Returns:
         Tuple of (error mapping, availability flag)
     """
+    mappings, available = run_pydocstyle_many([file_path])
+    return mappings.get(file_path, {}), available
+
+
+def run_pydocstyle_many(file_paths: List[str]) -> Tuple[Dict[str, Dict[str, List[str]]], bool]:
+    """
+    Run pydocstyle on several files with as few CLI invocations as possible.
+
+    Files already validated and unchanged come from the cache; the rest are
+    passed to a single pydocstyle process per batch.
+
+    Args:
+        file_paths: Paths of the Python files to analyze
+
+    Returns:
+        Tuple of (error mapping per given path, availability flag)
+    """
+    results: Dict[str, Dict[str, List[str]]] = {}
+    pending: Dict[str, Optional[Tuple[str, Tuple[int, int]]]] = {}
+    for path in file_paths:
+        if path in results or path in pending:
+            continue
+        key = _file_cache_key(path)
+        cached = _cache_lookup(_pydocstyle_cache, key)
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending[path] = key
+
+    # Spread the files over one process per core, within the per-process cap;
+    # the threads only wait on their subprocess
+    batch_paths = list(pending)
+    workers = min(_PYDOCSTYLE_MAX_WORKERS, os.cpu_count() or 1)
+    size = min(_PYDOCSTYLE_BATCH_SIZE, max(1, -(-len(batch_paths) // workers)))
+    batches = [batch_paths[i:i + size] for i in range(0, len(batch_paths), size)]
+    if len(batches) > 1 and workers > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            batch_outputs = list(executor.map(_run_pydocstyle_batch, batches))
+    else:
+        batch_outputs = [_run_pydocstyle_batch(batch) for batch in batches]
+
+    for batch, outputs in zip(batches, batch_outputs):
+        if outputs is None:
+            return (results, False)
+        for path in batch:
+            mapping = _parse_pydocstyle_output(outputs.get(path, ""))
+            results[path] = mapping
+            _cache_store(_pydocstyle_cache, pending[path], mapping, _PYDOCSTYLE_CACHE_SIZE)
+
+    return (results, True)
+
+
+def _run_pydocstyle_batch(batch: List[str]) -> Optional[Dict[str, str]]:
+    """Run one pydocstyle process over ``batch``; None if pydocstyle is not installed."""
     try:
         proc = subprocess.run(
-            ["pydocstyle", file_path],
+            ["pydocstyle", *batch],
             capture_output=True,
             text=True,
             check=False,
         )
     except FileNotFoundError:
-        return ({}, False)
+        return None
+
+    if len(batch) == 1:
+        return {batch[0]: (proc.stdout or "") + "\n" + (proc.stderr or "")}
+    return _split_pydocstyle_output(proc.stdout or "")
+
 
-    out = (proc.stdout or "") + "\n" + (proc.stderr or "")
-    return _parse_pydocstyle_output(out), True
+def _file_cache_key(file_path: str) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """Return ``(abs_path, (mtime_ns, size))`` for ``file_path``, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return os.path.abspath(file_path), (st.st_mtime_ns, st.st_size)
+
+
+def _cache_lookup(cache: OrderedDict, key: Optional[Tuple[str, Tuple[int, int]]]) -> Any:
+    """Return the value cached under ``key`` if the file is unchanged, else None."""
+    if key is None:
+        return None
+    cached = cache.get(key[0])
+    if cached is None or cached[0] != key[1]:
+        return None
+    cache.move_to_end(key[0])
+    return cached[1]
+
+
+def _cache_store(
+    cache: OrderedDict, key: Optional[Tuple[str, Tuple[int, int]]], value: Any, max_size: int
+) -> None:
+    """Cache ``value`` under ``key``, evicting the least recently used entry."""
+    if key is None:
+        return
+    cache[key[0]] = (key[1], value)
+    cache.move_to_end(key[0])
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+def _split_pydocstyle_output(output: str) -> Dict[str, str]:
+    """Split the stdout of a multi-file pydocstyle run into per-file output."""
+    chunks: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in output.splitlines():
+        m = _FILE_CONTEXT_PATTERN.match(line)
+        if m:
+            current = chunks.setdefault(m.group("path"), [])
+        if current is not None:
+            current.append(line)
+    return {path: "\n".join(lines) for path, lines in chunks.items()}
 
 
 def run_radon_cc(file_path: str) -> Tuple[List[Dict[str, Any]], bool]:
     """
     Compute cyclomatic complexity using radon.
 
+    Results are cached per file and reused until its modification time or
+    size changes.
+
     Args:
         file_path: Path to the Python file to analyze
 
     Returns:
         Tuple of (complexity results, availability flag)
     """
-    try:
-        from radon.complexity import cc_visit, cc_rank
-    except Exception:
+    if cc_visit_ast is None:
         return ([], False)
 
+    key = _file_cache_key(file_path)
+    cached = _cache_lookup(_radon_cache, key)
+    if cached is not None:
+        return (cached, True)
+
+    results = _run_radon_cc_uncached(file_path)
+    _cache_store(_radon_cache, key, results, _RADON_CACHE_SIZE)
+    return (results, True)
+
+
+def _run_radon_cc_uncached(file_path: str) -> List[Dict[str, Any]]:
+    # Raw bytes go straight to ast.parse, which decodes them itself (honouring
+    # a BOM or coding cookie), so no separate decoded str copy is built
     try:
-        with open(file_path, "r", encoding="utf-8") as fh:
+        with open(file_path, "rb") as fh:
             src = fh.read()
     except Exception:
-        return ([], True)
+        return []
 
     try:
-        blocks = cc_visit(src)
+        blocks = cc_visit_ast(ast.parse(src, filename=file_path))
     except Exception:
-        return ([], True)
-
-    results: List[Dict[str, Any]] = []
-    for b in blocks:
-        entry: Dict[str, Any] = {
-            "name": getattr(b, "name", "<unknown>"),
-            "lineno": getattr(b, "lineno", None),
-            "complexity": getattr(b, "complexity", None),
-            "rank": cc_rank(getattr(b, "complexity", 0)),
+        return []
+
+    # Radon's Function and Class blocks are namedtuples that always carry
+    # these fields, so they are read directly
+    return [
+        {
+            "name": b.name,
+            "lineno": b.lineno,
+            "complexity": b.complexity,
+            "rank": cc_rank(b.complexity),
+            "endline": b.endline,
         }
-        if hasattr(b, "endline"):
-            entry["endline"] = getattr(b, "endline")
-        results.append(entry)
-
-    return (results, True)
+        for b in blocks
+    ]
 
 
 def run_validators(file_path: str) -> Dict[str, Any]:
@@ -181,6 +334,93 @@ def run_validators(file_path: str) -> Dict[str, Any]:
     }
 
 
+def _has_syntax_error(file_result: Dict[str, Any]) -> bool:
+    """Return True if the parser rejected the file with a SyntaxError."""
+    return any(
+        str(err).startswith("SyntaxError") for err in file_result.get("parsing_errors") or []
+    )
+
+
+def iter_pydocstyle_summaries(per_file_results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the PEP 257 summary of each parsed file as its batch is validated.
+
+    Files are validated in batches of ``_PYDOCSTYLE_BATCH_SIZE``, so results
+    for the first files are available before the rest have been checked.
+
+    Args:
+        per_file_results: List of file analysis results
+
+    Yields:
+        One dictionary per file with its counts, violations and availability
+    """
+    for start in range(0, len(per_file_results), _PYDOCSTYLE_BATCH_SIZE):
+        chunk = per_file_results[start:start + _PYDOCSTYLE_BATCH_SIZE]
+
+        # pydocstyle compiles each file before checking it and reports nothing
+        # for one with a syntax error, so files the parser already failed on
+        # that way are not handed to it at all
+        skipped = [_has_syntax_error(fr) for fr in chunk]
+        to_check = [fr.get("path") for fr, skip in zip(chunk, skipped) if not skip]
+
+        # One pydocstyle run (per batch) for every file instead of one per file
+        mappings, available = run_pydocstyle_many(to_check)
+        if not to_check:
+            available = shutil.which("pydocstyle") is not None
+
+        for fr, skip in zip(chunk, skipped):
+            yield _summarize_file(fr, mappings.get(fr.get("path"), {}), available, skip)
+
+
+def _summarize_file(
+    fr: Dict[str, Any], mapping: Dict[str, List[str]], available: bool, skipped: bool
+) -> Dict[str, Any]:
+    """Build the summary of one file from its pydocstyle mapping."""
+    path = fr.get("path")
+    funcs = fr.get("functions", []) or []
+    violations_list: List[Dict[str, Any]] = []
+    file_comp = 0
+
+    # Function-level validation
+    for fn in funcs:
+        name = fn.get("name")
+        errors = mapping.get(name)
+        if errors:
+            violations_list.append(
+                {"file": path, "function": name, "errors": errors}
+            )
+        else:
+            file_comp += 1
+
+    # Class-level validation (D101 already filtered at parse stage)
+    class_errors = mapping.get("<class>")
+    if class_errors:
+        violations_list.append(
+            {"file": path, "function": "<class>", "errors": class_errors}
+        )
+
+    # Module-level validation
+    # FIXED: Don't manually add D100 error - pydocstyle already detects it
+    module_errors = mapping.get("<module>")
+    
+    # Only report if there are actual errors from pydocstyle
+    if module_errors:
+        violations_list.append(
+            {"file": path, "function": "<module>", "errors": module_errors}
+        )
+
+    return {
+        "file": path,
+        "functions": len(funcs),
+        "compliant": file_comp,
+        "violations": len(violations_list),
+        "module_docstring": bool(fr.get("has_module_docstring")),
+        "violations_list": violations_list,
+        "available": available,
+        "skipped": skipped,
+    }
+
+
 def summarize_pydocstyle_on_files(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Summarize PEP 257 results across parsed files.
@@ -189,65 +429,28 @@ def summarize_pydocstyle_on_files(per_file_results: List[Dict[str, Any]]) -> Dic
         per_file_results: List of file analysis results
 
     Returns:
-        Dictionary with summary statistics and violation details
+        Dictionary with summary statistics and violation details; ``skipped_files``
+        counts files with syntax errors that pydocstyle was not run on
     """
     total_functions = 0
     compliant_functions = 0
     violations_list: List[Dict[str, Any]] = []
     per_file_counts: List[Dict[str, Any]] = []
     any_available = False
-
-    for fr in per_file_results:
-        path = fr.get("path")
-        funcs = fr.get("functions", []) or []
-        has_module = bool(fr.get("has_module_docstring"))
-
-        mapping, available = run_pydocstyle(path)
-        if available:
-            any_available = True
-
-        file_comp = 0
-        file_viol = 0
-
-        # Function-level validation
-        for fn in funcs:
-            total_functions += 1
-            name = fn.get("name")
-            errors = mapping.get(name, [])
-            if errors:
-                file_viol += 1
-                violations_list.append(
-                    {"file": path, "function": name, "errors": errors}
-                )
-            else:
-                file_comp += 1
-                compliant_functions += 1
-
-        # Class-level validation (D101 already filtered at parse stage)
-        class_errors = mapping.get("<class>", [])
-        if class_errors:
-            file_viol += 1
-            violations_list.append(
-                {"file": path, "function": "<class>", "errors": class_errors}
-            )
-
-        # Module-level validation
-        # FIXED: Don't manually add D100 error - pydocstyle already detects it
-        module_errors = mapping.get("<module>", [])
-        
-        # Only report if there are actual errors from pydocstyle
-        if module_errors:
-            file_viol += 1
-            violations_list.append(
-                {"file": path, "function": "<module>", "errors": module_errors}
-            )
-
+    skipped_files = 0
+
+    for file_summary in iter_pydocstyle_summaries(per_file_results):
+        total_functions += file_summary["functions"]
+        compliant_functions += file_summary["compliant"]
+        violations_list.extend(file_summary["violations_list"])
+        any_available = any_available or file_summary["available"]
+        skipped_files += file_summary["skipped"]
         per_file_counts.append(
             {
-                "file": path,
-                "compliant": file_comp,
-                "violations": file_viol,
-                "module_docstring": has_module,
+                "file": file_summary["file"],
+                "compliant": file_summary["compliant"],
+                "violations": file_summary["violations"],
+                "module_docstring": file_summary["module_docstring"],
             }
         )
 
@@ -258,4 +461,5 @@ def summarize_pydocstyle_on_files(per_file_results: List[Dict[str, Any]]) -> Dic
         "violations": len(violations_list),
         "violations_list": violations_list,
         "per_file_counts": per_file_counts,
-    }
\ No newline at end of file
+        "skipped_files": skipped_files,
+    }
@@ -1,84 +1,442 @@
 import ast
 import difflib
+import hashlib
 import json
 import os
+import re
+import threading
+from collections import deque
 
 import streamlit as st
-import altair as alt
 
-from core.docstring_engine.generator import generate_docstring, generate_module_docstring, insert_module_docstring
+from core.docstring_engine.generator import generate_docstring, generate_docstrings, generate_module_docstrings, insert_module_docstring
 from core.parser.python_parser import parse_path
 from core.reporter.coverage_reporter import compute_coverage, write_report
-from core.validator.validator import run_validators, summarize_pydocstyle_on_files
-from core.dashboard.dashboard import render_export_tab, render_search_tab, render_advanced_filters_tab, render_help_tips_tab, render_tests_tab
+from core.validator.validator import run_pydocstyle_many, run_radon_cc, summarize_pydocstyle_on_files
+from core.dashboard.dashboard import render_export_tab, render_search_tab, render_advanced_filters_tab, render_help_tips_tab, render_tests_tab, mark_scan_results_changed
+
+
+# Line ends as the Python tokenizer sees them, so AST line numbers index the
+# resulting lines directly (str.splitlines also splits on form feeds etc.)
+_LINE_END_PATTERN = re.compile(r"\r\n|\r|\n")
+
+
+def _find_function(tree: ast.AST, func_name: str):
+    """Return the first function named ``func_name`` in ``ast.walk`` order, or None.
+
+    Only statements (and the except/case clauses holding them) are visited:
+    expressions cannot contain a def, and skipping them keeps the same
+    breadth-first order as ``ast.walk`` at a fraction of the nodes.
+    """
+    containers = (ast.stmt, ast.excepthandler, ast.match_case)
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == func_name:
+            return node
+        queue.extend(child for child in ast.iter_child_nodes(node) if isinstance(child, containers))
+    return None
 
 
 def insert_or_replace_docstring(file_path: str, func_name: str, doc_body: str) -> bool:
     """
     Insert or replace a function docstring in-place with correct indentation.
+    The rest of the file, line endings included, is written back unchanged.
     Returns True on success.
     """
+    return insert_or_replace_docstrings(file_path, [(func_name, doc_body)])[0]
+
+
+def insert_or_replace_docstrings(file_path: str, edits: list) -> list:
+    """
+    Apply several ``(func_name, doc_body)`` docstring edits to one file at once.
+    The file is read, parsed and written a single time, with the same result
+    as calling ``insert_or_replace_docstring`` for each edit in order.
+    Returns one success flag per edit.
+    """
+    results = [False] * len(edits)
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            src = f.read()
-    except OSError:
-        return False
+        with open(file_path, "rb") as f:
+            src = f.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return results
 
     try:
         tree = ast.parse(src)
     except SyntaxError:
-        return False
+        return results
+
+    # Start offset of every line; the file is edited by splicing at these
+    # offsets rather than by splitting it into lines and joining them back
+    line_starts = [0] + [m.end() for m in _LINE_END_PATTERN.finditer(src)]
+    if line_starts[-1] == len(src):
+        line_starts.pop()  # No line after a trailing newline
+    line_count = len(line_starts)
+
+    def line_offset(i: int) -> int:
+        return line_starts[i] if i < line_count else len(src)
+
+    def line_text(i: int) -> str:
+        return src[line_starts[i]:line_offset(i + 1)].rstrip("\r\n")
+
+    splices = []  # (start offset, end offset, edit index, new text)
+    edited_nodes = set()
+    repeated = False  # A later edit of the same function sees the earlier one
+    for index, (func_name, doc_body) in enumerate(edits):
+        node = _find_function(tree, func_name)
+        if node is None:
+            continue
+        repeated = repeated or node in edited_nodes
+        edited_nodes.add(node)
+
+        def_line = node.lineno - 1
+
+        def_text = line_text(def_line)
+        # col_offset counts UTF-8 bytes, but everything before the def is ASCII
+        # whitespace, so it is exactly the length of the indentation
+        indent = def_text[:node.col_offset]
+        body_indent = indent + " " * 4
+        # New lines use the same line ending as the def line
+        newline = src[line_starts[def_line] + len(def_text):line_offset(def_line + 1)] or "\n"
+
+        # D301: Use raw string if docstring contains backslashes
+        quote_prefix = 'r' if '\\' in doc_body else ''
+        
+        new_doc = [body_indent + quote_prefix + '"""']
+        for line in doc_body.splitlines():
+            new_doc.append(body_indent + line if line.strip() else body_indent)
+        new_doc.append(body_indent + '"""')
+        new_doc_text = "".join(line + newline for line in new_doc)
+
+        # Replace existing docstring
+        if (
+            node.body
+            and isinstance(node.body[0], ast.Expr)
+            and isinstance(node.body[0].value, ast.Constant)
+            and isinstance(node.body[0].value.value, str)
+        ):
+            start = node.body[0].lineno - 1
+            end = node.body[0].end_lineno
+            
+            # D201: Remove blank lines before the docstring (between def line and docstring)
+            # Check lines between def_line and start (docstring) for blank lines
+            while start - 1 > def_line and not line_text(start - 1).strip():
+                start -= 1
+            
+            # D202: Remove blank lines after the docstring
+            while end < line_count and not line_text(end).strip():
+                end += 1
+            
+            splices.append((line_offset(start), line_offset(end), index, new_doc_text))
+        else:
+            insert_at = line_offset(node.body[0].lineno - 1 if node.body else def_line + 1)
+            splices.append((insert_at, insert_at, index, new_doc_text))
+
+    if not splices:
+        return results
+
+    # Inserts at the same offset stay in edit order, as if applied one by one
+    splices.sort(key=lambda splice: (splice[0], splice[2]))
+    if repeated or any(nxt[0] < prev[1] for prev, nxt in zip(splices, splices[1:])):
+        # Edits of the same function or of overlapping lines depend on each
+        # other's result, so apply them one at a time instead
+        return [insert_or_replace_docstring(file_path, *edit) for edit in edits]
+
+    pieces = []
+    pos = 0
+    for start, end, _, text in splices:
+        pieces.append(src[pos:start])
+        pieces.append(text)
+        pos = end
+    pieces.append(src[pos:])
+    new_src = "".join(pieces)
+
+    if len(splices) > 1:
+        try:
+            ast.parse(new_src)
+        except SyntaxError:
+            # An edit broke the syntax (e.g. a body containing triple quotes);
+            # one at a time, the edits after it fail just as they would alone
+            return [insert_or_replace_docstring(file_path, *edit) for edit in edits]
+
+    try:
+        with open(file_path, "wb") as f:
+            f.write(new_src.encode("utf-8"))
+    except OSError:
+        return results
 
-    lines = src.splitlines()
+    for _, _, index, _ in splices:
+        results[index] = True
+    return results
+
+
+@st.cache_resource(show_spinner=False)
+def _scan_lock() -> threading.Lock:
+    """Return the process-wide lock that serializes scans across sessions."""
+    return threading.Lock()
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _cached_docstring(fn_name, args_key, returns, raises_key, source_key, style, salt, _func_meta):
+    """Generate a docstring preview, shared across sessions and reruns.
+
+    The cache key is the function signature, a digest of its source and the
+    style, so functions that only share a signature (``__init__(self)`` in
+    two files) get their own preview; ``salt`` is bumped by Reject to force
+    a fresh suggestion and also picks the prompt variation, so each Reject
+    asks for something different. ``_func_meta`` itself is passed through
+    unhashed.
+    """
+    return generate_docstring(_func_meta, style=style, skip_cache=True, regen_count=salt)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _list_py_files(directory: str, dir_mtime_ns: int) -> list:
+    """Return the sorted ``.py`` file names in ``directory``.
+
+    ``dir_mtime_ns`` is only part of the cache key: adding, removing or
+    renaming a file changes the directory's mtime and so lists it again.
+    """
+    # scandir's entries carry the dirent type, so is_file() needs no stat
+    with os.scandir(directory) as entries:
+        names = [e.name for e in entries if e.name.endswith(".py") and e.is_file()]
+    names.sort()
+    return names
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == func_name:
-            def_line = node.lineno - 1
 
-            indent = lines[def_line][: len(lines[def_line]) - len(lines[def_line].lstrip())]
-            body_indent = indent + " " * 4
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_coverage(scan_version: str, generate_baseline: bool, _per_file: list) -> dict:
+    """Return ``compute_coverage`` for one version of the scan results.
 
-            # D301: Use raw string if docstring contains backslashes
-            quote_prefix = 'r' if '\\' in doc_body else ''
+    ``scan_version`` changes whenever the results do, so it stands in for
+    ``_per_file`` in the cache key and toggling styles reuses the report.
+    """
+    return compute_coverage(_per_file, generate_baseline)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _docstring_diff(before: str, after: str) -> str:
+    """Return the unified diff of two docstrings, or "" if they are identical."""
+    if before == after:
+        return ""
+    return "\n".join(
+        difflib.unified_diff(
+            before.splitlines(keepends=True),
+            after.splitlines(keepends=True),
+            fromfile="Before",
+            tofile="After",
+            lineterm="",
+        )
+    )
+
+
+def _reject_docstring(signature_key: tuple) -> None:
+    """Bump the salt for ``signature_key`` so a fresh docstring is generated."""
+    docstring_salts = st.session_state.setdefault("docstring_salts", {})
+    # New salt, new cache entry: a fresh docstring is generated
+    docstring_salts[signature_key] = docstring_salts.get(signature_key, 0) + 1
+    st.session_state["temp_info_msg"] = "Generating a new docstring suggestion..."
+
+
+@st.fragment
+def _render_docstring_preview(results: list, style: str) -> None:
+    """Render the Generated Docstrings preview for the scanned functions.
+
+    As a fragment, picking a function or rejecting a suggestion reruns only
+    this block; Apply still reruns the whole app, as it changes the status
+    shown in the file list, the KPIs and the other tabs.
+    """
+    baseline_on = style != "none"
+
+    if not results:
+        st.info("Run Scan to preview docstrings.")
+    else:
+        options = []
+        mapping = {}
+        for r in results:
+            for fn in r.get("functions", []):
+                status = "🟢 Fixed" if fn.get("is_valid") else "🔴 Fix"
+                label = f"{fn.get('name')} {status}"
+                options.append(label)
+                mapping[label] = (r, fn)
+
+        if not options:
+            st.markdown(
+                "<div class='muted'>No functions found in scanned files.</div>",
+                unsafe_allow_html=True,
+            )
+        else:
+            st.markdown(
+                '<div class="input-label">Select function to preview</div>',
+                unsafe_allow_html=True,
+            )
+
+            # Check for pending selection update from a button click in the previous run
+            if "pending_selection" in st.session_state:
+                pending = st.session_state.pop("pending_selection")
+                if pending in options:
+                    st.session_state["ui_selected_fn_select"] = pending
+
+            selected_label = st.selectbox(
+                label="Function selector",
+                options=options,
+                index=0,
+                key="ui_selected_fn_select",
+                label_visibility="collapsed",
+            )
+
+            # Show success message if present from previous run
+            if "temp_success_msg" in st.session_state:
+                st.success(st.session_state["temp_success_msg"])
+                del st.session_state["temp_success_msg"]
             
-            new_doc = [body_indent + quote_prefix + '"""']
-            for line in doc_body.splitlines():
-                new_doc.append(body_indent + line if line.strip() else body_indent)
-            new_doc.append(body_indent + '"""')
-
-            # Replace existing docstring
-            if (
-                node.body
-                and isinstance(node.body[0], ast.Expr)
-                and isinstance(node.body[0].value, ast.Constant)
-                and isinstance(node.body[0].value.value, str)
-            ):
-                start = node.body[0].lineno - 1
-                end = node.body[0].end_lineno
-                
-                # D201: Remove blank lines before the docstring (between def line and docstring)
-                # Check lines between def_line and start (docstring) for blank lines
-                while start - 1 > def_line and lines[start - 1].strip() == "":
-                    start -= 1
-                
-                # D202: Remove blank lines after the docstring
-                while end < len(lines) and lines[end].strip() == "":
-                    end += 1
-                
-                lines = lines[:start] + new_doc + lines[end:]
+            # Show info message if present (e.g., no changes)
+            if "temp_info_msg" in st.session_state:
+                st.info(st.session_state["temp_info_msg"])
+                del st.session_state["temp_info_msg"]
+
+            selected_r, selected_fn = mapping[selected_label]
+            
+            # Function info section
+            file_path = selected_r.get("path", "")
+            file_name = os.path.basename(file_path)
+            fn_lines = f"lines {selected_fn.get('start_line')}–{selected_fn.get('end_line')}"
+            fn_name_display = selected_fn.get("name", "")
+            
+            # Styled function metadata card
+            st.markdown(f'''
+            <div class="info-card">
+                <div class="info-item">
+                    <div class="info-item-label">📄 File</div>
+                    <div class="info-item-value">{file_name}</div>
+                </div>
+                <div class="info-item">
+                    <div class="info-item-label">🔧 Function</div>
+                    <div class="info-item-value">{fn_name_display}</div>
+                </div>
+                <div class="info-item">
+                    <div class="info-item-label">📍 Location</div>
+                    <div class="info-item-value">{fn_lines}</div>
+                </div>
+                <div class="info-item">
+                    <div class="info-item-label">🎨 Style</div>
+                    <div class="info-item-value">{style.capitalize()}</div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+            # Create a stable cache key based on function signature, source + style
+            signature_key = (
+                selected_fn.get("name", ""),
+                tuple(tuple(sorted(a.items())) for a in selected_fn.get("args_meta", [])),
+                selected_fn.get("returns", ""),
+                tuple(selected_fn.get("raises", [])),
+                hashlib.blake2b(
+                    selected_fn.get("source_code", "").encode(), digest_size=16
+                ).hexdigest(),
+                style,
+            )
+            # Reject bumps this signature's salt to get a fresh suggestion
+            docstring_salts = st.session_state.setdefault("docstring_salts", {})
+
+            before_text = selected_fn.get("docstring") or ""
+            
+            if baseline_on:
+                after_text = _cached_docstring(
+                    *signature_key, docstring_salts.get(signature_key, 0), selected_fn
+                )
             else:
-                insert_at = node.body[0].lineno - 1 if node.body else def_line + 1
-                lines = lines[:insert_at] + new_doc + lines[insert_at:]
+                after_text = ""
+
+            # Comparison columns
+            col_before, col_after, col_diff = st.columns([1, 1, 1])
+            with col_before:
+                st.markdown("#### 📖 Current Docstring")
+                if before_text.strip():
+                    st.code(before_text, language="python")
+                else:
+                    st.markdown(
+                        "<div class='muted'>No docstring present.</div>",
+                        unsafe_allow_html=True,
+                    )
+
+            with col_after:
+                st.markdown("#### ✨ Generated Preview")
+                if not baseline_on:
+                    st.markdown(
+                        "<div class='muted'>Generation disabled for style 'none'.</div>",
+                        unsafe_allow_html=True,
+                    )
+                else:
+                    preview = '"""\n' + (after_text.strip() or "") + '\n"""'
+                    st.code(preview, language="python")
+                    if baseline_on:
+                        # Layout for Update and Reject buttons
+                        btn_col1, btn_col2 = st.columns([1, 1])
+
+                        with btn_col1:
+                            if st.button("✅ Apply", key=f"update_{selected_fn['name']}"):
+                                # Compare cleaned strings to determine if an update is needed
+                                clean_before = before_text.strip()
+                                clean_after = after_text.strip()
+                                if clean_before == clean_after:
+                                    st.session_state["temp_info_msg"] = "No changes to update."
+                                    st.rerun()
+                                else:
+                                    ok = insert_or_replace_docstring(
+                                        selected_r["path"],
+                                        selected_fn["name"],
+                                        after_text,
+                                    )
+                                    if ok:
+                                        # Update the in-memory object referenced by session state
+                                        selected_fn["docstring"] = after_text
+                                        selected_fn["has_docstring"] = True
+                                        selected_fn["pydocstyle_errors"] = []  # Assume fixed
+                                        selected_fn["is_valid"] = True
+                                        mark_scan_results_changed()
+
+                                        # Construct the new label to preserve selection across rerun
+                                        file_basename = os.path.basename(
+                                            selected_r.get("path", "")
+                                        )
+                                        new_status = "🟢 Fixed"
+                                        new_label = f"{file_basename} :: {selected_fn.get('name')} (lines {selected_fn.get('start_line')}-{selected_fn.get('end_line')}) {new_status}"
 
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(lines) + "\n")
-            except OSError:
-                return False
+                                        # Store in a temporary state variable to update the widget in the NEXT run
+                                        st.session_state["pending_selection"] = new_label
 
-            return True
+                                        st.session_state[
+                                            "temp_success_msg"
+                                        ] = "Docstring updated in file!"
+                                        st.rerun()
 
-    return False
+                        with btn_col2:
+                            # The callback runs before the fragment reruns, so the
+                            # preview picks up the new salt without a full rerun
+                            st.button(
+                                "❌ Reject",
+                                key=f"reject_{selected_fn['name']}",
+                                on_click=_reject_docstring,
+                                args=(signature_key,),
+                            )
+
+            with col_diff:
+                st.markdown("#### 📊 Diff View")
+                if baseline_on:
+                    diff_text = _docstring_diff(before_text or "", after_text or "")
+                    if diff_text:
+                        st.code(diff_text, language="diff")
+                    else:
+                        st.markdown(
+                            "<div class='muted'>No changes between Before and After.</div>",
+                            unsafe_allow_html=True,
+                        )
+                else:
+                    st.markdown(
+                        "<div class='muted'>Generation disabled — no diff to show.</div>",
+                        unsafe_allow_html=True,
+                    )
 
 
 # Configure Streamlit
@@ -95,13 +453,56 @@ if "ui_docstring_style" not in st.session_state:
     st.session_state["ui_docstring_style"] = "google"
 
 
+# Keyed widgets that live inside the lazily rendered tabs
+_TAB_WIDGET_KEYS = (
+    "ui_selected_fn_select",
+    "dashboard_status_filter",
+    "dashboard_search_input",
+    "tests_only_failed",
+    "validator_detailed_view",
+)
+
+
+# Vega-Lite spec of the Validator's compliance chart, written out directly
+# so a render skips building and validating Altair objects; only the data
+# values are filled in per rerun
+_COMPLIANCE_SPEC_TEMPLATE = {
+    "height": 320,
+    "layer": [
+        {
+            "mark": {"type": "bar"},
+            "encoding": {
+                "x": {"field": "label", "type": "nominal", "sort": None, "axis": {"labelAngle": 0, "title": None}},
+                "y": {"field": "Count", "type": "quantitative", "axis": {"tickMinStep": 1}},
+                "color": {
+                    "field": "label",
+                    "type": "nominal",
+                    "scale": {"domain": ["Compliant", "Violations"], "range": ["#16a34a", "#ef4444"]},
+                    "legend": None,
+                },
+            },
+        },
+        {
+            "mark": {"type": "text", "dy": -10, "color": "white", "fontWeight": "bold"},
+            "encoding": {
+                "x": {"field": "label", "type": "nominal", "sort": None},
+                "y": {"field": "Count", "type": "quantitative"},
+                "text": {"field": "Count", "type": "quantitative"},
+            },
+        },
+    ],
+}
+
+
 # Helper callbacks
 def _use_examples_folder():
     st.session_state["ui_path_input"] = "examples"
     st.session_state["ui_path"] = "examples"
 
 
-# Load CSS from external file for better maintainability
+# Load CSS from external file for better maintainability; read once per
+# server process, as the stylesheet is the same for every rerun and session
+@st.cache_resource(show_spinner=False)
 def load_css():
     """Load CSS from external file."""
     css_path = os.path.join(os.path.dirname(__file__), "static", "styles.css")
@@ -139,25 +540,33 @@ with main_col:
             else:
                 generate_baseline = st.session_state.get("ui_docstring_style", "google") != "none"
 
-                per_file = parse_path(path, recursive=True)
-
-                for file_result in per_file:
-                    v = run_validators(file_result.get("path"))
-                    pydoc_map = v["pydocstyle"]["mapping"]
-                    # expose module-level pydocstyle errors (if any) on the file result
-                    file_result["pydocstyle_module_errors"] = pydoc_map.get("<module>", []) if pydoc_map else []
-                    radon_entries = v["radon"]["entries"]
-                    radon_by_name = {e.get("name"): e for e in radon_entries}
-                    for fn in file_result.get("functions", []):
-                        fn_name = fn.get("name")
-                        pydoc_errors = pydoc_map.get(fn_name, [])
-                        fn["pydocstyle_errors"] = pydoc_errors
-                        fn["radon"] = radon_by_name.get(fn_name, {})
-                        
-                        # Fix: Check both existence AND correctness (no pydocstyle errors)
-                        has_doc = bool(fn.get("has_docstring"))
-                        is_valid_style = not pydoc_errors
-                        fn["is_valid"] = has_doc and is_valid_style
+                # Parse results and both validators are cached per file by
+                # (mtime, size), so a rescan only re-processes changed files;
+                # the lock keeps concurrent sessions from doing that work twice
+                with _scan_lock():
+                    per_file = parse_path(path, recursive=True)
+                    # One batched pydocstyle run covers every changed file
+                    pydoc_maps, _ = run_pydocstyle_many([r.get("path") for r in per_file])
+
+                    for file_result in per_file:
+                        file_path = file_result.get("path")
+                        pydoc_map = pydoc_maps.get(file_path, {})
+                        # expose module-level pydocstyle errors (if any) on the file result
+                        file_result["pydocstyle_module_errors"] = pydoc_map.get("<module>", []) if pydoc_map else []
+                        functions = file_result.get("functions") or []
+                        if not functions:
+                            # Nothing to annotate, so skip the radon lookup as well
+                            continue
+                        radon_entries, _ = run_radon_cc(file_path)
+                        radon_by_name = {e.get("name"): e for e in radon_entries}
+                        for fn in functions:
+                            fn_name = fn.get("name")
+                            pydoc_errors = pydoc_map.get(fn_name, [])
+                            fn["pydocstyle_errors"] = pydoc_errors
+                            fn["radon"] = radon_by_name.get(fn_name, {})
+                            
+                            # Fix: Check both existence AND correctness (no pydocstyle errors)
+                            fn["is_valid"] = bool(fn.get("has_docstring")) and not pydoc_errors
 
                 report = compute_coverage(per_file, generate_baseline)
 
@@ -166,6 +575,7 @@ with main_col:
 
                 st.session_state["last_report"] = report
                 st.session_state["last_scan_results"] = per_file
+                mark_scan_results_changed()
 
                 st.session_state["success_message"] = f"Scan complete — report written to {out_json}"
                 st.rerun()
@@ -181,11 +591,20 @@ with left_col:
     display_path = st.session_state.get("ui_path_input", "examples")
     if os.path.isdir(display_path):
         try:
-            files = sorted(f for f in os.listdir(display_path) if f.endswith(".py"))
+            files = _list_py_files(display_path, os.stat(display_path).st_mtime_ns)
             if files:
                 # If we have previous scan results, use them to show file status badges
-                scan_results = st.session_state.get("last_scan_results") or []
-                scanned = {os.path.basename(r.get("path", "")): r for r in scan_results}
+                # The basename index is rebuilt only when the results get a new scan_version
+                scan_version = st.session_state.get("scan_version")
+                cached_index = st.session_state.get("_scanned_by_basename")
+                if cached_index and cached_index[0] == scan_version:
+                    scanned = cached_index[1]
+                else:
+                    scan_results = st.session_state.get("last_scan_results") or []
+                    scanned = {os.path.basename(r.get("path", "")): r for r in scan_results}
+                    st.session_state["_scanned_by_basename"] = (scan_version, scanned)
+                # All items go out as one markdown element rather than one per file
+                items = []
                 for f in files[:20]:
                     badge = ""
                     r = scanned.get(f)
@@ -199,7 +618,8 @@ with left_col:
                         else:
                             badge = '<span style="float:right;color:#0b7a3e;font-weight:700;">🟢 OK</span>'
 
-                    st.markdown(f'<div class="file-item">{f}{badge}</div>', unsafe_allow_html=True)
+                    items.append(f'<div class="file-item">{f}{badge}</div>')
+                st.markdown("".join(items), unsafe_allow_html=True)
                 if len(files) > 20:
                     st.markdown(f"<div class='muted'>{len(files)-20} more files…</div>", unsafe_allow_html=True)
             else:
@@ -251,7 +671,7 @@ with left_col:
         if "last_scan_results" in st.session_state:
             per_file = st.session_state["last_scan_results"]
             generate_baseline = new_style != "none"
-            report = compute_coverage(per_file, generate_baseline)
+            report = _cached_coverage(st.session_state.get("scan_version"), generate_baseline, per_file)
             st.session_state["last_report"] = report
 
             out_json = st.session_state["ui_out_json_input"]
@@ -291,337 +711,155 @@ with left_col:
       </div>
     """
 
-    st.markdown('<div class="kpi-row">', unsafe_allow_html=True)
-    st.markdown(coverage_html, unsafe_allow_html=True)
-    st.markdown(functions_html, unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    # A single element, so the kpi-row wrapper really contains both circles;
+    # stripped because a blank line would end the HTML block in markdown
+    st.markdown(
+        f'<div class="kpi-row">{coverage_html.strip()}{functions_html.strip()}</div>',
+        unsafe_allow_html=True,
+    )
 
 # Main Panel
 with main_col:
-    tab_dashboard, tab1, tab2, tab3 = st.tabs(["🧰 Dashboard", "📜 Generated Docstrings", "📈 Metrics", "📊 Validator"])
+    # Widgets in a tab that is not drawn would lose their state at the end
+    # of the run; storing the values back keeps them across tab switches
+    for widget_key in _TAB_WIDGET_KEYS:
+        if widget_key in st.session_state:
+            st.session_state[widget_key] = st.session_state[widget_key]
+
+    # Stateful tabs rerun the app on a switch and report which one is open,
+    # so only the selected tab is rendered
+    tab_dashboard, tab1, tab2, tab3 = st.tabs(
+        ["🧰 Dashboard", "📜 Generated Docstrings", "📈 Metrics", "📊 Validator"],
+        key="ui_main_tab",
+        on_change="rerun",
+    )
 
     with tab_dashboard:
-        st.markdown("#### 🧰 Dashboard")
-        
-        # Dashboard sub-tabs
-        sub_tab1, sub_tab2, sub_tab3, sub_tab4, sub_tab5 = st.tabs(["🔧 Advanced Filters", "🔍 Search", "📤 Export", "🧪 Tests", "💡 Help and Tips"])
-        
-        with sub_tab1:
-            render_advanced_filters_tab()
-        
-        with sub_tab2:
-            render_search_tab()
-        
-        with sub_tab3:
-            render_export_tab()
-        
-        with sub_tab4:
-            render_tests_tab()
-        
-        with sub_tab5:
-            render_help_tips_tab()
+        if tab_dashboard.open:
+            st.markdown("#### 🧰 Dashboard")
+            
+            # Dashboard sub-tabs
+            sub_tab1, sub_tab2, sub_tab3, sub_tab4, sub_tab5 = st.tabs(
+                ["🔧 Advanced Filters", "🔍 Search", "📤 Export", "🧪 Tests", "💡 Help and Tips"],
+                key="ui_dashboard_tab",
+                on_change="rerun",
+            )
+            
+            with sub_tab1:
+                if sub_tab1.open:
+                    render_advanced_filters_tab()
+            
+            with sub_tab2:
+                if sub_tab2.open:
+                    render_search_tab()
+            
+            with sub_tab3:
+                if sub_tab3.open:
+                    render_export_tab()
+            
+            with sub_tab4:
+                if sub_tab4.open:
+                    render_tests_tab()
+            
+            with sub_tab5:
+                if sub_tab5.open:
+                    render_help_tips_tab()
 
     with tab1:
-        results = st.session_state.get("last_scan_results", [])
-        style = st.session_state.get("ui_docstring_style", "google")
-        baseline_on = style != "none"
-
-        if not results:
-            st.info("Run Scan to preview docstrings.")
-        else:
-            options = []
-            mapping = {}
-            for r in results:
-                file_basename = os.path.basename(r.get("path", ""))
-                for fn in r.get("functions", []):
-                    status = "🟢 Fixed" if fn.get("is_valid") else "🔴 Fix"
-                    label = f"{fn.get('name')} {status}"
-                    options.append(label)
-                    mapping[label] = (r, fn)
-
-            if not options:
-                st.markdown(
-                    "<div class='muted'>No functions found in scanned files.</div>",
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.markdown(
-                    '<div class="input-label">Select function to preview</div>',
-                    unsafe_allow_html=True,
-                )
-
-                # Check for pending selection update from a button click in the previous run
-                if "pending_selection" in st.session_state:
-                    pending = st.session_state.pop("pending_selection")
-                    if pending in options:
-                        st.session_state["ui_selected_fn_select"] = pending
-
-                selected_label = st.selectbox(
-                    label="Function selector",
-                    options=options,
-                    index=0,
-                    key="ui_selected_fn_select",
-                    label_visibility="collapsed",
-                )
-
-                # Show success message if present from previous run
-                if "temp_success_msg" in st.session_state:
-                    st.success(st.session_state["temp_success_msg"])
-                    del st.session_state["temp_success_msg"]
-                
-                # Show info message if present (e.g., no changes)
-                if "temp_info_msg" in st.session_state:
-                    st.info(st.session_state["temp_info_msg"])
-                    del st.session_state["temp_info_msg"]
-
-                selected_r, selected_fn = mapping[selected_label]
-                
-                # Function info section
-                file_path = selected_r.get("path", "")
-                file_name = os.path.basename(file_path)
-                fn_lines = f"lines {selected_fn.get('start_line')}–{selected_fn.get('end_line')}"
-                fn_name_display = selected_fn.get("name", "")
-                
-                # Styled function metadata card
-                st.markdown(f'''
-                <div class="info-card">
-                    <div class="info-item">
-                        <div class="info-item-label">📄 File</div>
-                        <div class="info-item-value">{file_name}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-item-label">🔧 Function</div>
-                        <div class="info-item-value">{fn_name_display}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-item-label">📍 Location</div>
-                        <div class="info-item-value">{fn_lines}</div>
-                    </div>
-                    <div class="info-item">
-                        <div class="info-item-label">🎨 Style</div>
-                        <div class="info-item-value">{style.capitalize()}</div>
-                    </div>
-                </div>
-                ''', unsafe_allow_html=True)
-
-                # Create a stable cache key based on function signature + style
-                fn_name = selected_fn.get("name", "")
-                fn_args = json.dumps(selected_fn.get("args_meta", []), sort_keys=True)
-                fn_returns = selected_fn.get("returns", "")
-                fn_raises = json.dumps(selected_fn.get("raises", []), sort_keys=True)
-                cache_key = f"docstring_cache_{fn_name}_{fn_args}_{fn_returns}_{fn_raises}_{style}"
-                
-                # Track if user requested regeneration
-                regen_flag_key = f"needs_regen_{cache_key}"
-                
-                # Initialize docstring cache in session state if not present
-                if "docstring_cache" not in st.session_state:
-                    st.session_state["docstring_cache"] = {}
-
-                before_text = selected_fn.get("docstring") or ""
-                
-                if baseline_on:
-                    # Check if regeneration was requested
-                    skip_cache = st.session_state.pop(regen_flag_key, False)
-                    
-                    # If regeneration requested, delete old cache entry first
-                    if skip_cache and cache_key in st.session_state["docstring_cache"]:
-                        del st.session_state["docstring_cache"][cache_key]
-                    
-                    # Check session state cache first
-                    if cache_key in st.session_state["docstring_cache"]:
-                        after_text = st.session_state["docstring_cache"][cache_key]
-                    else:
-                        # Generate fresh and cache
-                        after_text = generate_docstring(selected_fn, style=style, skip_cache=True)
-                        st.session_state["docstring_cache"][cache_key] = after_text
-                else:
-                    after_text = ""
-
-                # Comparison columns
-                col_before, col_after, col_diff = st.columns([1, 1, 1])
-                with col_before:
-                    st.markdown("#### 📖 Current Docstring")
-                    if before_text.strip():
-                        st.code(before_text, language="python")
-                    else:
-                        st.markdown(
-                            "<div class='muted'>No docstring present.</div>",
-                            unsafe_allow_html=True,
-                        )
-
-                with col_after:
-                    st.markdown("#### ✨ Generated Preview")
-                    if not baseline_on:
-                        st.markdown(
-                            "<div class='muted'>Generation disabled for style 'none'.</div>",
-                            unsafe_allow_html=True,
-                        )
-                    else:
-                        preview = '"""\n' + (after_text.strip() or "") + '\n"""'
-                        st.code(preview, language="python")
-                        if baseline_on:
-                            # Layout for Update and Reject buttons
-                            btn_col1, btn_col2 = st.columns([1, 1])
-
-                            with btn_col1:
-                                if st.button("✅ Apply", key=f"update_{selected_fn['name']}"):
-                                    # Compare cleaned strings to determine if an update is needed
-                                    clean_before = before_text.strip()
-                                    clean_after = after_text.strip()
-                                    if clean_before == clean_after:
-                                        st.session_state["temp_info_msg"] = "No changes to update."
-                                        st.rerun()
-                                    else:
-                                        ok = insert_or_replace_docstring(
-                                            selected_r["path"],
-                                            selected_fn["name"],
-                                            after_text,
-                                        )
-                                        if ok:
-                                            # Update the in-memory object referenced by session state
-                                            selected_fn["docstring"] = after_text
-                                            selected_fn["has_docstring"] = True
-                                            selected_fn["pydocstyle_errors"] = []  # Assume fixed
-                                            selected_fn["is_valid"] = True
-
-                                            # Construct the new label to preserve selection across rerun
-                                            file_basename = os.path.basename(
-                                                selected_r.get("path", "")
-                                            )
-                                            new_status = "🟢 Fixed"
-                                            new_label = f"{file_basename} :: {selected_fn.get('name')} (lines {selected_fn.get('start_line')}-{selected_fn.get('end_line')}) {new_status}"
-
-                                            # Store in a temporary state variable to update the widget in the NEXT run
-                                            st.session_state["pending_selection"] = new_label
-
-                                            st.session_state[
-                                                "temp_success_msg"
-                                            ] = "Docstring updated in file!"
-                                            st.rerun()
-
-                            with btn_col2:
-                                if st.button("❌ Reject", key=f"reject_{selected_fn['name']}"):
-                                    # Set flag to skip cache and regenerate fresh docstring
-                                    st.session_state[regen_flag_key] = True
-                                    st.session_state["temp_info_msg"] = "Generating a new docstring suggestion..."
-                                    st.rerun()
-
-                with col_diff:
-                    st.markdown("#### 📊 Diff View")
-                    before_lines = (before_text or "").splitlines(keepends=True)
-                    after_lines = (after_text or "").splitlines(keepends=True)
-                    if baseline_on:
-                        diff_lines = list(
-                            difflib.unified_diff(
-                                before_lines,
-                                after_lines,
-                                fromfile="Before",
-                                tofile="After",
-                                lineterm="",
-                            )
-                        )
-                        if diff_lines:
-                            diff_text = "\n".join(diff_lines)
-                            st.code(diff_text, language="diff")
-                        else:
-                            st.markdown(
-                                "<div class='muted'>No changes between Before and After.</div>",
-                                unsafe_allow_html=True,
-                            )
-                    else:
-                        st.markdown(
-                            "<div class='muted'>Generation disabled — no diff to show.</div>",
-                            unsafe_allow_html=True,
-                        )
+        if tab1.open:
+            _render_docstring_preview(
+                st.session_state.get("last_scan_results", []),
+                st.session_state.get("ui_docstring_style", "google"),
+            )
 
     with tab2:
-        report = st.session_state.get("last_report")
-        results = st.session_state.get("last_scan_results", [])
+        if tab2.open:
+            report = st.session_state.get("last_report")
+            results = st.session_state.get("last_scan_results", [])
 
-        if not report or not results:
-            st.info("Run Scan to compute coverage.")
-        else:
-            # Coverage table
-            st.markdown("#### 📊 File-by-File Coverage")
-            rows = []
-            for p in report.get("files", []):
-                rows.append(
-                    {
-                        "File": p.get("file_path"),
-                        "Functions": p.get("total_functions"),
-                        "Already Documented": p.get("already_documented", 0),
-                        "Generated Docstrings": p.get("generated_docstrings", 0),
-                        "Parsing Errors": len(p.get("parsing_errors", [])),
-                    }
+            if not report or not results:
+                st.info("Run Scan to compute coverage.")
+            else:
+                # Coverage table
+                st.markdown("#### 📊 File-by-File Coverage")
+                rows = []
+                for p in report.get("files", []):
+                    rows.append(
+                        {
+                            "File": p.get("file_path"),
+                            "Functions": p.get("total_functions"),
+                            "Already Documented": p.get("already_documented", 0),
+                            "Generated Docstrings": p.get("generated_docstrings", 0),
+                            "Parsing Errors": len(p.get("parsing_errors", [])),
+                        }
+                    )
+
+                st.dataframe(rows, width="stretch")
+
+                st.download_button(
+                    "⬇️ Download Report JSON",
+                    data=json.dumps(report, indent=2),
+                    file_name=os.path.basename(
+                        st.session_state.get("ui_out_json_input", "review_logs.json")
+                    ),
+                    mime="application/json",
                 )
 
-            st.dataframe(rows, width="stretch")
-
-            st.download_button(
-                "⬇️ Download Report JSON",
-                data=json.dumps(report, indent=2),
-                file_name=os.path.basename(
-                    st.session_state.get("ui_out_json_input", "review_logs.json")
-                ),
-                mime="application/json",
-            )
-
-            # File details section
-            st.markdown("#### 📂 File Details")
+                # File details section
+                st.markdown("#### 📂 File Details")
 
-            for r in results:
-                file_name = os.path.basename(r.get("path", "unknown"))
-                func_count = len(r.get("functions", []))
-                with st.expander(f"📄 {file_name} — {func_count} function(s)", expanded=False):
-                    
-                    # Imports section
-                    st.markdown("**📦 Imports**")
-                    imports = r.get("imports", [])
-                    if imports:
-                        st.code("\n".join(imports), language="python")
-                    else:
-                        st.caption("No imports found.")
-
-                    # Parsing errors section
-                    pe = r.get("parsing_errors", []) or []
-                    if pe:
-                        st.markdown("**⚠️ Parsing Errors**")
-                        for i, err in enumerate(pe, 1):
-                            st.error(f"Error {i}: {err}")
-
-                    # Functions section with structured display
-                    st.markdown("**🔧 Functions**")
-                    for fn in r.get("functions", []):
-                        fn_status = "✅" if fn.get("has_docstring") else "❌"
-                        with st.container():
-                            st.markdown(f"##### {fn_status} `{fn.get('name')}` (lines {fn.get('start_line')}–{fn.get('end_line')})")
-                            
-                            # Function metadata in columns
-                            c1, c2, c3 = st.columns(3)
-                            with c1:
-                                st.caption("**Arguments**")
-                                args = fn.get("args", [])
-                                st.text(", ".join(args) if args else "None")
-                            with c2:
-                                st.caption("**Returns**")
-                                st.text(fn.get("returns") or "None")
-                            with c3:
-                                st.caption("**Raises**")
-                                raises = fn.get("raises", [])
-                                st.text(", ".join(raises) if raises else "None")
-                            
-                            # Additional info row
-                            c4, c5, c6 = st.columns(3)
-                            with c4:
-                                st.caption("**Yields**")
-                                st.text("Yes" if fn.get("has_yields") else "No")
-                            with c5:
-                                st.caption("**Complexity**")
-                                st.text(str(fn.get("complexity", "N/A")))
-                            with c6:
-                                st.caption("**Nesting**")
-                                st.text(str(fn.get("nesting", "N/A")))
+                for r in results:
+                    file_name = os.path.basename(r.get("path", "unknown"))
+                    func_count = len(r.get("functions", []))
+                    with st.expander(f"📄 {file_name} — {func_count} function(s)", expanded=False):
+                        
+                        # Imports section
+                        st.markdown("**📦 Imports**")
+                        imports = r.get("imports", [])
+                        if imports:
+                            st.code("\n".join(imports), language="python")
+                        else:
+                            st.caption("No imports found.")
+
+                        # Parsing errors section
+                        pe = r.get("parsing_errors", []) or []
+                        if pe:
+                            st.markdown("**⚠️ Parsing Errors**")
+                            for i, err in enumerate(pe, 1):
+                                st.error(f"Error {i}: {err}")
+
+                        # Functions section with structured display
+                        st.markdown("**🔧 Functions**")
+                        for fn in r.get("functions", []):
+                            fn_status = "✅" if fn.get("has_docstring") else "❌"
+                            with st.container():
+                                st.markdown(f"##### {fn_status} `{fn.get('name')}` (lines {fn.get('start_line')}–{fn.get('end_line')})")
+                                
+                                # Function metadata in columns
+                                c1, c2, c3 = st.columns(3)
+                                with c1:
+                                    st.caption("**Arguments**")
+                                    args = fn.get("args", [])
+                                    st.text(", ".join(args) if args else "None")
+                                with c2:
+                                    st.caption("**Returns**")
+                                    st.text(fn.get("returns") or "None")
+                                with c3:
+                                    st.caption("**Raises**")
+                                    raises = fn.get("raises", [])
+                                    st.text(", ".join(raises) if raises else "None")
+                                
+                                # Additional info row
+                                c4, c5, c6 = st.columns(3)
+                                with c4:
+                                    st.caption("**Yields**")
+                                    st.text("Yes" if fn.get("has_yields") else "No")
+                                with c5:
+                                    st.caption("**Complexity**")
+                                    st.text(str(fn.get("complexity", "N/A")))
+                                with c6:
+                                    st.caption("**Nesting**")
+                                    st.text(str(fn.get("nesting", "N/A")))
 
     with tab3:
         # Auto-rescan if triggered by Fix All button
@@ -632,125 +870,140 @@ with main_col:
                 new_results = parse_path(path)
                 if new_results:
                     st.session_state["last_scan_results"] = new_results
+                    mark_scan_results_changed()
         
-        results = st.session_state.get("last_scan_results", [])
+        if tab3.open:
+            results = st.session_state.get("last_scan_results", [])
 
-        if not results:
-            st.info("Run Scan to compute PEP257 validation summary.")
-        else:
-            summary = summarize_pydocstyle_on_files(results)
+            if not results:
+                st.info("Run Scan to compute PEP257 validation summary.")
+            else:
+                # Reuse the summary until the results get a new scan_version
+                scan_version = st.session_state.get("scan_version")
+                cached_summary = st.session_state.get("validator_summary")
+                if cached_summary is not None and cached_summary[0] == scan_version:
+                    summary = cached_summary[1]
+                else:
+                    summary = summarize_pydocstyle_on_files(results)
+                    st.session_state["validator_summary"] = (scan_version, summary)
 
-            if not summary.get("available"):
-                st.warning(
-                    "pydocstyle not available in this environment. Install it to enable validator summaries."
-                )
+                if not summary.get("available"):
+                    st.warning(
+                        "pydocstyle not available in this environment. Install it to enable validator summaries."
+                    )
 
-            total = summary.get("total_functions", 0)
-            compliant = summary.get("compliant", 0)
-            violations = summary.get("violations", 0)
+                total = summary.get("total_functions", 0)
+                compliant = summary.get("compliant", 0)
+                violations = summary.get("violations", 0)
 
-            # Styled summary metrics card
-            st.markdown(f'''
-            <div class="info-card">
-                <div class="info-item">
-                    <div class="info-item-label">📊 Total Scanned</div>
-                    <div class="info-item-value">{total}</div>
-                </div>
-                <div class="info-item">
-                    <div class="info-item-label">✅ Compliant</div>
-                    <div class="info-item-value">{compliant}</div>
-                </div>
-                <div class="info-item">
-                    <div class="info-item-label">❌ Violations</div>
-                    <div class="info-item-value">{violations}</div>
+                # Styled summary metrics card
+                st.markdown(f'''
+                <div class="info-card">
+                    <div class="info-item">
+                        <div class="info-item-label">📊 Total Scanned</div>
+                        <div class="info-item-value">{total}</div>
+                    </div>
+                    <div class="info-item">
+                        <div class="info-item-label">✅ Compliant</div>
+                        <div class="info-item-value">{compliant}</div>
+                    </div>
+                    <div class="info-item">
+                        <div class="info-item-label">❌ Violations</div>
+                        <div class="info-item-value">{violations}</div>
+                    </div>
                 </div>
-            </div>
-            ''', unsafe_allow_html=True)
-
-            # Chart section
-            st.markdown("#### 📈 Compliance Overview")
-            
-            comp_val = int(summary.get("compliant", 0))
-            viol_val = int(summary.get("violations", 0))
-
-            chart_data = [{"label": "Compliant", "Count": comp_val}, {"label": "Violations", "Count": viol_val}]
-            base = alt.Chart(alt.Data(values=chart_data))
-
-            bar = (
-                base.mark_bar()
-                .encode(
-                    x=alt.X("label:N", sort=None, axis=alt.Axis(labelAngle=0, title=None)),
-                    y=alt.Y("Count:Q", axis=alt.Axis(tickMinStep=1)),
-                    color=alt.Color(
-                        "label:N",
-                        scale=alt.Scale(domain=["Compliant", "Violations"], range=["#16a34a", "#ef4444"]),
-                        legend=None,
-                    ),
-                )
-            )
+                ''', unsafe_allow_html=True)
 
-            labels = (
-                base.mark_text(dy=-10, color="white", fontWeight="bold")
-                .encode(
-                    x=alt.X("label:N", sort=None),
-                    y=alt.Y("Count:Q"),
-                    text=alt.Text("Count:Q"),
-                )
-            )
+                # Chart section
+                st.markdown("#### 📈 Compliance Overview")
+                
+                comp_val = int(summary.get("compliant", 0))
+                viol_val = int(summary.get("violations", 0))
 
-            chart = (bar + labels).properties(height=320)
+                chart_values = [{"label": "Compliant", "Count": comp_val}, {"label": "Violations", "Count": viol_val}]
+                spec = _COMPLIANCE_SPEC_TEMPLATE | {"data": {"values": chart_values}}
 
-            st.altair_chart(chart, width="stretch")
+                st.vega_lite_chart(spec, width="stretch")
 
-            # Show success message from Fix All if present
-            if "fix_all_success" in st.session_state:
-                st.toast(st.session_state["fix_all_success"], icon="🎉")
-                del st.session_state["fix_all_success"]
+                # Show success message from Fix All if present
+                if "fix_all_success" in st.session_state:
+                    st.toast(st.session_state["fix_all_success"], icon="🎉")
+                    del st.session_state["fix_all_success"]
 
-            # Violations section
-            if summary.get("violations_list"):
-                # Use columns to put header and button on the same row
-                v_col1, v_col2 = st.columns([0.7, 0.3])
-                
-                with v_col1:
-                    st.markdown("#### ⚠️ Violation Details")
+                # Violations section
+                if summary.get("violations_list"):
+                    # Use columns to put header and button on the same row
+                    v_col1, v_col2 = st.columns([0.7, 0.3])
                     
-                with v_col2:
-                    # Fix All button - only show if there are violations
-                    if violations > 0:
-                        if st.button("🔧 Fix All Violations", key="fix_all_pep257", use_container_width=True):
-                            # Always use 'google' style for Fix All, independent of UI dropdown
-                            style = "google"
-                            with st.spinner("Fixing PEP 257 violations with AI..."):
-                                fixed_count = 0
-                                failed_count = 0
-                                processed = set()  # Track processed (file, function) pairs
-                                
-                                # Iterate through violations and fix each one
-                                for v in summary.get("violations_list", []):
-                                    file_path = v.get("file")
-                                    func_name = v.get("function")
+                    with v_col1:
+                        st.markdown("#### ⚠️ Violation Details")
+                        
+                    with v_col2:
+                        # Fix All button - only show if there are violations
+                        if violations > 0:
+                            if st.button("🔧 Fix All Violations", key="fix_all_pep257", use_container_width=True):
+                                # Always use 'google' style for Fix All, independent of UI dropdown
+                                style = "google"
+                                with st.spinner("Fixing PEP 257 violations with AI..."):
+                                    fixed_count = 0
+                                    failed_count = 0
+                                    processed = set()  # Track processed (file, function) pairs
+                                    func_jobs = []  # (file_path, func_name, func_meta) to generate in one batch
+                                    module_jobs = []  # file paths needing a module docstring
                                     
-                                    # Skip if already processed this (file, function) pair
-                                    key = (file_path, func_name)
-                                    if key in processed:
-                                        continue
-                                    processed.add(key)
+                                    # Index the results once; the first entry wins, as in a top-down scan
+                                    file_index = {}
+                                    for r in results:
+                                        file_index.setdefault(r.get("path"), r)
+                                    func_index = {}
+                                    for path_key, r in file_index.items():
+                                        for fn in r.get("functions", []):
+                                            func_index.setdefault((path_key, fn.get("name")), fn)
+                                    
+                                    # Iterate through violations and fix each one
+                                    for v in summary.get("violations_list", []):
+                                        file_path = v.get("file")
+                                        func_name = v.get("function")
+                                        
+                                        # Skip if already processed this (file, function) pair
+                                        key = (file_path, func_name)
+                                        if key in processed:
+                                            continue
+                                        processed.add(key)
+                                        
+                                        # Handle module-level violations (D100)
+                                        if func_name == "<module>":
+                                            module_jobs.append(file_path)
+                                            continue
+                                        
+                                        # Skip class-level violations (not supported)
+                                        if func_name == "<class>":
+                                            continue
+                                        
+                                        # Find the function metadata in results
+                                        func_meta = func_index.get((file_path, func_name))
+                                        if func_meta:
+                                            func_jobs.append((file_path, func_name, func_meta))
+                                    
+                                    # Coarse progress: module docstrings, then the function batch, then one step per file written
+                                    progress = st.progress(0.0, text=f"Generating {len(module_jobs)} module docstring(s)...")
+                                    
+                                    # Generate the module docstrings concurrently, then insert them
+                                    try:
+                                        module_docs = generate_module_docstrings(module_jobs)
+                                    except Exception:
+                                        module_docs = [""] * len(module_jobs)
                                     
-                                    # Handle module-level violations (D100)
-                                    if func_name == "<module>":
+                                    for file_path, module_doc in zip(module_jobs, module_docs):
                                         try:
-                                            # Generate module docstring
-                                            module_doc = generate_module_docstring(file_path)
                                             if module_doc:
                                                 ok = insert_module_docstring(file_path, module_doc)
                                                 if ok:
                                                     # Update in-memory metadata
-                                                    for r in results:
-                                                        if r.get("path") == file_path:
-                                                            r["has_module_docstring"] = True
-                                                            r["pydocstyle_module_errors"] = []
-                                                            break
+                                                    file_result = file_index.get(file_path)
+                                                    if file_result is not None:
+                                                        file_result["has_module_docstring"] = True
+                                                        file_result["pydocstyle_module_errors"] = []
                                                     fixed_count += 1
                                                 else:
                                                     failed_count += 1
@@ -758,69 +1011,92 @@ with main_col:
                                                 failed_count += 1
                                         except Exception:
                                             failed_count += 1
-                                        continue
                                     
-                                    # Skip class-level violations (not supported)
-                                    if func_name == "<class>":
-                                        continue
+                                    progress.progress(0.4, text=f"Generating {len(func_jobs)} function docstring(s)...")
                                     
-                                    # Find the function metadata in results
-                                    func_meta = None
-                                    file_result = None
-                                    for r in results:
-                                        if r.get("path") == file_path:
-                                            file_result = r
-                                            for fn in r.get("functions", []):
-                                                if fn.get("name") == func_name:
-                                                    func_meta = fn
-                                                    break
-                                            break
+                                    # Generate all function docstrings with AI in one batch (use cache if available)
+                                    try:
+                                        new_docstrings = generate_docstrings(
+                                            [(func_meta, style) for _, _, func_meta in func_jobs], skip_cache=False
+                                        )
+                                    except Exception:
+                                        new_docstrings = [""] * len(func_jobs)
+                                    
+                                    # Group the fixes by file so each file is rewritten once
+                                    fixes_by_file = {}
+                                    for (file_path, func_name, func_meta), new_docstring in zip(func_jobs, new_docstrings):
+                                        if new_docstring:
+                                            fixes_by_file.setdefault(file_path, []).append((func_name, func_meta, new_docstring))
+                                        else:
+                                            failed_count += 1
                                     
-                                    if func_meta and file_result:
+                                    for file_number, (file_path, fixes) in enumerate(fixes_by_file.items(), 1):
+                                        progress.progress(
+                                            0.8 + 0.2 * (file_number - 1) / len(fixes_by_file),
+                                            text=f"Updating {os.path.basename(file_path)} ({file_number}/{len(fixes_by_file)})...",
+                                        )
                                         try:
-                                            # Generate new docstring using AI (use cache if available)
-                                            new_docstring = generate_docstring(func_meta, style=style, skip_cache=False)
-                                            
-                                            if new_docstring:
-                                                # Apply the fix to the source file
-                                                ok = insert_or_replace_docstring(file_path, func_name, new_docstring)
-                                                if ok:
-                                                    # Update in-memory metadata
-                                                    func_meta["docstring"] = new_docstring
-                                                    func_meta["has_docstring"] = True
-                                                    func_meta["pydocstyle_errors"] = []
-                                                    func_meta["is_valid"] = True
-                                                    fixed_count += 1
-                                                else:
-                                                    failed_count += 1
+                                            # Apply the fixes to the source file
+                                            oks = insert_or_replace_docstrings(
+                                                file_path, [(func_name, new_docstring) for func_name, _, new_docstring in fixes]
+                                            )
+                                        except Exception:
+                                            oks = [False] * len(fixes)
+                                        for (_, func_meta, new_docstring), ok in zip(fixes, oks):
+                                            if ok:
+                                                # Update in-memory metadata
+                                                func_meta["docstring"] = new_docstring
+                                                func_meta["has_docstring"] = True
+                                                func_meta["pydocstyle_errors"] = []
+                                                func_meta["is_valid"] = True
+                                                fixed_count += 1
                                             else:
                                                 failed_count += 1
-                                        except Exception:
-                                            failed_count += 1
-                                
-                                # Store success message and rerun to refresh
-                                if fixed_count > 0:
-                                    msg = f"Fixed {fixed_count} item(s) with AI!"
-                                    if failed_count > 0:
-                                        msg += f" ({failed_count} could not be fixed)"
-                                    st.session_state["fix_all_success"] = msg
-                                    # Trigger a rescan to refresh the violations list
-                                    st.session_state["trigger_rescan"] = True
-                                else:
-                                    st.session_state["fix_all_success"] = "No items could be fixed. Try scanning again."
-                                
-                                st.rerun()
-                
-                for v in summary.get("violations_list"):
-                    file_name = os.path.basename(v.get('file', 'unknown'))
-                    func_name = v.get('function', '<unknown>')
-                    error_count = len(v.get("errors", []))
+                                    
+                                    # Store success message and rerun to refresh
+                                    if fixed_count > 0:
+                                        mark_scan_results_changed()
+                                        msg = f"Fixed {fixed_count} item(s) with AI!"
+                                        if failed_count > 0:
+                                            msg += f" ({failed_count} could not be fixed)"
+                                        st.session_state["fix_all_success"] = msg
+                                        # Trigger a rescan to refresh the violations list
+                                        st.session_state["trigger_rescan"] = True
+                                    else:
+                                        st.session_state["fix_all_success"] = "No items could be fixed. Try scanning again."
+                                    
+                                    st.rerun()
                     
-                    with st.expander(f"📄 {file_name} :: `{func_name}` — {error_count} error(s)"):
-                        errors = v.get("errors", [])
-                        if errors:
-                            st.error("\n".join(errors))
-            else:
-                st.success("🎉 No PEP257 docstring violations found!")
+                    # Violations of one file share its basename; compute it once per path
+                    base_names = {}
+                    for v in summary.get("violations_list"):
+                        violation_file = v.get("file", "unknown")
+                        if violation_file not in base_names:
+                            base_names[violation_file] = os.path.basename(violation_file)
+                    
+                    # One table for all violations; per-item expanders are opt-in
+                    if st.toggle("Detailed view", key="validator_detailed_view"):
+                        for v in summary.get("violations_list"):
+                            file_name = base_names[v.get("file", "unknown")]
+                            func_name = v.get('function', '<unknown>')
+                            error_count = len(v.get("errors", []))
+                            
+                            with st.expander(f"📄 {file_name} :: `{func_name}` — {error_count} error(s)"):
+                                errors = v.get("errors", [])
+                                if errors:
+                                    st.error("\n".join(errors))
+                    else:
+                        violation_rows = [
+                            {
+                                "File": base_names[v.get("file", "unknown")],
+                                "Function": v.get("function", "<unknown>"),
+                                "Errors": len(v.get("errors", [])),
+                                "Details": "\n".join(v.get("errors", [])),
+                            }
+                            for v in summary.get("violations_list")
+                        ]
+                        st.dataframe(violation_rows, width="stretch", hide_index=True)
+                else:
+                    st.success("🎉 No PEP257 docstring violations found!")
 
-            # Files listing intentionally omitted here (shown in Coverage tab)
\ No newline at end of file
+                # Files listing intentionally omitted here (shown in Coverage tab)
\ No newline at end of file
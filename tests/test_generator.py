@@ -97,6 +97,37 @@ def test_fix_imperative_mood_raises():
     assert result.startswith("Raise ")
 
 
+def test_fix_imperative_mood_lowercase():
+    """Test D401 fix: lowercase 'raises' should become 'raise'."""
+    result = _fix_imperative_mood("raises an exception when input is invalid.")
+    assert result.startswith("raise ")
+
+
+def test_fix_imperative_mood_unlisted_verb():
+    """Test D401 fix: verbs missing from the map fall back to the suffix rules."""
+    assert _fix_imperative_mood("Fetches the password.").startswith("Fetch ")
+    assert _fix_imperative_mood("Uses the cache.").startswith("Use ")
+    assert _fix_imperative_mood("Applies the patch.").startswith("Apply ")
+    assert _fix_imperative_mood("Wraps the app.").startswith("Wrap ")
+    assert _fix_imperative_mood("Process the batch.") == "Process the batch."
+
+
+def test_fix_imperative_mood_keeps_noun_openers():
+    """Test D401 fix: plural nouns and headings are not turned into verbs."""
+    for line in (
+        "Settings for the app.",
+        "Options passed to the parser.",
+        "Parameters of the model.",
+        "Helpers for parsing.",
+        "Results of the scan.",
+        "Bytes read from the file.",
+        "News feed entries.",
+        "Quizzes loaded at start-up.",
+        "Notes.",
+    ):
+        assert _fix_imperative_mood(line) == line
+
+
 def test_fix_imperative_mood_already_imperative():
     """Test D401 fix: already imperative mood should not change."""
     result = _fix_imperative_mood("Calculate the average of numbers.")
@@ -171,3 +202,23 @@ def test_post_process_removes_attributes_section():
     assert "Args:" in result
     assert "Returns:" in result
 
+
+
+def test_insert_module_docstring_replaces_only_real_docstring():
+    """Test module docstring replacement follows the AST, not leading quotes."""
+    import tempfile
+    from core.docstring_engine.generator import insert_module_docstring
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "module.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# header\n'Old docstring.'\nimport os\n")
+        assert insert_module_docstring(path, "New docstring.")
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == '# header\n"""New docstring."""\nimport os\n'
+        
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('"""not a docstring""".strip()\n')
+        assert insert_module_docstring(path, "New docstring.")
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == '"""New docstring."""\n"""not a docstring""".strip()\n'
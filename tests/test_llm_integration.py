@@ -1,15 +1,24 @@
 """Tests for LLM integration and prompt building."""
 
+import json
 import os
 import sys
+from types import SimpleNamespace
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
+from core.docstring_engine import generator
 from core.docstring_engine.generator import (
+    _build_groq_batch_prompt,
     _build_groq_prompt,
     _create_cache_key,
+    _cache_get,
+    _cache_put,
+    _parse_groq_batch_response,
     generate_docstring,
+    generate_docstrings,
+    get_cache_stats,
 )
 
 
@@ -128,3 +137,98 @@ def test_generate_docstring_different_styles():
     # Both should be non-empty strings
     assert isinstance(google_result, str) and len(google_result) > 0
     assert isinstance(numpy_result, str) and len(numpy_result) > 0
+
+
+def test_generate_docstrings_batch_preserves_order():
+    """Test that batched generation returns one docstring per job, in order."""
+    add_meta = {
+        "name": "add",
+        "args_meta": [{"name": "a", "annotation": "int"}, {"name": "b", "annotation": "int"}],
+        "has_return": True,
+        "returns": "int",
+        "raises": [],
+    }
+    load_meta = {"name": "load", "args_meta": [{"name": "path"}], "returns": None, "raises": []}
+    
+    results = generate_docstrings([(add_meta, "google"), (load_meta, "none"), (load_meta, "numpy")])
+    
+    assert len(results) == 3
+    assert results[1] == ""
+    assert isinstance(results[0], str) and len(results[0]) > 0
+    assert isinstance(results[2], str) and len(results[2]) > 0
+
+
+def test_groq_batch_prompt_round_trip():
+    """Test that a packed prompt numbers its sections and replies are split back."""
+    prompt = _build_groq_batch_prompt(["First request.", "Second request."])
+    assert "JSON array of 2 strings" in prompt
+    assert "### Section 1\n\nFirst request." in prompt
+    assert "### Section 2\n\nSecond request." in prompt
+    
+    reply = '```json\n["Add numbers.", "Load a file."]\n```'
+    assert _parse_groq_batch_response(reply, 2) == ["Add numbers.", "Load a file."]
+    assert _parse_groq_batch_response(reply, 3) is None
+    assert _parse_groq_batch_response("Add numbers.", 1) is None
+
+
+def test_generate_docstrings_packs_prompts_into_one_request(monkeypatch):
+    """Test that several uncached functions share a single Groq request."""
+    sent = []
+    
+    class FakeClient:
+        def batch(self, messages, config=None, return_exceptions=False):
+            sent.extend(messages)
+            replies = []
+            for (message,) in messages:
+                count = message.content.count("### Section ")
+                replies.append(SimpleNamespace(content=json.dumps([f"Handle item {n}." for n in range(count)])))
+            return replies
+    
+    monkeypatch.setattr(generator, "_get_groq_client", lambda: FakeClient())
+    monkeypatch.setattr(generator, "_get_disk_cache", lambda create=False: None)
+    jobs = [
+        ({"name": f"packed_{n}", "args_meta": [], "source_code": f"def packed_{n}():\n    pass"}, "google")
+        for n in range(3)
+    ]
+    
+    results = generate_docstrings(jobs, skip_cache=True)
+    
+    assert len(sent) == 1
+    assert results == ["Handle item 0.", "Handle item 1.", "Handle item 2."]
+
+
+def test_regenerations_send_different_prompts(monkeypatch):
+    """Test that each regeneration of a function asks with a new prompt variation."""
+    sent = []
+    
+    class FakeClient:
+        def invoke(self, messages):
+            sent.append(messages[0].content)
+            return SimpleNamespace(content="Handle the request.")
+    
+    monkeypatch.setattr(generator, "_get_groq_client", lambda: FakeClient())
+    monkeypatch.setattr(generator, "_get_disk_cache", lambda create=False: None)
+    func_meta = {"name": "regen_probe", "args_meta": [], "source_code": "def regen_probe():\n    pass"}
+    
+    for salt in (0, 1, 1):
+        generate_docstring(func_meta, style="google", skip_cache=True, regen_count=salt)
+    
+    assert len(sent) == 3
+    assert sent[0] != sent[1]
+    assert sent[1] == sent[2]
+
+
+def test_cache_stats_count_hits_and_misses():
+    """Test that cache lookups are counted as memory hits or misses."""
+    func_meta = {"name": "stats_probe", "args_meta": [], "source_code": "def stats_probe(): pass"}
+    key = _create_cache_key(func_meta, "google")
+    before = get_cache_stats()
+    
+    assert _cache_get(_create_cache_key({**func_meta, "name": "stats_probe_missing"}, "google")) is None
+    _cache_put(key, "Probe the cache.", persist=False)
+    assert _cache_get(key) == "Probe the cache."
+    
+    after = get_cache_stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["memory_hits"] == before["memory_hits"] + 1
+    assert after["entries"] >= 1
@@ -1,6 +1,7 @@
 """Tests for validator module."""
 
 import os
+import subprocess
 import sys
 import tempfile
 
@@ -12,6 +13,7 @@ from core.validator.validator import (
     run_pydocstyle,
     run_radon_cc,
     run_validators,
+    iter_pydocstyle_summaries,
     summarize_pydocstyle_on_files,
 )
 
@@ -48,6 +50,57 @@ def test_run_pydocstyle_on_file():
         os.remove(temp_path)
 
 
+def test_run_pydocstyle_reuses_result_for_unchanged_file(monkeypatch):
+    """Test pydocstyle is only re-run once the file changes."""
+    from core.validator import validator
+    
+    calls = []
+    
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="")
+    
+    monkeypatch.setattr(validator.subprocess, "run", fake_run)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "module.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        
+        assert run_pydocstyle(path) == ({}, True)
+        assert run_pydocstyle(path) == ({}, True)
+        assert len(calls) == 1
+        
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x = 12\n")
+        run_pydocstyle(path)
+        assert len(calls) == 2
+
+
+def test_run_pydocstyle_many_splits_output_per_file(monkeypatch):
+    """Test one pydocstyle run covers several files, split by path."""
+    from core.validator import validator
+    
+    calls = []
+    
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        stdout = (
+            "a.py:1 in public function `foo`:\n"
+            "        D103: Missing docstring in public function\n"
+            "b.py:1 at module level:\n"
+            "        D100: Missing docstring in public module\n"
+        )
+        return subprocess.CompletedProcess(cmd, 1, stdout=stdout, stderr="")
+    
+    monkeypatch.setattr(validator.subprocess, "run", fake_run)
+    mappings, available = validator.run_pydocstyle_many(["a.py", "b.py", "c.py"])
+    assert available
+    assert len(calls) == 1
+    assert list(mappings["a.py"]) == ["foo"]
+    assert list(mappings["b.py"]) == ["<module>"]
+    assert mappings["c.py"] == {}
+
+
 def test_run_radon_cc_on_file():
     """Test running radon complexity on a temporary file."""
     code = '''def simple():
@@ -72,6 +125,23 @@ def complex_func(x):
         os.remove(temp_path)
 
 
+def test_run_radon_cc_reuses_result_for_unchanged_file():
+    """Test radon results are cached until the file changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "module.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("def simple():\n    return 1\n")
+        
+        first, available = run_radon_cc(path)
+        if not available:
+            return  # radon not installed
+        assert run_radon_cc(path)[0] is first
+        
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("def simple():\n    return 12\n\ndef other():\n    return 2\n")
+        assert len(run_radon_cc(path)[0]) == 2
+
+
 def test_run_validators_returns_dict():
     """Test that run_validators returns proper structure."""
     code = '''def test():
@@ -105,3 +175,37 @@ def test_summarize_pydocstyle_structure():
     assert "compliant" in result
     assert "violations" in result
     assert "violations_list" in result
+
+
+def test_summarize_pydocstyle_skips_unparseable_files(monkeypatch):
+    """Test files with syntax errors are not passed to pydocstyle."""
+    from core.validator import validator
+    
+    calls = []
+    monkeypatch.setattr(validator.subprocess, "run", lambda cmd, **kwargs: calls.append(cmd))
+    result = summarize_pydocstyle_on_files(
+        [{"path": "broken.py", "functions": [], "parsing_errors": ["SyntaxError: invalid syntax at line 1"]}]
+    )
+    assert calls == []
+    assert result["skipped_files"] == 1
+    assert result["violations"] == 0
+
+
+def test_iter_pydocstyle_summaries_yields_each_file(monkeypatch):
+    """Test per-file summaries are yielded in input order."""
+    from core.validator import validator
+    
+    stdout = "a.py:1 in public function `foo`:\n        D103: Missing docstring in public function\n"
+    monkeypatch.setattr(
+        validator.subprocess,
+        "run",
+        lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1, stdout=stdout, stderr=""),
+    )
+    files = [
+        {"path": "a.py", "functions": [{"name": "foo"}, {"name": "bar"}]},
+        {"path": "b.py", "functions": [{"name": "baz"}]},
+    ]
+    summaries = list(iter_pydocstyle_summaries(files))
+    assert [s["file"] for s in summaries] == ["a.py", "b.py"]
+    assert (summaries[0]["compliant"], summaries[0]["violations"]) == (1, 1)
+    assert (summaries[1]["compliant"], summaries[1]["violations"]) == (1, 0)